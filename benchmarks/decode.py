@@ -0,0 +1,109 @@
+"""
+Compares ways of turning job list responses into models: building dicts with `json.loads` and passing them to the
+model, against validating the raw bytes with pydantic, both for a whole response and a page of `JOBS_PAGE_SIZE` jobs at
+a time as `HonulabsAPIClient.iter_jobs` does, and a job at a time as it does for bodies longer than `MAX_PAGE_BYTES`.
+Payloads use the canned results of the local API stand-in, so their size and shape are close to real job histories.
+
+    poetry run python -m benchmarks.decode --jobs 500 --repeat 5
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+from cli.api_client import type_adapter
+from cli.schema import HonulabsJob
+from cli.settings import Settings
+from cli.utils.json_stream import iter_json_array
+from mock_api.app import JOB_TYPES
+from mock_api.results import result_for
+
+
+def job_list_payload(jobs: int) -> bytes:
+    business = dict(
+        org=dict(org_id='org_bench', domain_id='honulabs.xyz'),
+        name='Benchmark',
+        business_id='b' * 32,
+        model_ref='model_bench',
+    )
+    job_types = sorted(JOB_TYPES)
+    now = datetime.now(timezone.utc).isoformat()
+    return json.dumps([
+        dict(
+            job_id=f'{num:032x}',
+            job_type=job_types[num % len(job_types)],
+            business=business,
+            status='success',
+            message=None,
+            cost=0.25,
+            error=None,
+            result=result_for(job_types[num % len(job_types)]),
+            started_at=now,
+            finished_at=now,
+        )
+        for num in range(jobs)
+    ]).encode()
+
+
+def _pages(body: bytes) -> list[bytes]:
+    # The same jobs as the API would send them, JOBS_PAGE_SIZE per response
+    jobs = json.loads(body)
+    size = Settings.JOBS_PAGE_SIZE
+    return [json.dumps(jobs[i:i + size]).encode() for i in range(0, len(jobs), size)]
+
+
+def _chunks(body: bytes) -> list[bytes]:
+    # The body as it would arrive from the network
+    return [body[i:i + 64 * 1024] for i in range(0, len(body), 64 * 1024)]
+
+
+def decoders(body: bytes) -> dict[str, Callable[[], list[HonulabsJob]]]:
+    pages = _pages(body)
+    job_list = type_adapter(list[HonulabsJob])
+    return {
+        'dicts': lambda: [HonulabsJob(**j) for j in json.loads(body)],
+        'bytes': lambda: job_list.validate_json(body),
+        'paged': lambda: [job for page in pages for job in job_list.validate_json(page)],
+        'streamed': lambda: [HonulabsJob.model_validate_json(job) for job in iter_json_array(_chunks(body))],
+    }
+
+
+def timings_ms(decode: Callable[[], list[HonulabsJob]], repeat: int) -> list[float]:
+    decode()  # Warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=500, help='Number of jobs in the payload')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    body = job_list_payload(args.jobs)
+    runs = {name: timings_ms(decode, args.repeat) for name, decode in decoders(body).items()}
+    baseline = statistics.median(runs['dicts'])
+    report = dict(
+        jobs=args.jobs,
+        payload_kb=round(len(body) / 1024, 1),
+        median_ms={name: round(statistics.median(timings), 2) for name, timings in runs.items()},
+        speedup={name: round(baseline / statistics.median(timings), 2) for name, timings in runs.items()},
+    )
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['jobs']} jobs, {report['payload_kb']}KB, median of {args.repeat} runs")
+        for name, ms in report['median_ms'].items():
+            print(f"  {name:<16}{ms:>10}ms  {report['speedup'][name]:>5}x")
+
+
+if __name__ == '__main__':
+    main()
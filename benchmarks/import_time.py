@@ -0,0 +1,110 @@
+"""
+Tracks how long the CLI takes to start, so lazy imports don't quietly regress.
+
+Each run starts a fresh interpreter that imports `cli.cmd` and builds the command prompt, which is everything that
+happens before the banner is printed. It reports the wall-clock time of those runs, the cumulative
+`python -X importtime` total, the slowest modules, and any heavy module that got imported at startup.
+
+    poetry run python -m benchmarks.import_time --runs 20 --max-cold-start-ms 250
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STARTUP = 'from cli.cmd import HonulabsCommandPrompt; HonulabsCommandPrompt()'
+# Modules that must only be imported once a command needs them
+LAZY_MODULES = ('fastapi', 'starlette', 'httpx', 'pydantic', 'pydantic_settings', 'prompt_toolkit', 'halo', 'tabulate')
+
+
+def _run(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'},
+    )
+
+
+def cold_start_ms(runs: int) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        _run('-c', STARTUP)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def import_times() -> dict[str, int]:
+    # Cumulative microseconds of every top level import made at startup, from `-X importtime`
+    stderr = _run('-X', 'importtime', '-c', STARTUP).stderr
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        name = name[1:]
+        if not name.startswith(' '):
+            cumulative[name] = int(cumulative_us)
+    return cumulative
+
+
+def lazy_modules_imported() -> list[str]:
+    code = f'{STARTUP}; import sys; print(",".join(m for m in {LAZY_MODULES!r} if m in sys.modules))'
+    return [name for name in _run('-c', code).stdout.strip().split(',') if name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--top', type=int, default=10, help='Number of slowest imports to list')
+    parser.add_argument('--max-cold-start-ms', type=float, help='Fail if the median cold start is slower')
+    parser.add_argument('--max-import-ms', type=float, help='Fail if the -X importtime total is slower')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    timings = cold_start_ms(args.runs)
+    imports = import_times()
+    report = dict(
+        runs=args.runs,
+        cold_start_median_ms=round(statistics.median(timings), 1),
+        cold_start_min_ms=round(min(timings), 1),
+        import_total_ms=round(sum(imports.values()) / 1000, 1),
+        slowest_imports_ms={
+            name: round(us / 1000, 1)
+            for name, us in sorted(imports.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        },
+        eager_heavy_modules=lazy_modules_imported(),
+    )
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Cold start: median {report['cold_start_median_ms']}ms, min {report['cold_start_min_ms']}ms "
+              f"over {args.runs} runs")
+        print(f"-X importtime total: {report['import_total_ms']}ms")
+        for name, ms in report['slowest_imports_ms'].items():
+            print(f'  {ms:>8}ms  {name}')
+        if report['eager_heavy_modules']:
+            print(f"Imported at startup: {', '.join(report['eager_heavy_modules'])}")
+
+    failures = []
+    if report['eager_heavy_modules']:
+        failures.append(f"heavy modules imported at startup: {', '.join(report['eager_heavy_modules'])}")
+    if args.max_cold_start_ms is not None and report['cold_start_median_ms'] > args.max_cold_start_ms:
+        failures.append(f"cold start {report['cold_start_median_ms']}ms > {args.max_cold_start_ms}ms")
+    if args.max_import_ms is not None and report['import_total_ms'] > args.max_import_ms:
+        failures.append(f"import time {report['import_total_ms']}ms > {args.max_import_ms}ms")
+    if failures:
+        sys.exit('Regression: ' + '; '.join(failures))
+
+
+if __name__ == '__main__':
+    main()
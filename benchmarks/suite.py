@@ -0,0 +1,296 @@
+"""
+Runs the API client, job waits, the project picker and the business plan / idea flows against the local API stand-in
+(mock_api) served in-process, and reports for every operation its latency, the number of API requests it makes and
+the peak memory it allocates.
+
+Each operation gets a fresh stand-in and a temporary home for the token and HTTP cache. Job waits use a fake clock
+shared by the stand-in and JobManager, so they measure the polling itself rather than time spent asleep. Latencies
+include the stand-in's own handling of each request, so compare them between runs rather than with production.
+
+    poetry run python -m benchmarks.suite --iterations 20 --save baseline.json
+    poetry run python -m benchmarks.suite --baseline baseline.json --max-slowdown 1.25
+"""
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+from typing import Callable
+
+with warnings.catch_warnings():
+    # The test client warns about its own use of httpx, which isn't ours to fix
+    warnings.simplefilter('ignore')
+    from starlette.testclient import TestClient
+
+from cli.api_client import HonulabsAPIClient
+from cli.schema import HonulabsJob
+from cli.session import set_session
+from cli.settings import Settings
+from cli.utils.handle_business_generation import BusinessPlanGeneration
+from cli.utils.handle_idea_generation import IdeaGeneration
+from cli.utils.job_manager import JobManager
+from cli.utils.pick_business import pick_business
+from cli.utils.prompts import set_answers
+from cli.utils.token import HonulabsToken
+from mock_api import create_app
+
+TABLE_STYLE = 'double_grid'
+BUSINESS_PLAN_ANSWERS = ['An app for turtles', 'Turtles', 'Grow', 'Happy', 'Yes', 'y', 'y', 'y', '', 'Turtle Co']
+IDEA_ANSWERS = ['Software', 'UK', 'y', '1', '1']
+
+
+class FakeClock:
+    """Monotonic clock that only moves when something sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+class Environment:
+    """A fresh API stand-in with a logged-in CLI pointed at it."""
+
+    def __init__(self, job_duration: float = 0, clock: Callable[[], float] = time.monotonic):
+        self.directory = tempfile.TemporaryDirectory()
+        self.app = create_app(job_duration=job_duration, clock=clock)
+        self.state = self.app.state.mock
+        self.client = TestClient(self.app, base_url='http://honulabs.test')
+        self._saved = (
+            HonulabsToken.FILE_PATH, Settings.HTTP_CACHE_DIR, Settings.ARTIFACT_STORE_DIR, Settings.PIPELINE_STATE_DIR,
+            Settings.JOB_EVENTS,
+        )
+
+    def __enter__(self) -> 'Environment':
+        home = Path(self.directory.name)
+        HonulabsToken.FILE_PATH = home / '.honulabsrc'
+        HonulabsToken('benchmark')
+        Settings.HTTP_CACHE_DIR = home / 'http_cache'
+        Settings.ARTIFACT_STORE_DIR = home / 'artifacts'
+        Settings.PIPELINE_STATE_DIR = home / 'pipelines'
+        JobManager.events_unavailable = False
+        set_session(self.client)
+        self.api_client = HonulabsAPIClient('benchmark')
+        return self
+
+    def __exit__(self, *exc_info):
+        set_session(None)
+        (
+            HonulabsToken.FILE_PATH, Settings.HTTP_CACHE_DIR, Settings.ARTIFACT_STORE_DIR, Settings.PIPELINE_STATE_DIR,
+            Settings.JOB_EVENTS,
+        ) = self._saved
+        self.client.close()
+        self.directory.cleanup()
+
+    def create_business(self, name: str = 'Benchmark') -> str:
+        return self.api_client.create_business(name).business_id
+
+    def add_jobs(self, business_id: str, job_types: list[str]):
+        for job_type in job_types:
+            self.state.submit(business_id, job_type)
+
+    def submit(self, business_id: str, job_type: str = 'deploy_page') -> HonulabsJob:
+        return HonulabsJob(**self.state.submit(business_id, job_type).to_dict())
+
+
+class Operation:
+    """
+    A benchmarked operation. `setup` runs untimed before every call and returns the arguments for `run`, so each call
+    can start from the same state.
+    """
+
+    def __init__(self, name: str, environment: Callable[[], Environment], setup: Callable, run: Callable):
+        self.name = name
+        self.environment = environment
+        self.setup = setup
+        self.run = run
+
+
+def _operations(businesses: int, jobs: int, waits: int) -> list[Operation]:
+    job_types = ['business_plan_requirements', 'base_business_plan', 'full_business_details', 'deploy_page']
+    history = [job_types[num % len(job_types)] for num in range(jobs)]
+
+    def with_history(env: Environment) -> str:
+        if not env.state.businesses:
+            for num in range(businesses):
+                env.create_business(f'Project {num}')
+            env.add_jobs(next(iter(env.state.businesses)), history)
+        return next(iter(env.state.businesses))
+
+    def polling(clock: FakeClock) -> Callable[[], Environment]:
+        def environment() -> Environment:
+            env = Environment(job_duration=30, clock=clock)
+            Settings.JOB_EVENTS = False
+            return env
+        return environment
+
+    def submit_staggered(env: Environment, clock: FakeClock) -> list[HonulabsJob]:
+        business_id = with_history(env)
+        submitted = []
+        for _ in range(waits):
+            submitted.append(env.submit(business_id))
+            clock.sleep(30 / waits)
+        return submitted
+
+    def answered(answers: list[str], func: Callable) -> Callable:
+        # Run `func` with its prompts answered from `answers`
+        def run(env: Environment, *args):
+            set_answers(answers)
+            try:
+                return func(*args)
+            finally:
+                set_answers(None)
+        return run
+
+    wait_clock, many_clock = FakeClock(), FakeClock()
+    return [
+        Operation(
+            'list_businesses',
+            Environment,
+            lambda env: (with_history(env),),
+            lambda env, _: env.api_client.list_businesses(),
+        ),
+        Operation(
+            'get_jobs',
+            Environment,
+            lambda env: (with_history(env),),
+            lambda env, business_id: env.api_client.get_jobs(business_id),
+        ),
+        Operation(
+            'get_jobs_filtered',
+            Environment,
+            lambda env: (with_history(env),),
+            lambda env, business_id: env.api_client.get_jobs(business_id, 'deploy_page', limit=5),
+        ),
+        Operation(
+            'pick_business',
+            Environment,
+            lambda env: (with_history(env),),
+            answered(['1'], lambda _: pick_business(TABLE_STYLE)),
+        ),
+        Operation(
+            'await_job_completion',
+            polling(wait_clock),
+            lambda env: (env.submit(with_history(env)),),
+            lambda env, job: JobManager(job, sleep=wait_clock.sleep, clock=wait_clock).await_job_completion(),
+        ),
+        Operation(
+            'await_many',
+            polling(many_clock),
+            lambda env: (submit_staggered(env, many_clock),),
+            lambda env, jobs: list(JobManager.await_many(jobs, sleep=many_clock.sleep, clock=many_clock)),
+        ),
+        Operation(
+            'business_plan_generation',
+            Environment,
+            lambda env: (env.create_business(),),
+            answered(BUSINESS_PLAN_ANSWERS, lambda business_id: BusinessPlanGeneration(business_id, TABLE_STYLE).run()),
+        ),
+        Operation(
+            'idea_generation',
+            Environment,
+            lambda env: (env.create_business(),),
+            answered(IDEA_ANSWERS, lambda business_id: IdeaGeneration(business_id, TABLE_STYLE).run()),
+        ),
+    ]
+
+
+def measure(operation: Operation, iterations: int) -> dict:
+    timings = []
+    requests = 0
+    with operation.environment() as env, contextlib.redirect_stdout(io.StringIO()):
+        # Warm up, filling the HTTP cache as a long session would
+        operation.run(env, *operation.setup(env))
+
+        for _ in range(iterations):
+            args = operation.setup(env)
+            before = env.state.requests
+            start = time.perf_counter()
+            operation.run(env, *args)
+            timings.append((time.perf_counter() - start) * 1000)
+            requests += env.state.requests - before
+
+        args = operation.setup(env)
+        tracemalloc.start()
+        try:
+            operation.run(env, *args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    timings.sort()
+    return dict(
+        median_ms=round(statistics.median(timings), 2),
+        p95_ms=round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+        requests=round(requests / iterations, 1),
+        alloc_peak_kb=round(peak / 1024, 1),
+    )
+
+
+def regressions(report: dict, baseline: dict, max_slowdown: float, max_alloc_growth: float) -> list[str]:
+    failures = []
+    for name, result in report['operations'].items():
+        before = baseline['operations'].get(name)
+        if before is None:
+            continue
+        if result['requests'] > before['requests']:
+            failures.append(f"{name}: {result['requests']} requests > {before['requests']}")
+        if result['median_ms'] > before['median_ms'] * max_slowdown:
+            failures.append(f"{name}: median {result['median_ms']}ms > {before['median_ms']}ms x {max_slowdown}")
+        if result['alloc_peak_kb'] > before['alloc_peak_kb'] * max_alloc_growth:
+            failures.append(
+                f"{name}: peak allocations {result['alloc_peak_kb']}KB > {before['alloc_peak_kb']}KB x "
+                f"{max_alloc_growth}"
+            )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--businesses', type=int, default=20, help='Number of projects in the account')
+    parser.add_argument('--jobs', type=int, default=200, help='Number of jobs in the history of a project')
+    parser.add_argument('--waits', type=int, default=10, help='Number of jobs followed together by await_many')
+    parser.add_argument('--only', action='append', help='Only run this operation, can be repeated')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parser.add_argument('--save', type=Path, help='Write the report to this file, to use as a baseline later')
+    parser.add_argument('--baseline', type=Path, help='Fail on regressions against a saved report')
+    parser.add_argument('--max-slowdown', type=float, default=1.25, help='Allowed ratio of median latencies')
+    parser.add_argument('--max-alloc-growth', type=float, default=1.25, help='Allowed ratio of peak allocations')
+    args = parser.parse_args()
+
+    report = dict(iterations=args.iterations, businesses=args.businesses, jobs=args.jobs, operations={})
+    for operation in _operations(args.businesses, args.jobs, args.waits):
+        if args.only and operation.name not in args.only:
+            continue
+        report['operations'][operation.name] = measure(operation, args.iterations)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{args.iterations} iterations, {args.businesses} projects, {args.jobs} jobs of history")
+        print(f"  {'operation':<26}{'median':>10}{'p95':>10}{'requests':>10}{'peak alloc':>12}")
+        for name, result in report['operations'].items():
+            print(f"  {name:<26}{result['median_ms']:>8}ms{result['p95_ms']:>8}ms{result['requests']:>10}"
+                  f"{result['alloc_peak_kb']:>10}KB")
+    if args.save is not None:
+        args.save.write_text(json.dumps(report, indent=2))
+
+    if args.baseline is not None:
+        failures = regressions(report, json.loads(args.baseline.read_text()), args.max_slowdown, args.max_alloc_growth)
+        if failures:
+            sys.exit('Regression: ' + '; '.join(failures))
+
+
+if __name__ == '__main__':
+    main()
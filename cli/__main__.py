@@ -1,3 +1,10 @@
+import sys
+
+if len(sys.argv) > 1:
+    from cli.batch import main
+
+    sys.exit(main(sys.argv[1:]))
+
 from cli.cmd import HonulabsCommandPrompt
 
 cli = HonulabsCommandPrompt()
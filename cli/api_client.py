@@ -1,9 +1,197 @@
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import cache
+from http import HTTPStatus
+from typing import Iterable, Iterator
+
 import httpx
-from starlette import status
+from pydantic import TypeAdapter
 
 from cli.schema import HonulabsBusiness, HonulabsJob, JobStatus, BusinessPlanRequirementsCreate, \
     BusinessPlanRequirements, VercelSecrets, BusinessPlan, FullBusinessDetailsCreate, Collaborators, MarketSegment
+from cli.session import get_session
 from cli.settings import Settings
+from cli.utils.artifact_store import ArtifactStore
+from cli.utils.http_cache import HttpCache
+from cli.utils.json_stream import iter_json_array
+
+
+class HonulabsAPIError(Exception):
+
+    def __init__(self, message: str, status_code: int | None = None, retry_after: float | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class HonulabsStreamUnavailable(HonulabsAPIError):
+    pass
+
+
+def parse_retry_after(response: httpx.Response) -> float | None:
+    # Retry-After is either a number of seconds or an HTTP date
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+class ServerSentEventParser:
+    """Minimal text/event-stream parser, fed a line at a time, so it serves sync and async streams alike."""
+
+    def __init__(self):
+        self.event, self.data = 'message', []
+
+    def feed(self, line: str) -> tuple[str, str] | None:
+        # The (event type, data) pair completed by `line`, if any
+        if not line:
+            completed = (self.event, '\n'.join(self.data)) if self.data else None
+            self.event, self.data = 'message', []
+            return completed
+        if line.startswith(':'):
+            return None
+        field, _, value = line.partition(':')
+        value = value.removeprefix(' ')
+        if field == 'event':
+            self.event = value
+        elif field == 'data':
+            self.data.append(value)
+        return None
+
+
+def _iter_server_sent_events(lines: Iterator[str]) -> Iterator[tuple[str, str]]:
+    # (event type, data) pairs of a text/event-stream
+    parser = ServerSentEventParser()
+    for line in lines:
+        event = parser.feed(line)
+        if event is not None:
+            yield event
+
+
+@cache
+def type_adapter(type_: type) -> TypeAdapter:
+    # Validators for response types that aren't models, like `list[HonulabsJob]`, built once and reused
+    return TypeAdapter(type_)
+
+
+# Response header holding the cursor of the next page of a paginated list, absent on the last page
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+# Job list pages of at most this many bytes are read whole, validated in one go and cached. A longer body, from a server
+# that ignores `limit`, is decoded a job at a time as it arrives, so memory stays bounded whatever the server sends
+MAX_PAGE_BYTES = 4 * 2 ** 20
+
+
+def read_page(chunks: Iterator[bytes], max_bytes: int) -> tuple[bytes | None, Iterator[bytes]]:
+    # The whole body if it is at most `max_bytes` long. Otherwise None, and the chunks of the body, from the first
+    read = []
+    size = 0
+    for chunk in chunks:
+        read.append(chunk)
+        size += len(chunk)
+        if size > max_bytes:
+            return None, _chunks_read_first(read, chunks)
+    return b''.join(read), iter(())
+
+
+def _chunks_read_first(read: list[bytes], chunks: Iterator[bytes]) -> Iterator[bytes]:
+    # Each chunk already read is let go of as soon as it has been handed on
+    read.reverse()
+    while read:
+        yield read.pop()
+    yield from chunks
+
+
+def page_error(response: httpx.Response, content: bytes | None) -> str:
+    # Error message for a job list response that wasn't a page of jobs
+    if content is None:
+        return f'{response.status_code} {response.reason_phrase}'
+    return content.decode(errors='replace')
+
+
+def job_query(
+        job_type: str | None = None,
+        job_status: JobStatus | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        include_result: bool = True,
+) -> dict:
+    # Query parameters for a page of the job list
+    params = {'limit': min(limit or Settings.JOBS_PAGE_SIZE, Settings.JOBS_PAGE_SIZE)}
+    if job_type is not None:
+        params['job_type'] = job_type
+    if job_status is not None:
+        params['status'] = JobStatus(job_status).value
+    if cursor is not None:
+        params['cursor'] = cursor
+    if not include_result:
+        params['include_result'] = 'false'
+    return params
+
+
+def filter_jobs(
+        jobs: Iterable[HonulabsJob],
+        job_type: str | None = None,
+        job_status: JobStatus | None = None,
+) -> Iterator[HonulabsJob]:
+    if job_type is not None:
+        jobs = filter(lambda job: job.job_type == job_type, jobs)
+    if job_status is not None:
+        jobs = filter(lambda job: job.status == job_status, jobs)
+    return iter(jobs)
+
+
+class JobPages:
+    """
+    The cursor, limit and filters of a job listing, shared by the sync and async clients, which make the requests.
+    `query()` gives the parameters of the next page, or None once the listing is done, and `take()` yields the jobs
+    wanted from the page just read. Filters and page size are sent to the API, and applied again here for servers that
+    ignore them.
+    """
+
+    def __init__(
+            self,
+            job_type: str | None = None,
+            job_status: JobStatus | None = None,
+            limit: int | None = None,
+            include_result: bool = True,
+            after: str | None = None,
+    ):
+        self.job_type = job_type
+        self.job_status = job_status
+        self.include_result = include_result
+        self.remaining = limit
+        self.cursor = after
+        self.done = limit is not None and limit <= 0
+
+    def query(self) -> dict | None:
+        if self.done:
+            return None
+        return job_query(self.job_type, self.job_status, self.remaining, self.cursor, self.include_result)
+
+    def take(self, jobs: Iterable[HonulabsJob], cursor: str | None) -> Iterator[HonulabsJob]:
+        # The wanted jobs of a page, given the cursor of the next one from its response
+        self.cursor = cursor
+        self.done = not cursor
+        for job in filter_jobs(jobs, self.job_type, self.job_status):
+            yield job
+            if self.remaining is not None:
+                self.remaining -= 1
+                if self.limit_reached:
+                    self.done = True
+                    return
+
+    @property
+    def limit_reached(self) -> bool:
+        return self.remaining is not None and self.remaining <= 0
 
 
 class HonulabsAPIClient:
@@ -12,82 +200,239 @@ class HonulabsAPIClient:
         if token is None:
             raise Exception('Please login with a valid token first')
         self.token = token
+        self.headers = {'Authorization': f'Bearer {self.token}'}
+        self.cache = HttpCache.for_token(
+            Settings.HTTP_CACHE_DIR, token, Settings.HTTP_CACHE_MAX_MB * 2 ** 20,
+        ) if Settings.HTTP_CACHE else None
+        self.artifacts = ArtifactStore.for_token(
+            Settings.ARTIFACT_STORE_DIR, token, Settings.ARTIFACT_STORE_MAX_MB * 2 ** 20,
+        ) if Settings.ARTIFACT_STORE else None
 
     @property
-    def client(self):
-        return httpx.Client(base_url=Settings.API_URL, headers={'Authorization': f'Bearer {self.token}'}, timeout=300)
+    def client(self) -> httpx.Client:
+        return get_session()
+
+    def _cached_get(self, path: str, params: dict | None = None) -> httpx.Response:
+        # GET through the local cache; a 304 from the server is answered with the cached body
+        if self.cache is None:
+            return self.client.get(path, params=params, headers=self.headers)
+
+        cached = self.cache.get(path, params)
+        headers = dict(self.headers)
+        if cached is not None:
+            headers.update(HttpCache.conditional_headers(cached[0]))
+        response = self.client.get(path, params=params, headers=headers)
+
+        if response.status_code == HTTPStatus.NOT_MODIFIED and cached is not None:
+            return self._from_cache(response, *cached)
+        if response.status_code == HTTPStatus.OK:
+            self._cache_put(path, params, response)
+        return response
+
+    @contextmanager
+    def _get_page(self, path: str, params: dict) -> Iterator[tuple[httpx.Response, bytes | None, Iterator[bytes]]]:
+        # Like `_cached_get`, with the body read whole, and cached, only when it is at most MAX_PAGE_BYTES long. A
+        # longer one comes as None and its chunks, to be read before leaving the context
+        cached = self.cache.get(path, params, MAX_PAGE_BYTES) if self.cache is not None else None
+        headers = dict(self.headers)
+        if cached is not None:
+            headers.update(HttpCache.conditional_headers(cached[0]))
+        with self.client.stream('GET', path, params=params, headers=headers) as response:
+            if response.status_code == HTTPStatus.NOT_MODIFIED and cached is not None:
+                yield self._from_cache(response, *cached), cached[1], iter(())
+                return
+            content, chunks = read_page(response.iter_bytes(), MAX_PAGE_BYTES)
+            if content is not None and response.status_code == HTTPStatus.OK and self.cache is not None:
+                self._cache_put(path, params, response, content)
+            yield response, content, chunks
+
+    @staticmethod
+    def _from_cache(response: httpx.Response, cached_headers: dict, content: bytes) -> httpx.Response:
+        # The cached response a 304 stands for
+        if 'Retry-After' in response.headers:
+            cached_headers = {**cached_headers, 'Retry-After': response.headers['Retry-After']}
+        return httpx.Response(HTTPStatus.OK, headers=cached_headers, content=content, request=response.request)
+
+    def _cache_put(self, path: str, params: dict | None, response: httpx.Response, content: bytes | None = None):
+        try:
+            self.cache.put(path, params, response, content)
+        except OSError:
+            # The cache is only a shortcut, a read-only home shouldn't break reads
+            pass
+
+    def _invalidate(self, *paths: str):
+        if self.cache is not None:
+            for path in paths:
+                self.cache.invalidate(path)
 
     def check_token(self) -> bool:
-        response = self.client.get('/v1/organisations')
-        return response.status_code == status.HTTP_200_OK
+        response = self.client.get('/v1/organisations', headers=self.headers)
+        return response.status_code == HTTPStatus.OK
 
     def get_job(self, business_id: str, job_id: str) -> HonulabsJob:
-        response = self.client.get(f'/v1/businesses/{business_id}/jobs/{job_id}')
-        if response.status_code != status.HTTP_200_OK:
-            raise Exception(f'Could not read job: {response.text}')
-        return HonulabsJob(**response.json())
+        # A job that has finished is read from the artifact store, without asking the API
+        stored = self.artifacts.get(job_id) if self.artifacts is not None else None
+        if stored is not None:
+            return HonulabsJob.model_validate_json(stored)
+        job, _ = self.poll_job(business_id, job_id)
+        return job
+
+    def poll_job(self, business_id: str, job_id: str) -> tuple[HonulabsJob, float | None]:
+        # Read a job along with the server's hint of how long to wait before reading it again, if any. A polled job is
+        # still running, so it changes on every read: neither the HTTP cache nor the artifact store is looked at, and
+        # the job is only stored once it has finished
+        response = self.client.get(f'/v1/businesses/{business_id}/jobs/{job_id}', headers=self.headers)
+        if response.status_code != HTTPStatus.OK:
+            raise HonulabsAPIError(
+                f'Could not read job: {response.text}',
+                response.status_code,
+                parse_retry_after(response),
+            )
+        job = HonulabsJob.model_validate_json(response.content)
+        self._store_finished(job, response.content)
+        return job, parse_retry_after(response)
+
+    def _store_finished(self, job: HonulabsJob, content: bytes | None = None):
+        # Finished jobs never change, so they are kept to be read without asking the API again
+        if self.artifacts is None or job.status not in (JobStatus.SUCCESS, JobStatus.FAILED):
+            return
+        try:
+            self.artifacts.put(job.job_id, content if content is not None else job.model_dump_json().encode())
+        except OSError:
+            pass
+
+    def stream_job_events(self, business_id: str, job_id: str) -> Iterator[HonulabsJob]:
+        # Follow a job through its event stream, yielding the job every time its status or message changes
+        with self.client.stream(
+            'GET',
+            f'/v1/businesses/{business_id}/jobs/{job_id}/events',
+            headers={**self.headers, 'Accept': 'text/event-stream'},
+        ) as response:
+            content_type = response.headers.get('Content-Type', '')
+            if response.status_code != HTTPStatus.OK or not content_type.startswith('text/event-stream'):
+                raise HonulabsStreamUnavailable(
+                    f'Job events are not available: {response.status_code}',
+                    response.status_code,
+                )
+            for event, data in _iter_server_sent_events(response.iter_lines()):
+                if event in ('job', 'message'):
+                    job = HonulabsJob.model_validate_json(data)
+                    self._store_finished(job, data.encode())
+                    yield job
 
     def get_jobs(
             self,
             business_id: str,
             job_type: str | None = None,
             job_status: JobStatus | None = None,
+            limit: int | None = None,
+            include_result: bool = True,
     ) -> list[HonulabsJob]:
-        # Return a list of jobs, optionally filtered by type and status
-        response = self.client.get(f'/v1/businesses/{business_id}/jobs')
-        if response.status_code != status.HTTP_200_OK:
-            raise Exception(f'Could not retrieve jobs: {response.text}')
-        jobs = (HonulabsJob(**j) for j in response.json())
-        if job_type is not None:
-            jobs = filter(lambda job: job.job_type == job_type, jobs)
-        if job_status is not None:
-            jobs = filter(lambda job: job.status == job_status, jobs)
-        return list(jobs)
+        # Return a list of jobs, optionally filtered by type and status, reading only as many pages as needed
+        return list(self.iter_jobs(business_id, job_type, job_status, limit, include_result))
+
+    def iter_jobs(
+            self,
+            business_id: str,
+            job_type: str | None = None,
+            job_status: JobStatus | None = None,
+            limit: int | None = None,
+            include_result: bool = True,
+            after: str | None = None,
+    ) -> Iterator[HonulabsJob]:
+        """
+        Yield the jobs of a business one at a time. Pages are fetched as they are needed, so the whole history is never
+        held in memory. With `after`, only jobs submitted after the job with that ID are listed.
+        """
+        for job in self._stream_jobs(business_id, JobPages(job_type, job_status, limit, include_result, after)):
+            if job is not None:
+                yield job
+
+    def iter_job_pages(
+            self,
+            business_id: str,
+            job_type: str | None = None,
+            job_status: JobStatus | None = None,
+            limit: int | None = None,
+            include_result: bool = True,
+            after: str | None = None,
+    ) -> Iterator[list[HonulabsJob]]:
+        # Yield the jobs of a business a page at a time, fetching the next page only when asked for it
+        # A body longer than a page, from a server that ignores `limit`, is split into pages of JOBS_PAGE_SIZE jobs
+        page = []
+        for job in self._stream_jobs(business_id, JobPages(job_type, job_status, limit, include_result, after)):
+            if job is not None:
+                page.append(job)
+            if page and (job is None or len(page) == Settings.JOBS_PAGE_SIZE):
+                yield page
+                page = []
+
+    def _stream_jobs(self, business_id: str, pages: JobPages) -> Iterator[HonulabsJob | None]:
+        # Jobs a page at a time, with None marking the end of each page
+        while (params := pages.query()) is not None:
+            with self._get_page(f'/v1/businesses/{business_id}/jobs', params) as (response, content, chunks):
+                if response.status_code != HTTPStatus.OK:
+                    raise Exception(f'Could not retrieve jobs: {page_error(response, content)}')
+                if content is not None:
+                    # A page of at most JOBS_PAGE_SIZE jobs, validated whole, straight from its bytes
+                    jobs = type_adapter(list[HonulabsJob]).validate_json(content)
+                else:
+                    jobs = map(HonulabsJob.model_validate_json, iter_json_array(chunks))
+                yield from pages.take(jobs, response.headers.get(NEXT_CURSOR_HEADER))
+            yield None
 
     def list_businesses(self) -> list[HonulabsBusiness]:
-        response = self.client.get('/v1/businesses')
-        if response.status_code != status.HTTP_200_OK:
+        response = self._cached_get('/v1/businesses')
+        if response.status_code != HTTPStatus.OK:
             raise Exception(f'Could not retrieve businesses: {response.text}')
-        return [HonulabsBusiness(**r) for r in response.json()]
+        return type_adapter(list[HonulabsBusiness]).validate_json(response.content)
 
     def create_business(self, name: str) -> HonulabsBusiness:
-        response = self.client.post('/v1/businesses', json={'name': name})
-        if response.status_code != status.HTTP_201_CREATED:
+        response = self.client.post('/v1/businesses', json={'name': name}, headers=self.headers)
+        self._invalidate('/v1/businesses')
+        if response.status_code != HTTPStatus.CREATED:
             raise Exception(f'Could not create business: {response.text}')
-        return HonulabsBusiness(**response.json())
+        return HonulabsBusiness.model_validate_json(response.content)
 
     def delete_business(self, business_id: str) -> HonulabsJob:
-        response = self.client.delete(f'/v1/businesses/{business_id}')
-        if response.status_code != status.HTTP_202_ACCEPTED:
+        response = self.client.delete(f'/v1/businesses/{business_id}', headers=self.headers)
+        self._invalidate('/v1/businesses', f'/v1/businesses/{business_id}/jobs')
+        if response.status_code != HTTPStatus.ACCEPTED:
             raise Exception(f'Could not delete business: {response.text}')
-        return HonulabsJob(**response.json())
+        return HonulabsJob.model_validate_json(response.content)
 
     def generate_business_requirements(self, business_id: str, payload: BusinessPlanRequirementsCreate) -> HonulabsJob:
         response = self.client.post(
             f'/v1/businesses/{business_id}/jobs/business_plan_requirements',
             json=payload.model_dump(),
+            headers=self.headers,
         )
-        if response.status_code != status.HTTP_202_ACCEPTED:
+        self._invalidate(f'/v1/businesses/{business_id}/jobs')
+        if response.status_code != HTTPStatus.ACCEPTED:
             raise Exception(f'Could not start business plan requirements generation: {response.text}')
-        return HonulabsJob(**response.json())
+        return HonulabsJob.model_validate_json(response.content)
 
     def generate_base_business_plan(self, business_id: str, payload: BusinessPlanRequirements) -> HonulabsJob:
         response = self.client.post(
             f'/v1/businesses/{business_id}/jobs/base_business_plan',
             json=payload.model_dump(),
+            headers=self.headers,
         )
-        if response.status_code != status.HTTP_202_ACCEPTED:
+        self._invalidate(f'/v1/businesses/{business_id}/jobs')
+        if response.status_code != HTTPStatus.ACCEPTED:
             raise Exception(f'Could not start base business plan generation: {response.text}')
-        return HonulabsJob(**response.json())
+        return HonulabsJob.model_validate_json(response.content)
 
     def generate_business_name_ideas(self, business_id: str, payload: BusinessPlanRequirements) -> HonulabsJob:
         response = self.client.post(
             f'/v1/businesses/{business_id}/jobs/business_names_and_domains',
             json=payload.model_dump(),
+            headers=self.headers,
         )
-        if response.status_code != status.HTTP_202_ACCEPTED:
+        self._invalidate(f'/v1/businesses/{business_id}/jobs')
+        if response.status_code != HTTPStatus.ACCEPTED:
             raise Exception(f'Could not start business name ideas generation: {response.text}')
-        return HonulabsJob(**response.json())
+        return HonulabsJob.model_validate_json(response.content)
 
     def generate_full_business_plan(self, business_id: str, business_plan: BusinessPlan, business_name: str) -> HonulabsJob:
         payload = FullBusinessDetailsCreate(
@@ -97,69 +442,84 @@ class HonulabsAPIClient:
         response = self.client.post(
             f'/v1/businesses/{business_id}/jobs/full_business_details',
             json=payload.model_dump(),
+            headers=self.headers,
         )
-        if response.status_code != status.HTTP_202_ACCEPTED:
+        self._invalidate(f'/v1/businesses/{business_id}/jobs')
+        if response.status_code != HTTPStatus.ACCEPTED:
             raise Exception(f'Could not start full details generation: {response.text}')
-        return HonulabsJob(**response.json())
+        return HonulabsJob.model_validate_json(response.content)
 
     def deploy_landing_page(self, business_id: str) -> HonulabsJob:
-        response = self.client.post(f'/v1/businesses/{business_id}/jobs/deploy_page')
-        if response.status_code != status.HTTP_202_ACCEPTED:
+        response = self.client.post(f'/v1/businesses/{business_id}/jobs/deploy_page', headers=self.headers)
+        self._invalidate(f'/v1/businesses/{business_id}/jobs')
+        if response.status_code != HTTPStatus.ACCEPTED:
             raise Exception(f'Could not start deployment job: {response.text}')
-        return HonulabsJob(**response.json())
+        return HonulabsJob.model_validate_json(response.content)
 
     def deploy_secrets_to_vercel(self, business_id: str, payload: VercelSecrets) -> HonulabsJob:
         response = self.client.post(
             f'/v1/businesses/{business_id}/jobs/deploy_vercel_environment_variables',
             json=payload.model_dump(),
+            headers=self.headers,
         )
-        if response.status_code != status.HTTP_202_ACCEPTED:
+        self._invalidate(f'/v1/businesses/{business_id}/jobs')
+        if response.status_code != HTTPStatus.ACCEPTED:
             raise Exception(f'Could not start secret variable upload: {response.text}')
-        return HonulabsJob(**response.json())
+        return HonulabsJob.model_validate_json(response.content)
 
     def invite_collaborators(self, business_id: str, invitees: Collaborators):
         response = self.client.post(
             f'/v1/businesses/{business_id}/jobs/add_user_to_repo',
             json=invitees.model_dump(),
+            headers=self.headers,
         )
-        if response.status_code != status.HTTP_202_ACCEPTED:
+        self._invalidate(f'/v1/businesses/{business_id}/jobs')
+        if response.status_code != HTTPStatus.ACCEPTED:
             raise Exception(f'Could not invite user: {response.text}')
-        return HonulabsJob(**response.json())
+        return HonulabsJob.model_validate_json(response.content)
 
     def generate_market_segment(self, business_id: str, geography: str, segment: str):
         response = self.client.post(
             f'/v1/businesses/{business_id}/jobs/industry_idea_segmentation',
             json=dict(geography=geography, industry=segment),
+            headers=self.headers,
         )
-        if response.status_code != status.HTTP_202_ACCEPTED:
+        self._invalidate(f'/v1/businesses/{business_id}/jobs')
+        if response.status_code != HTTPStatus.ACCEPTED:
             raise Exception(f'Could not start Idea Generation process: {response.text}: {response.status_code}')
-        return HonulabsJob(**response.json())
+        return HonulabsJob.model_validate_json(response.content)
 
     def idea_generation(self, business_id: str, geography: str, market_segment: MarketSegment):
         response = self.client.post(
             f'/v1/businesses/{business_id}/jobs/idea_generation',
             json=market_segment.model_dump(),
-            params=dict(geography=geography)
+            params=dict(geography=geography),
+            headers=self.headers,
         )
-        if response.status_code != status.HTTP_202_ACCEPTED:
+        self._invalidate(f'/v1/businesses/{business_id}/jobs')
+        if response.status_code != HTTPStatus.ACCEPTED:
             raise Exception(f'Could not start Idea Generation process: {response.text}: {response.status_code}')
-        return HonulabsJob(**response.json())
+        return HonulabsJob.model_validate_json(response.content)
 
     def toggle_product_readiness(self, business_id: str):
         response = self.client.post(
             f'/v1/businesses/{business_id}/jobs/toggle_product_readiness',
+            headers=self.headers,
         )
-        if response.status_code != status.HTTP_202_ACCEPTED:
+        self._invalidate(f'/v1/businesses/{business_id}/jobs')
+        if response.status_code != HTTPStatus.ACCEPTED:
             raise Exception(f'Could not Toggle product readiness: {response.text}: {response.status_code}')
-        return HonulabsJob(**response.json())
+        return HonulabsJob.model_validate_json(response.content)
 
     def approve_trello_sprint_plan(self, business_id: str):
         response = self.client.post(
             f'/v1/businesses/{business_id}/jobs/confirm_trello_sprint_ready',
+            headers=self.headers,
         )
-        if response.status_code != status.HTTP_202_ACCEPTED:
+        self._invalidate(f'/v1/businesses/{business_id}/jobs')
+        if response.status_code != HTTPStatus.ACCEPTED:
             raise Exception(f'Could confirm trello sprint: {response.text}: {response.status_code}')
-        return HonulabsJob(**response.json())
+        return HonulabsJob.model_validate_json(response.content)
 
     def invite_trello_collaborator(self, business_id: str, collaborator_emails: list[str]):
         collabs = dict(collaborators=[
@@ -172,8 +532,10 @@ class HonulabsAPIClient:
         )
         response = self.client.post(
             f'/v1/businesses/{business_id}/jobs/add_users_to_trello_board',
-            json=collabs
+            json=collabs,
+            headers=self.headers,
         )
-        if response.status_code != status.HTTP_202_ACCEPTED:
+        self._invalidate(f'/v1/businesses/{business_id}/jobs')
+        if response.status_code != HTTPStatus.ACCEPTED:
             raise Exception(f'Could add collaboratos to board: {response.text}: {response.status_code}')
-        return HonulabsJob(**response.json())
\ No newline at end of file
+        return HonulabsJob.model_validate_json(response.content)
\ No newline at end of file
@@ -0,0 +1,321 @@
+from http import HTTPStatus
+from typing import AsyncIterator
+
+import httpx
+
+from cli.schema import HonulabsBusiness, HonulabsJob, JobStatus, BusinessPlanRequirementsCreate, \
+    BusinessPlanRequirements, VercelSecrets, BusinessPlan, FullBusinessDetailsCreate, Collaborators, MarketSegment
+from cli.api_client import MAX_PAGE_BYTES, NEXT_CURSOR_HEADER, HonulabsAPIError, HonulabsStreamUnavailable, JobPages, \
+    ServerSentEventParser, page_error, parse_retry_after, type_adapter
+from cli.session import new_async_session
+from cli.settings import Settings
+from cli.utils.json_stream import aiter_json_array
+
+
+async def read_page(chunks: AsyncIterator[bytes], max_bytes: int) -> tuple[bytes | None, AsyncIterator[bytes]]:
+    # See cli.api_client.read_page
+    read = []
+    size = 0
+    async for chunk in chunks:
+        read.append(chunk)
+        size += len(chunk)
+        if size > max_bytes:
+            return None, _chunks_read_first(read, chunks)
+    return b''.join(read), _chunks_read_first([], chunks)
+
+
+async def _chunks_read_first(read: list[bytes], chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    read.reverse()
+    while read:
+        yield read.pop()
+    async for chunk in chunks:
+        yield chunk
+
+
+class AsyncHonulabsAPIClient:
+    """
+    asyncio counterpart of HonulabsAPIClient, returning the same schema models.
+
+    Use it as an async context manager, or call `aclose()` when done, so the underlying connection pool is released.
+    It always reads from the API, without the local HTTP cache and artifact store of HonulabsAPIClient.
+    """
+
+    def __init__(self, token: str | None, client: httpx.AsyncClient | None = None):
+        if token is None:
+            raise Exception('Please login with a valid token first')
+        self.token = token
+        self.headers = {'Authorization': f'Bearer {self.token}'}
+        self._client = client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = new_async_session()
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> 'AsyncHonulabsAPIClient':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def check_token(self) -> bool:
+        response = await self.client.get('/v1/organisations', headers=self.headers)
+        return response.status_code == HTTPStatus.OK
+
+    async def get_job(self, business_id: str, job_id: str) -> HonulabsJob:
+        job, _ = await self.poll_job(business_id, job_id)
+        return job
+
+    async def poll_job(self, business_id: str, job_id: str) -> tuple[HonulabsJob, float | None]:
+        # See HonulabsAPIClient.poll_job
+        response = await self.client.get(f'/v1/businesses/{business_id}/jobs/{job_id}', headers=self.headers)
+        if response.status_code != HTTPStatus.OK:
+            raise HonulabsAPIError(
+                f'Could not read job: {response.text}',
+                response.status_code,
+                parse_retry_after(response),
+            )
+        return HonulabsJob.model_validate_json(response.content), parse_retry_after(response)
+
+    async def stream_job_events(self, business_id: str, job_id: str) -> AsyncIterator[HonulabsJob]:
+        # See HonulabsAPIClient.stream_job_events
+        async with self.client.stream(
+            'GET',
+            f'/v1/businesses/{business_id}/jobs/{job_id}/events',
+            headers={**self.headers, 'Accept': 'text/event-stream'},
+        ) as response:
+            content_type = response.headers.get('Content-Type', '')
+            if response.status_code != HTTPStatus.OK or not content_type.startswith('text/event-stream'):
+                raise HonulabsStreamUnavailable(
+                    f'Job events are not available: {response.status_code}',
+                    response.status_code,
+                )
+            parser = ServerSentEventParser()
+            async for line in response.aiter_lines():
+                event = parser.feed(line)
+                if event is not None and event[0] in ('job', 'message'):
+                    yield HonulabsJob.model_validate_json(event[1])
+
+    async def get_jobs(
+            self,
+            business_id: str,
+            job_type: str | None = None,
+            job_status: JobStatus | None = None,
+            limit: int | None = None,
+            include_result: bool = True,
+    ) -> list[HonulabsJob]:
+        # Return a list of jobs, optionally filtered by type and status, reading only as many pages as needed
+        return [job async for job in self.iter_jobs(business_id, job_type, job_status, limit, include_result)]
+
+    async def iter_jobs(
+            self,
+            business_id: str,
+            job_type: str | None = None,
+            job_status: JobStatus | None = None,
+            limit: int | None = None,
+            include_result: bool = True,
+            after: str | None = None,
+    ) -> AsyncIterator[HonulabsJob]:
+        # See HonulabsAPIClient.iter_jobs
+        async for job in self._stream_jobs(business_id, JobPages(job_type, job_status, limit, include_result, after)):
+            if job is not None:
+                yield job
+
+    async def iter_job_pages(
+            self,
+            business_id: str,
+            job_type: str | None = None,
+            job_status: JobStatus | None = None,
+            limit: int | None = None,
+            include_result: bool = True,
+            after: str | None = None,
+    ) -> AsyncIterator[list[HonulabsJob]]:
+        # See HonulabsAPIClient.iter_job_pages
+        page = []
+        async for job in self._stream_jobs(business_id, JobPages(job_type, job_status, limit, include_result, after)):
+            if job is not None:
+                page.append(job)
+            if page and (job is None or len(page) == Settings.JOBS_PAGE_SIZE):
+                yield page
+                page = []
+
+    async def _stream_jobs(self, business_id: str, pages: JobPages) -> AsyncIterator[HonulabsJob | None]:
+        # See HonulabsAPIClient._stream_jobs
+        while (params := pages.query()) is not None:
+            async with self.client.stream(
+                'GET', f'/v1/businesses/{business_id}/jobs', params=params, headers=self.headers,
+            ) as response:
+                content, chunks = await read_page(response.aiter_bytes(), MAX_PAGE_BYTES)
+                if response.status_code != HTTPStatus.OK:
+                    raise Exception(f'Could not retrieve jobs: {page_error(response, content)}')
+                cursor = response.headers.get(NEXT_CURSOR_HEADER)
+                if content is not None:
+                    for job in pages.take(type_adapter(list[HonulabsJob]).validate_json(content), cursor):
+                        yield job
+                else:
+                    async for element in aiter_json_array(chunks):
+                        for job in pages.take([HonulabsJob.model_validate_json(element)], cursor):
+                            yield job
+                        if pages.limit_reached:
+                            break
+            yield None
+
+    async def list_businesses(self) -> list[HonulabsBusiness]:
+        response = await self.client.get('/v1/businesses', headers=self.headers)
+        if response.status_code != HTTPStatus.OK:
+            raise Exception(f'Could not retrieve businesses: {response.text}')
+        return type_adapter(list[HonulabsBusiness]).validate_json(response.content)
+
+    async def create_business(self, name: str) -> HonulabsBusiness:
+        response = await self.client.post('/v1/businesses', json={'name': name}, headers=self.headers)
+        if response.status_code != HTTPStatus.CREATED:
+            raise Exception(f'Could not create business: {response.text}')
+        return HonulabsBusiness.model_validate_json(response.content)
+
+    async def delete_business(self, business_id: str) -> HonulabsJob:
+        response = await self.client.delete(f'/v1/businesses/{business_id}', headers=self.headers)
+        if response.status_code != HTTPStatus.ACCEPTED:
+            raise Exception(f'Could not delete business: {response.text}')
+        return HonulabsJob.model_validate_json(response.content)
+
+    async def generate_business_requirements(
+            self,
+            business_id: str,
+            payload: BusinessPlanRequirementsCreate,
+    ) -> HonulabsJob:
+        response = await self.client.post(
+            f'/v1/businesses/{business_id}/jobs/business_plan_requirements',
+            json=payload.model_dump(),
+            headers=self.headers,
+        )
+        if response.status_code != HTTPStatus.ACCEPTED:
+            raise Exception(f'Could not start business plan requirements generation: {response.text}')
+        return HonulabsJob.model_validate_json(response.content)
+
+    async def generate_base_business_plan(self, business_id: str, payload: BusinessPlanRequirements) -> HonulabsJob:
+        response = await self.client.post(
+            f'/v1/businesses/{business_id}/jobs/base_business_plan',
+            json=payload.model_dump(),
+            headers=self.headers,
+        )
+        if response.status_code != HTTPStatus.ACCEPTED:
+            raise Exception(f'Could not start base business plan generation: {response.text}')
+        return HonulabsJob.model_validate_json(response.content)
+
+    async def generate_business_name_ideas(self, business_id: str, payload: BusinessPlanRequirements) -> HonulabsJob:
+        response = await self.client.post(
+            f'/v1/businesses/{business_id}/jobs/business_names_and_domains',
+            json=payload.model_dump(),
+            headers=self.headers,
+        )
+        if response.status_code != HTTPStatus.ACCEPTED:
+            raise Exception(f'Could not start business name ideas generation: {response.text}')
+        return HonulabsJob.model_validate_json(response.content)
+
+    async def generate_full_business_plan(
+            self,
+            business_id: str,
+            business_plan: BusinessPlan,
+            business_name: str,
+    ) -> HonulabsJob:
+        payload = FullBusinessDetailsCreate(
+            business_name=business_name,
+            base_business_plan=business_plan,
+        )
+        response = await self.client.post(
+            f'/v1/businesses/{business_id}/jobs/full_business_details',
+            json=payload.model_dump(),
+            headers=self.headers,
+        )
+        if response.status_code != HTTPStatus.ACCEPTED:
+            raise Exception(f'Could not start full details generation: {response.text}')
+        return HonulabsJob.model_validate_json(response.content)
+
+    async def deploy_landing_page(self, business_id: str) -> HonulabsJob:
+        response = await self.client.post(f'/v1/businesses/{business_id}/jobs/deploy_page', headers=self.headers)
+        if response.status_code != HTTPStatus.ACCEPTED:
+            raise Exception(f'Could not start deployment job: {response.text}')
+        return HonulabsJob.model_validate_json(response.content)
+
+    async def deploy_secrets_to_vercel(self, business_id: str, payload: VercelSecrets) -> HonulabsJob:
+        response = await self.client.post(
+            f'/v1/businesses/{business_id}/jobs/deploy_vercel_environment_variables',
+            json=payload.model_dump(),
+            headers=self.headers,
+        )
+        if response.status_code != HTTPStatus.ACCEPTED:
+            raise Exception(f'Could not start secret variable upload: {response.text}')
+        return HonulabsJob.model_validate_json(response.content)
+
+    async def invite_collaborators(self, business_id: str, invitees: Collaborators) -> HonulabsJob:
+        response = await self.client.post(
+            f'/v1/businesses/{business_id}/jobs/add_user_to_repo',
+            json=invitees.model_dump(),
+            headers=self.headers,
+        )
+        if response.status_code != HTTPStatus.ACCEPTED:
+            raise Exception(f'Could not invite user: {response.text}')
+        return HonulabsJob.model_validate_json(response.content)
+
+    async def generate_market_segment(self, business_id: str, geography: str, segment: str) -> HonulabsJob:
+        response = await self.client.post(
+            f'/v1/businesses/{business_id}/jobs/industry_idea_segmentation',
+            json=dict(geography=geography, industry=segment),
+            headers=self.headers,
+        )
+        if response.status_code != HTTPStatus.ACCEPTED:
+            raise Exception(f'Could not start Idea Generation process: {response.text}: {response.status_code}')
+        return HonulabsJob.model_validate_json(response.content)
+
+    async def idea_generation(self, business_id: str, geography: str, market_segment: MarketSegment) -> HonulabsJob:
+        response = await self.client.post(
+            f'/v1/businesses/{business_id}/jobs/idea_generation',
+            json=market_segment.model_dump(),
+            params=dict(geography=geography),
+            headers=self.headers,
+        )
+        if response.status_code != HTTPStatus.ACCEPTED:
+            raise Exception(f'Could not start Idea Generation process: {response.text}: {response.status_code}')
+        return HonulabsJob.model_validate_json(response.content)
+
+    async def toggle_product_readiness(self, business_id: str) -> HonulabsJob:
+        response = await self.client.post(
+            f'/v1/businesses/{business_id}/jobs/toggle_product_readiness',
+            headers=self.headers,
+        )
+        if response.status_code != HTTPStatus.ACCEPTED:
+            raise Exception(f'Could not Toggle product readiness: {response.text}: {response.status_code}')
+        return HonulabsJob.model_validate_json(response.content)
+
+    async def approve_trello_sprint_plan(self, business_id: str) -> HonulabsJob:
+        response = await self.client.post(
+            f'/v1/businesses/{business_id}/jobs/confirm_trello_sprint_ready',
+            headers=self.headers,
+        )
+        if response.status_code != HTTPStatus.ACCEPTED:
+            raise Exception(f'Could confirm trello sprint: {response.text}: {response.status_code}')
+        return HonulabsJob.model_validate_json(response.content)
+
+    async def invite_trello_collaborator(self, business_id: str, collaborator_emails: list[str]) -> HonulabsJob:
+        collabs = dict(collaborators=[
+                dict(
+                    email=email,
+                    type="normal"
+                )
+                for email in collaborator_emails
+            ]
+        )
+        response = await self.client.post(
+            f'/v1/businesses/{business_id}/jobs/add_users_to_trello_board',
+            json=collabs,
+            headers=self.headers,
+        )
+        if response.status_code != HTTPStatus.ACCEPTED:
+            raise Exception(f'Could add collaboratos to board: {response.text}: {response.status_code}')
+        return HonulabsJob.model_validate_json(response.content)
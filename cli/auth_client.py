@@ -1,9 +1,9 @@
 import socket
 import urllib
+from http import HTTPStatus
 from pathlib import Path
 
 import httpx
-from starlette import status
 
 from cli.api_client import HonulabsAPIClient
 from cli.settings import Settings
@@ -99,7 +99,7 @@ class HonulabsAuthClient:
         get_token_path = "/v1/token/get_token"
         url = urllib.parse.urljoin(honu_auth_base_url, get_token_path)
         response = httpx.post(url, params=dict(code=code), timeout=240)
-        if response.status_code != status.HTTP_200_OK:
+        if response.status_code != HTTPStatus.OK:
             print(f"There was a problem getting the token from the server {response.status_code} : {response.text}")
 
         response = response.json()
@@ -0,0 +1,145 @@
+"""
+Non-interactive entry point, for running commands from scripts, CI or cron.
+
+    python -m cli list_projects --json
+    python -m cli deploy_app --project "My Cool App" --json
+    python -m cli generate_business_plan --project <id> --answers answers.txt
+    python -m cli --script commands.txt --json
+
+Prompts are never read from the terminal: they are answered in order from `--answer` and `--answers`, and a prompt
+left without an answer fails the command. `--project` picks the project by ID or name wherever a command would ask
+for one. With `--json` the usual output goes to stderr and stdout gets one JSON object per command.
+"""
+import argparse
+import inspect
+import json
+import shlex
+import sys
+import traceback
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from cli.cmd import _COMMANDS
+from cli.utils.list_file import read_list_file
+from cli.utils.output import capture_results, to_json
+from cli.utils.prompts import set_answers, unanswered_prompt
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m cli',
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('command', nargs='?', help=f'One of: {", ".join(sorted(_COMMANDS))}')
+    parser.add_argument('args', nargs='*', help='Arguments of the command')
+    parser.add_argument('--project', help='ID or name of the project to use instead of asking for one')
+    parser.add_argument(
+        '-a', '--answer',
+        action='append',
+        default=[],
+        dest='answers',
+        help='Answer to the next prompt, repeat for every prompt in the order they are asked',
+    )
+    parser.add_argument(
+        '--answers',
+        type=Path,
+        dest='answers_file',
+        help='File of answers, one per line (blank lines answer with ENTER), or a JSON list in a .json file',
+    )
+    parser.add_argument('--json', action='store_true', help='Print machine-readable results to stdout')
+    parser.add_argument('--script', help='Run the commands in this file, one per line, or "-" for stdin')
+    parser.add_argument('--keep-going', action='store_true', help='Carry on with a script after a command fails')
+    return parser
+
+
+def _read_answers(path: Path) -> list[str]:
+    if path.suffix == '.json':
+        return [str(answer) for answer in json.loads(path.read_text())]
+    return path.read_text().splitlines()
+
+
+def run_command(command: str, args: list[str], project: str | None = None, answers: list[str] = ()) -> dict:
+    """Run a registered command without a terminal, returning its outcome and recorded results."""
+    from cli.utils.pick_business import select_project
+    from cli.utils.tracing import span
+
+    outcome = dict(command=command, args=args, ok=False, error=None, result={})
+    func = _COMMANDS.get(command)
+    if func is None:
+        outcome['error'] = f'Unknown command: {command}'
+        return outcome
+
+    params = inspect.signature(func).parameters.values()
+    min_args = sum(1 for p in params if p.default == inspect.Parameter.empty and p.kind != p.VAR_POSITIONAL)
+    if len(args) < min_args:
+        outcome['error'] = f'Not enough arguments. Need at least {min_args}'
+        return outcome
+
+    select_project(project)
+    set_answers(answers)
+    with capture_results() as results:
+        try:
+            with span(f'command {command}', **{'command.batch': True}):
+                func(*args)
+        except EOFError:
+            # Raised by a prompt without an answer, reported below
+            pass
+        except Exception as e:
+            traceback.print_exc()
+            outcome['error'] = f'{type(e).__name__}: {e}'
+        finally:
+            prompt = unanswered_prompt()
+            select_project(None)
+            set_answers(None)
+
+    job = results.get('job')
+    if outcome['error'] is None and prompt is not None:
+        outcome['error'] = f'No answer given for prompt: {prompt.strip()!r}'
+    elif outcome['error'] is None and results.get('error'):
+        # Usage errors and the like, recorded by the command itself
+        outcome['error'] = results['error']
+    elif outcome['error'] is None and job is not None and job.status == 'failed':
+        outcome['error'] = job.error or 'Job failed'
+    elif outcome['error'] is None and results.get('errors'):
+        outcome['error'] = f"{len(results['errors'])} item(s) failed"
+    outcome.update(ok=outcome['error'] is None, result=results)
+    return outcome
+
+
+def main(argv: list[str]) -> int:
+    parser = _parser()
+    options = parser.parse_intermixed_args(argv)
+    if options.script is None and options.command is None:
+        parser.error('a command or --script is required')
+
+    if options.script is not None:
+        invocations = []
+        for line in read_list_file(options.script):
+            line_options = parser.parse_intermixed_args(shlex.split(line))
+            if line_options.script is not None or line_options.command is None:
+                parser.error(f'invalid script line: {line}')
+            invocations.append(line_options)
+    else:
+        invocations = [options]
+
+    stdout = sys.stdout
+    exit_code = 0
+    # Keep stdout for the JSON results only
+    with redirect_stdout(sys.stderr if options.json else stdout):
+        for invocation in invocations:
+            answers = list(invocation.answers)
+            if invocation.answers_file is not None:
+                answers = _read_answers(invocation.answers_file) + answers
+            outcome = run_command(invocation.command, invocation.args, invocation.project, answers)
+
+            if options.json:
+                print(json.dumps(outcome, default=to_json), file=stdout, flush=True)
+            elif not outcome['ok']:
+                print(f"{invocation.command} failed: {outcome['error']}", file=sys.stderr)
+
+            if not outcome['ok']:
+                exit_code = 1
+                if not options.keep_going:
+                    break
+    return exit_code
@@ -1,33 +1,34 @@
 import cmd
 import inspect
+import json
+import threading
+import time
 import traceback
 from typing import Callable, Dict, Optional
 
-from halo import Halo
-from prompt_toolkit import PromptSession
-from prompt_toolkit.completion import WordCompleter
-from prompt_toolkit.history import InMemoryHistory
-from tabulate import tabulate
-
-from cli.api_client import HonulabsAPIClient
-from cli.auth_client import HonulabsAuthClient, spinup_single_use_server
-from cli.schema import Collaborator, Collaborators, JobStatus, VercelSecrets
-from cli.utils.handle_business_generation import BusinessPlanGeneration
-from cli.utils.handle_idea_generation import IdeaGeneration
-from cli.utils.job_manager import JobManager
-from cli.utils.mcp_setup import (
-    claude_desktop_mcp_connection_string,
-    cursor_mcp_connection_string,
-)
-from cli.utils.pick_business import pick_business
-from cli.utils.prompts import prompt_with_default
+from cli.utils.output import record
+from cli.utils.prompts import ask, prompt_with_default
 from cli.utils.token import HonulabsToken
 
+# Heavier modules (httpx, pydantic, prompt_toolkit, halo, ...) are imported by the code that uses them, so that the
+# prompt comes up without paying for every command's dependencies. See benchmarks/import_time.py.
+
 # Storage for registered commands
 _COMMANDS: Dict[str, Callable] = {}
 NOT_LOGGED_IN_HEADER = " -- User is not logged in \U0001F611 --"
 LOGGED_IN_HEADER = ' -- User is logged in \U0001F642 --'
+CHECKING_LOGIN_HEADER = ' -- Checking login... --'
 TABLE_STYLE = 'double_grid'
+# Most jobs query_jobs lists, the totals cover all of them
+JOB_QUERY_LIMIT = 50
+
+
+def _fail(message: str, *details: str):
+    # Print an error, which also fails the command when it is run from a script
+    print(f'Error: {message}')
+    for line in details:
+        print(line)
+    record(error=message)
 
 
 def command(name: Optional[str] = None, help_text: str = ""):
@@ -47,21 +48,39 @@ class HonulabsCommandPrompt(cmd.Cmd):
 
     def __init__(self):
         super().__init__()
+        self.login_header = CHECKING_LOGIN_HEADER
+        self.session = None
         self.use_rawinput = False  # Disable readline to remove autocomplete
         # Register all commands
         for cmd_name, func in _COMMANDS.items():
             setattr(self, f"do_{cmd_name}", self._create_command_handler(cmd_name, func))
 
-    def _check_token(self):
+    def _check_token(self) -> str:
+        from cli.api_client import HonulabsAPIClient
+        from cli.utils.pick_business import prefetch_businesses
+
         honulabs_token = HonulabsToken()
         if honulabs_token.token is None:
-            print(NOT_LOGGED_IN_HEADER)
-        else:
-            api_client = HonulabsAPIClient(honulabs_token.token)
-            if api_client.check_token():
-                print(LOGGED_IN_HEADER)
-            else:
-                print(NOT_LOGGED_IN_HEADER)
+            return NOT_LOGGED_IN_HEADER
+        api_client = HonulabsAPIClient(honulabs_token.token)
+        # Checking the token also opens the pooled API connection, ready for the first command
+        if not api_client.check_token():
+            return NOT_LOGGED_IN_HEADER
+        prefetch_businesses(api_client)
+        return LOGGED_IN_HEADER
+
+    def _start_token_check(self):
+        # Check the login in the background so the prompt is usable straight away
+        def check():
+            try:
+                self.login_header = self._check_token()
+            except Exception:
+                self.login_header = NOT_LOGGED_IN_HEADER
+            if self.session is not None and self.session.app.is_running:
+                self.session.app.invalidate()
+
+        self.login_header = CHECKING_LOGIN_HEADER
+        threading.Thread(target=check, daemon=True).start()
 
     def cmdloop(self):
         """Ultra simple command loop."""
@@ -74,13 +93,17 @@ class HonulabsCommandPrompt(cmd.Cmd):
 """)
 
         print(self.intro)
-        self._check_token()
+        self._start_token_check()
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.completion import WordCompleter
+        from prompt_toolkit.history import InMemoryHistory
+
         running = True
-        session = PromptSession(history=InMemoryHistory())
+        self.session = PromptSession(history=InMemoryHistory())
         completer = WordCompleter(list(_COMMANDS.keys()) + ['help', 'exit', 'quit'], ignore_case=True)
         while running:
             try:
-                line = session.prompt(self.prompt, completer=completer)
+                line = self.session.prompt(self.prompt, completer=completer, bottom_toolbar=lambda: self.login_header)
             except (KeyboardInterrupt, EOFError):
                 line = 'exit'
             if not line:
@@ -95,6 +118,8 @@ class HonulabsCommandPrompt(cmd.Cmd):
                 self.do_help(args)
             elif hasattr(self, f"do_{cmd}"):
                 getattr(self, f"do_{cmd}")(args)
+                if cmd in ('login', 'token_login'):
+                    self._start_token_check()
             else:
                 print(f"Unknown command: {cmd}")
 
@@ -107,13 +132,15 @@ class HonulabsCommandPrompt(cmd.Cmd):
                 params = list(sig.parameters.values())
 
                 # Simple argument count check
-                min_args = sum(1 for p in params if p.default == inspect.Parameter.empty)
+                min_args = sum(1 for p in params if p.default == inspect.Parameter.empty and p.kind != p.VAR_POSITIONAL)
                 if len(args) < min_args:
                     print(f"Error: Not enough arguments. Need at least {min_args}")
                     self._print_usage(cmd_name, func)
                     return
 
-                result = func(*args)
+                from cli.utils.tracing import span
+                with span(f'command {cmd_name}'):
+                    result = func(*args)
                 if result is not None:
                     print(result)
             except Exception:
@@ -166,22 +193,32 @@ class HonulabsCommandPrompt(cmd.Cmd):
 # Commands
 @command(help_text="Set token for API usage manually")
 def token_login(token: str):
+    from cli.api_client import HonulabsAPIClient
+    from cli.utils.spinner import make_spinner
+
     # Check token
     api_client = HonulabsAPIClient(token)
-    with Halo(text='Checking Token', spinner='dots'):
+    with make_spinner('Checking Token'):
         if api_client.check_token():
             print(LOGGED_IN_HEADER)
             HonulabsToken(token)
+            record(logged_in=True)
         else:
             print('Token was invalid, please try again')
+            record(logged_in=False, error='Token was invalid')
 
 
 @command(help_text='List your Projects')
 def list_projects():
+    from tabulate import tabulate
+    from cli.api_client import HonulabsAPIClient
+    from cli.utils.spinner import make_spinner
+
     token = HonulabsToken()
-    with Halo(text='Fetching Projects', spinner='dots'):
+    with make_spinner('Fetching Projects'):
         api_client = HonulabsAPIClient(token.token)
         businesses = api_client.list_businesses()
+        record(projects=businesses)
         if not businesses:
             print('You have no Projects yet! Please use `create_project` to make one!')
             return
@@ -195,22 +232,30 @@ def list_projects():
 
 @command(help_text='Create new Project')
 def create_project(*name: str):
+    from cli.api_client import HonulabsAPIClient
+    from cli.utils.pick_business import discard_prefetched_businesses
+    from cli.utils.spinner import make_spinner
+
     if not name:
-        print('Error: Project name is required.')
-        print('Usage: create_project <project_name>')
-        print('Example: create_project My Cool App')
+        _fail('Project name is required.', 'Usage: create_project <project_name>', 'Example: create_project My Cool App')
         return
     
     token = HonulabsToken()
     api_client = HonulabsAPIClient(token.token)
     name = ' '.join(name)
-    with Halo(text='Creating Project', spinner='dots'):
+    with make_spinner('Creating Project'):
         biz = api_client.create_business(name)
+    discard_prefetched_businesses()
+    record(project=biz)
     print(f'Project "{biz.name}" created!')
 
 
 @command(help_text='Delete Project and deployed services')
 def delete_project():
+    from cli.api_client import HonulabsAPIClient
+    from cli.utils.job_manager import JobManager
+    from cli.utils.pick_business import pick_business
+
     token = HonulabsToken()
     api_client = HonulabsAPIClient(token.token)
     business_id = pick_business(TABLE_STYLE)
@@ -229,8 +274,62 @@ def delete_project():
         print(f'Skipping wait for job completion. Job will continue running in the background, with id {job.job_id}')
 
 
+@command(help_text='Create several Projects at once. Pass names, or @file with one name per line')
+def bulk_create_projects(*names: str):
+    from cli.api_client import HonulabsAPIClient
+    from cli.utils.bulk_projects import BulkProjects, print_summary, read_project_list
+
+    names = read_project_list(names)
+    if not names:
+        _fail(
+            'At least one project name is required.',
+            'Usage: bulk_create_projects <name> [<name> ...] or bulk_create_projects @names.txt',
+        )
+        return
+
+    token = HonulabsToken()
+    rows = BulkProjects(HonulabsAPIClient(token.token)).create(names)
+    print_summary(rows, TABLE_STYLE)
+    record(projects=rows, errors=[row for row in rows if row['Status'] == 'failed'])
+
+
+@command(help_text='Delete several Projects at once. Pass names or IDs, or @file with one per line')
+def bulk_delete_projects(*projects: str):
+    from cli.api_client import HonulabsAPIClient
+    from cli.utils.bulk_projects import BulkProjects, print_summary, read_project_list
+
+    projects = read_project_list(projects)
+    if not projects:
+        _fail(
+            'At least one project name or ID is required.',
+            'Usage: bulk_delete_projects <name or id> [<name or id> ...] or bulk_delete_projects @projects.txt',
+        )
+        return
+
+    token = HonulabsToken()
+    bulk = BulkProjects(HonulabsAPIClient(token.token))
+    businesses, rows = bulk.resolve(projects)
+    if businesses:
+        print('The following projects and their deployed services will be deleted:')
+        for biz in businesses:
+            print(f'- {biz.name} ({biz.business_id})')
+        try:
+            confirmed = ask(f'Delete {len(businesses)} projects? [y/n] ').strip().lower() == 'y'
+        except (KeyboardInterrupt, EOFError):
+            confirmed = False
+        if not confirmed:
+            print('Cancelled.')
+            return
+        rows = bulk.delete(businesses) + rows
+    print_summary(rows, TABLE_STYLE)
+    record(projects=rows, errors=[row for row in rows if row['Status'] == 'failed'])
+
+
 @command(help_text='Generate a Business Plan for a Project')
 def generate_business_plan():
+    from cli.utils.handle_business_generation import BusinessPlanGeneration
+    from cli.utils.pick_business import pick_business
+
     business_id = pick_business(TABLE_STYLE)
     if business_id is None:
         return
@@ -242,6 +341,10 @@ def generate_business_plan():
 
 @command(help_text='Deploy latest landing page for Project')
 def deploy_app():
+    from cli.api_client import HonulabsAPIClient
+    from cli.utils.job_manager import JobManager
+    from cli.utils.pick_business import pick_business
+
     token = HonulabsToken()
     api_client = HonulabsAPIClient(token.token)
     business_id = pick_business(TABLE_STYLE)
@@ -276,6 +379,12 @@ def deploy_app():
 
 @command(help_text='Upload secret variables for your app')
 def upload_secrets():
+    from tabulate import tabulate
+    from cli.api_client import HonulabsAPIClient
+    from cli.schema import VercelSecrets
+    from cli.utils.job_manager import JobManager
+    from cli.utils.pick_business import pick_business
+
     token = HonulabsToken()
     api_client = HonulabsAPIClient(token.token)
     business_id = pick_business(TABLE_STYLE)
@@ -286,10 +395,10 @@ def upload_secrets():
     secrets = {}
     print('Input secret names and values. Leaving any input blank will continue to the upload portion.')
     while True:
-        secret_name = input('Secret Name: ').strip()
+        secret_name = ask('Secret Name: ').strip()
         if secret_name == '':
             break
-        secret_value = input('Secret Value: ').strip()
+        secret_value = ask('Secret Value: ').strip()
         if secret_value == '':
             break
         secrets[secret_name] = secret_value
@@ -324,6 +433,11 @@ def upload_secrets():
 
 @command(help_text='Check on the status of any Jobs that are currently in progress')
 def pending_jobs():
+    from tabulate import tabulate
+    from cli.api_client import HonulabsAPIClient
+    from cli.schema import JobStatus
+    from cli.utils.job_manager import JobManager
+    from cli.utils.pick_business import pick_business
 
     business_id = pick_business(TABLE_STYLE)
     if business_id is None:
@@ -332,7 +446,8 @@ def pending_jobs():
 
     token = HonulabsToken()
     api_client = HonulabsAPIClient(token.token)
-    pending_jobs = api_client.get_jobs(business_id, job_status=JobStatus.IN_PROGRESS)
+    pending_jobs = api_client.get_jobs(business_id, job_status=JobStatus.IN_PROGRESS, include_result=False)
+    record(jobs=pending_jobs)
     if not pending_jobs:
         print('No pending jobs!')
         return
@@ -352,13 +467,13 @@ def pending_jobs():
     ))
     try:
         print('If you would like to wait for one to complete, please type the number, or just press ENTER to return to the menu.')
-        selected_num = input('> ').strip()
+        selected_num = ask('> ').strip()
         if selected_num == '':
             return
 
         while selected_num not in data:
             print('That number is not a valid choice, please select a valid choice or press ENTER to cancel.')
-            selected_num = input('> ').strip()
+            selected_num = ask('> ').strip()
             if selected_num == '':
                 return
 
@@ -367,8 +482,37 @@ def pending_jobs():
     except (KeyboardInterrupt, EOFError):
         return
 
+
+@command(help_text='Live view of the pending and running jobs of all Projects, like top. Quit with Ctrl+C')
+def top():
+    import sys
+    from tabulate import tabulate
+    from cli.api_client import HonulabsAPIClient
+    from cli.utils.job_dashboard import JobDashboard
+
+    dashboard = JobDashboard(HonulabsAPIClient(HonulabsToken().token))
+    if sys.stdout.isatty():
+        dashboard.run()
+        return
+
+    # Not a terminal, e.g. a script, so print the jobs once
+    jobs = dashboard.snapshot()
+    if jobs:
+        print(tabulate(jobs, headers='keys', tablefmt=TABLE_STYLE))
+    else:
+        print('No pending jobs!')
+    for row in dashboard.failures:
+        print(f"Could not list the jobs of {row['Project']} ({row['ID']}): {row['Detail']}")
+    record(jobs=jobs, errors=dashboard.failures)
+
+
 @command(help_text="Invite user to the project GitHub repository")
 def invite_to_repo():
+    from cli.api_client import HonulabsAPIClient
+    from cli.schema import Collaborator, Collaborators
+    from cli.utils.job_manager import JobManager
+    from cli.utils.pick_business import pick_business
+
     token = HonulabsToken()
     api_client = HonulabsAPIClient(token.token)
     business_id = pick_business(TABLE_STYLE)
@@ -379,7 +523,7 @@ def invite_to_repo():
     invitees= []
     print('Enter GitHub usernames to invite (press Enter on empty line to finish):\n')
     while True:
-        invitee = input('GitHub username: ').strip()
+        invitee = ask('GitHub username: ').strip()
         if invitee == '':
             break
         invitees.append(Collaborator(username=invitee))
@@ -415,6 +559,9 @@ def invite_to_repo():
 @command(help_text="Login to the Honu platform")
 def login():
     """ Login to the platform using the CLI """
+    from cli.auth_client import HonulabsAuthClient, spinup_single_use_server
+    from cli.utils.spinner import make_spinner
+
     auth_client = HonulabsAuthClient()
     url = auth_client.get_login_url()
 
@@ -430,12 +577,17 @@ def login():
     print()
 
     code = spinup_single_use_server()
-    with Halo(text='Checking Token', spinner='dots'):
+    with make_spinner('Checking Token'):
         auth_client.exchange_token(code)
         print(LOGGED_IN_HEADER)
 
 @command(help_text="generate a new idea for a business")
 def new_business_idea():
+    from cli.api_client import HonulabsAPIClient
+    from cli.utils.handle_business_generation import BusinessPlanGeneration
+    from cli.utils.handle_idea_generation import IdeaGeneration
+    from cli.utils.pick_business import pick_business
+
     token = HonulabsToken()
     HonulabsAPIClient(token.token)
     business_id = pick_business(TABLE_STYLE)
@@ -449,13 +601,133 @@ def new_business_idea():
     # If user cancelled idea generation, don't proceed to business plan
     if new_idea is None:
         return
+    record(idea=new_idea)
 
     generator = BusinessPlanGeneration(business_id, TABLE_STYLE)
     generator.run(new_idea)
 
 
+@command(help_text='Generate ideas for every industry and geography at once. Pass comma separated lists or @files, and '
+                   'optionally the number of segments per market (default 3)')
+def idea_sweep(industries: str, geographies: str, segments: str = '3'):
+    import shutil
+    from tabulate import tabulate
+    from cli.api_client import HonulabsAPIClient
+    from cli.utils.idea_sweep import IdeaSweep, print_ideas, read_grid_values
+    from cli.utils.pick_business import pick_business
+
+    industries, geographies = read_grid_values(industries), read_grid_values(geographies)
+    if not industries or not geographies or not segments.isdigit() or int(segments) < 1:
+        _fail(
+            'At least one industry and one geography, and a positive number of segments, are required.',
+            'Usage: idea_sweep <industry>[,<industry> ...] <geography>[,<geography> ...] [segments]',
+        )
+        return
+
+    token = HonulabsToken()
+    business = pick_business(TABLE_STYLE)
+    if business is None:
+        return
+
+    print(f'Generating ideas for {len(industries) * len(geographies)} markets, {segments} segments each.')
+    sweep = IdeaSweep(HonulabsAPIClient(token.token), business.id)
+    ideas = sweep.run(industries, geographies, int(segments))
+    columns = shutil.get_terminal_size().columns
+    print_ideas(ideas, TABLE_STYLE, int(columns * .9) // 6)
+    if sweep.failures:
+        print(f'{len(sweep.failures)} markets or segments failed:')
+        print(tabulate(sweep.failures, headers='keys', tablefmt=TABLE_STYLE))
+    if sweep.running:
+        print(f'{len(sweep.running)} jobs are still running in the background:')
+        print(tabulate(sweep.running, headers='keys', tablefmt=TABLE_STYLE))
+    record(ideas=ideas, errors=sweep.failures, running=sweep.running)
+
+
+def _open_job_index(sync: bool = False):
+    # The local job index, synced first if asked or if it never has been
+    from cli.api_client import HonulabsAPIClient
+    from cli.settings import Settings
+    from cli.utils.job_index import JobIndex
+    from cli.utils.spinner import make_spinner
+
+    token = HonulabsToken()
+    api_client = HonulabsAPIClient(token.token)
+    index = JobIndex.for_token(Settings.JOB_INDEX_DIR, token.token)
+    if sync or index.last_synced() is None:
+        with make_spinner('Syncing jobs of all projects'):
+            counts = index.sync(api_client)
+        print(f"Synced {counts['projects']} projects in {counts['seconds']}s: "
+              f"{counts['new']} new and {counts['updated']} updated jobs.")
+        if counts['removed']:
+            print(f"Removed {counts['removed']} jobs of deleted projects.")
+        for row in counts['failed']:
+            print(f"Could not list the jobs of {row['Project']} ({row['ID']}): {row['Detail']}")
+        record(sync=counts, errors=counts['failed'])
+    else:
+        synced_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(index.last_synced()))
+        print(f'Jobs as of {synced_at}, run `sync_jobs` to update.')
+    return index
+
+
+@command(help_text='Update the local index of the jobs of all Projects, used by query_jobs and job_costs')
+def sync_jobs():
+    _open_job_index(sync=True).close()
+
+
+@command(help_text='List jobs of all Projects from the local index. Filter with type=, status=, project=, since=, '
+                   'until= (ISO dates) or month=YYYY-MM')
+def query_jobs(*filters: str):
+    from tabulate import tabulate
+    from cli.utils.job_index import parse_filters
+
+    try:
+        filters = parse_filters(list(filters))
+    except ValueError as e:
+        _fail(str(e))
+        return
+
+    index = _open_job_index()
+    try:
+        jobs = index.query(filters, limit=JOB_QUERY_LIMIT)
+        total, cost = index.totals(filters)
+    finally:
+        index.close()
+    print(tabulate(jobs, headers='keys', tablefmt=TABLE_STYLE))
+    shown = f'{len(jobs)} most recent of ' if len(jobs) < total else ''
+    print(f'{shown}{total} jobs, total cost {cost}')
+    record(jobs=jobs, total_jobs=total, total_cost=cost)
+
+
+@command(help_text='Total job costs of all Projects from the local index, by type, status, project, month or day. '
+                   'Takes the same filters as query_jobs')
+def job_costs(*args: str):
+    from tabulate import tabulate
+    from cli.utils.job_index import check_group, parse_filters
+
+    group_by = next((arg for arg in args if '=' not in arg), 'type')
+    try:
+        check_group(group_by)
+        filters = parse_filters([arg for arg in args if '=' in arg])
+    except ValueError as e:
+        _fail(str(e))
+        return
+
+    index = _open_job_index()
+    try:
+        rows = index.costs(group_by, filters)
+        total, cost = index.totals(filters)
+    finally:
+        index.close()
+    print(tabulate(rows, headers='keys', tablefmt=TABLE_STYLE))
+    print(f'{total} jobs, total cost {cost}')
+    record(costs=rows, total_jobs=total, total_cost=cost)
+
+
 @command(help_text="Print the configuration json to connect to the Honu MCP server")
 def mcp_config_string():
+    from cli.utils.mcp_setup import claude_desktop_mcp_connection_string, cursor_mcp_connection_string
+    from cli.utils.pick_business import pick_business
+
     business = pick_business(TABLE_STYLE)
     if business is None:
         return
@@ -464,6 +736,10 @@ def mcp_config_string():
     token = HonulabsToken().token
     claude_desktop_connection_string = claude_desktop_mcp_connection_string(token, model_ref)
     cursor_connection_string = cursor_mcp_connection_string(token, model_ref)
+    record(
+        claude_desktop=json.loads(claude_desktop_connection_string),
+        cursor=json.loads(cursor_connection_string),
+    )
 
     print("=" * 64)
     print()
@@ -491,6 +767,10 @@ def mcp_config_string():
 
 @command(help_text="Toggle readiness switch")
 def toggle_readiness_switch():
+    from cli.api_client import HonulabsAPIClient
+    from cli.utils.job_manager import JobManager
+    from cli.utils.pick_business import pick_business
+
     token = HonulabsToken()
     api_client = HonulabsAPIClient(token.token)
     business_id = pick_business(TABLE_STYLE)
@@ -516,6 +796,10 @@ def toggle_readiness_switch():
 
 @command(help_text='Approve the proposed trello sprint plan')
 def approve_trello_sprint_plan():
+    from cli.api_client import HonulabsAPIClient
+    from cli.utils.job_manager import JobManager
+    from cli.utils.pick_business import pick_business
+
     token = HonulabsToken()
     api_client = HonulabsAPIClient(token.token)
     business_id = pick_business(TABLE_STYLE)
@@ -541,6 +825,10 @@ def approve_trello_sprint_plan():
 
 @command(help_text='Invite a collaborator to the project trello board')
 def invite_trello_collaborator():
+    from cli.api_client import HonulabsAPIClient
+    from cli.utils.job_manager import JobManager
+    from cli.utils.pick_business import pick_business
+
     token = HonulabsToken()
     api_client = HonulabsAPIClient(token.token)
     business_id = pick_business(TABLE_STYLE)
@@ -551,7 +839,7 @@ def invite_trello_collaborator():
     invitees= []
     print('Enter emails to invite collaborators to your trello board (press Enter on empty line to finish):\n')
     while True:
-        invitee = input('Email: ').strip()
+        invitee = ask('Email: ').strip()
         if invitee == '':
             break
         invitees.append(invitee)
@@ -580,4 +868,48 @@ def invite_trello_collaborator():
 
     except (KeyboardInterrupt, EOFError):
         manager.spinner.stop()
-        print(f'Skipping wait for job completion. Job will continue running in the background, with id {job.job_id}')
\ No newline at end of file
+        print(f'Skipping wait for job completion. Job will continue running in the background, with id {job.job_id}')
+
+
+@command(help_text='Show API request metrics for this session. Use `stats json` for JSON, `stats reset` to start over')
+def stats(output: str = 'table'):
+    from tabulate import tabulate
+    from cli.utils.metrics import LATENCY_BUCKETS_MS, request_metrics
+
+    if output == 'reset':
+        request_metrics.reset()
+        print('Request metrics reset.')
+        return
+
+    metrics = request_metrics.to_dict()
+    record(stats=metrics)
+    if output == 'json':
+        print(json.dumps(metrics, indent=2))
+        return
+    if not metrics['endpoints']:
+        print('No API requests made yet.')
+        return
+
+    def kilobytes(count: int) -> str:
+        return f'{count / 1024:.1f}'
+
+    print(tabulate(
+        (
+            {
+                'Endpoint': name,
+                'Calls': endpoint['calls'],
+                'Status Codes': ', '.join(
+                    [f'{code}: {count}' for code, count in endpoint['status_codes'].items()]
+                    + ([f"errors: {endpoint['errors']}"] if endpoint['errors'] else [])
+                ),
+                'Mean ms': endpoint['mean_ms'],
+                'p95 ms': f"<={endpoint['p95_bucket_ms']}" if endpoint['p95_bucket_ms'] else f'>{LATENCY_BUCKETS_MS[-1]}',
+                'Max ms': endpoint['max_ms'],
+                'KB In': kilobytes(endpoint['bytes_in']),
+                'KB Out': kilobytes(endpoint['bytes_out']),
+            }
+            for name, endpoint in sorted(metrics['endpoints'].items(), key=lambda item: -item[1]['calls'])
+        ),
+        headers='keys',
+        tablefmt=TABLE_STYLE,
+    ))
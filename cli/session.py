@@ -0,0 +1,68 @@
+import atexit
+import threading
+from importlib.util import find_spec
+
+import httpx
+
+from cli.settings import Settings
+from cli.utils.metrics import AsyncMeteredTransport, MeteredTransport
+
+# A single pooled connection to the Honulabs API, shared by every HonulabsAPIClient in the process
+_session: httpx.Client | None = None
+# Held while it is created or swapped, so that threads starting at once don't each build one
+_session_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    # HTTP/2 support in httpx needs the optional `h2` package
+    return find_spec('h2') is not None
+
+
+def _transport_options() -> dict:
+    return dict(
+        http2=Settings.API_HTTP2 and _http2_available(),
+        limits=httpx.Limits(
+            max_connections=Settings.API_MAX_CONNECTIONS,
+            max_keepalive_connections=Settings.API_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=Settings.API_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+def _session_options() -> dict:
+    return dict(base_url=Settings.API_URL, timeout=Settings.API_TIMEOUT)
+
+
+def get_session() -> httpx.Client:
+    global _session
+    with _session_lock:
+        if _session is None or _session.is_closed:
+            # Every request is recorded for the `stats` command
+            transport = MeteredTransport(httpx.HTTPTransport(**_transport_options()))
+            _session = httpx.Client(**_session_options(), transport=transport)
+        return _session
+
+
+def set_session(session: httpx.Client | None):
+    # Send every HonulabsAPIClient's requests through `session`, e.g. one bound to a local app for benchmarks.
+    # None goes back to a session built from the settings
+    global _session
+    with _session_lock:
+        _session = session
+
+
+def new_async_session() -> httpx.AsyncClient:
+    # Async clients are bound to the event loop they are used on, so each AsyncHonulabsAPIClient owns its own
+    transport = AsyncMeteredTransport(httpx.AsyncHTTPTransport(**_transport_options()))
+    return httpx.AsyncClient(**_session_options(), transport=transport)
+
+
+def close_session():
+    global _session
+    with _session_lock:
+        session, _session = _session, None
+    if session is not None:
+        session.close()
+
+
+atexit.register(close_session)
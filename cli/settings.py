@@ -1,3 +1,6 @@
+from pathlib import Path
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -8,6 +11,64 @@ class _Settings(BaseSettings):
     HAP_URL: str = 'https://happi.honu.ai'
     MCP_SERVER_URL: str = 'https://mcp.honu.ai/mcp/'
 
+    # HTTP session used for the Honulabs API
+    API_TIMEOUT: float = 300
+    API_HTTP2: bool = False
+    API_MAX_CONNECTIONS: int = 20
+    API_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    API_KEEPALIVE_EXPIRY: float = 60
+
+    # Local cache of read endpoints, revalidated with ETag / Last-Modified
+    HTTP_CACHE: bool = True
+    HTTP_CACHE_DIR: Path = Path.home() / '.honulabs' / 'http_cache'
+    HTTP_CACHE_MAX_MB: int = 64
+
+    # Local store of finished jobs and their results, which never change once finished, see cli.utils.artifact_store
+    ARTIFACT_STORE: bool = True
+    ARTIFACT_STORE_DIR: Path = Path.home() / '.honulabs' / 'artifacts'
+    ARTIFACT_STORE_MAX_MB: int = 256
+
+    # Maximum number of job status requests in flight when waiting on several jobs
+    JOB_WAIT_CONCURRENCY: int = 8
+
+    # Follow jobs through the API's event stream when available, polling otherwise
+    JOB_EVENTS: bool = True
+
+    # How often job status is polled while waiting, see cli.utils.polling
+    JOB_POLL_STRATEGY: Literal['backoff', 'fixed'] = 'backoff'
+    JOB_POLL_INTERVAL: float = 1
+    JOB_POLL_INITIAL_INTERVAL: float = 0.25
+    JOB_POLL_FAST_ATTEMPTS: int = 8
+    JOB_POLL_BACKOFF_FACTOR: float = 1.5
+    JOB_POLL_MAX_INTERVAL: float = 10
+    JOB_POLL_JITTER: float = 0.2
+
+    # Number of jobs requested per page when listing jobs
+    JOBS_PAGE_SIZE: int = 100
+
+    # Jobs started by generate_business_plan and new_business_idea, kept so an interrupted run can pick them back up
+    PIPELINE_STATE_DIR: Path = Path.home() / '.honulabs' / 'pipelines'
+
+    # Start generating name ideas alongside the base business plan, so they are ready by the naming step. Costs a name
+    # ideas job even when the business is then named without them
+    SPECULATIVE_NAME_IDEAS: bool = False
+
+    # Start the next batch of ideas in new_business_idea while the current one is on screen, so asking for more shows
+    # them straight away. Costs an idea generation job even when an idea is picked from the first batch
+    PREFETCH_IDEAS: bool = False
+
+    # File that trace spans of commands, API requests and job waits are appended to, see cli.utils.tracing
+    TRACE_FILE: Path | None = None
+
+    # Local index of the jobs of every project, used by query_jobs and job_costs, see cli.utils.job_index
+    JOB_INDEX_DIR: Path = Path.home() / '.honulabs' / 'job_index'
+
+    # How often `top` lists the jobs of every project again, to pick up new projects and jobs
+    TOP_REFRESH_INTERVAL: float = 15
+
+    # Maximum number of requests in flight for bulk_create_projects / bulk_delete_projects / idea_sweep / sync_jobs / top
+    BULK_CONCURRENCY: int = 8
+
     AUTH0_DOMAIN: str = "honu-prod-1.uk.auth0.com"
     AUTH0_FE_APP_CLIENT_ID: str = "y9lJHJQFUCxXF8ejpKulQR4EUbdShPQ8"
     AUTH0_API_IDENTIFIER_AUDIENCE: str = "https://auth.honu.ai"
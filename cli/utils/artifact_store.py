@@ -0,0 +1,87 @@
+import gzip
+import hashlib
+import os
+from pathlib import Path
+
+from cli.utils.local_files import account_path, digest, evict_least_recent, total_size, write_atomic
+
+
+def _content_hash(value: bytes) -> str:
+    return hashlib.sha256(value).hexdigest()
+
+
+class ArtifactStore:
+    """
+    On-disk store of finished jobs, which never change once finished, so they can be kept without revalidation.
+
+    Contents are stored gzipped under the hash of their bytes, so the same content is only kept once, and each job ID
+    points at the hash of its content. Reading an entry marks it as used, and once the store grows past `max_bytes`
+    the least recently used contents are evicted, along with the job IDs pointing at them.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._total: int | None = None  # Bytes of stored contents, counted on the first write then kept up to date
+
+    @classmethod
+    def for_token(cls, directory: Path, token: str, max_bytes: int) -> 'ArtifactStore':
+        return cls(account_path(directory, token), max_bytes)
+
+    def _index_path(self, key: str) -> Path:
+        return self.directory / 'index' / digest(key)
+
+    def _object_path(self, content_hash: str) -> Path:
+        return self.directory / 'objects' / content_hash[:2] / f'{content_hash}.gz'
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            content_hash = self._index_path(key).read_text()
+            object_path = self._object_path(content_hash)
+            data = gzip.decompress(object_path.read_bytes())
+        except FileNotFoundError:
+            # Evicted by another process
+            self._index_path(key).unlink(missing_ok=True)
+            return None
+        except (OSError, EOFError, gzip.BadGzipFile):
+            return None
+        if _content_hash(data) != content_hash:
+            return None
+        try:
+            os.utime(object_path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes):
+        content_hash = _content_hash(data)
+        object_path = self._object_path(content_hash)
+        if object_path.exists():
+            os.utime(object_path)
+        else:
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            compressed = gzip.compress(data, compresslevel=6)
+            write_atomic(object_path, compressed)
+            self._total = total_size(self._objects()) if self._total is None else self._total + len(compressed)
+        index_path = self._index_path(key)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(index_path, content_hash.encode())
+        if self._total is not None and self._total > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        # Remove the least recently used contents once the store is over max_bytes, then the job IDs pointing at them
+        self._total, evicted = evict_least_recent(self._objects(), self.max_bytes)
+        if evicted:
+            self._remove_index_entries({path.name.removesuffix('.gz') for path in evicted})
+
+    def _remove_index_entries(self, content_hashes: set[str]):
+        for path in (self.directory / 'index').iterdir():
+            try:
+                if path.read_text() in content_hashes:
+                    path.unlink()
+            except OSError:
+                pass
+
+    def _objects(self):
+        return (self.directory / 'objects').glob('*/*.gz')
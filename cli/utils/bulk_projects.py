@@ -0,0 +1,125 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Iterable
+
+from tabulate import tabulate
+
+from cli.api_client import HonulabsAPIClient
+from cli.schema import HonulabsBusiness, HonulabsJob, JobStatus
+from cli.settings import Settings
+from cli.utils.job_manager import JobManager
+from cli.utils.list_file import read_list_file
+from cli.utils.pick_business import discard_prefetched_businesses
+from cli.utils.spinner import make_spinner
+from cli.utils.tracing import current_span, run_in_span
+
+
+def read_project_list(items: Iterable[str]) -> list[str]:
+    """
+    Project names or IDs from command arguments. An argument starting with `@` is a file with one project per line,
+    blank lines and lines starting with `#` are skipped.
+    """
+    projects = []
+    for item in items:
+        if item.startswith('@'):
+            projects.extend(read_list_file(item[1:]))
+        else:
+            projects.append(item)
+    return projects
+
+
+class BulkProjects:
+    """
+    Create or delete many projects at once, with at most `max_concurrency` requests in flight.
+    Each method returns one summary row per project, in input order.
+    """
+
+    def __init__(self, api_client: HonulabsAPIClient, max_concurrency: int | None = None):
+        self.api_client = api_client
+        self.max_concurrency = max_concurrency or Settings.BULK_CONCURRENCY
+
+    def create(self, names: list[str]) -> list[dict]:
+        def create_one(name: str) -> dict:
+            try:
+                biz = self.api_client.create_business(name)
+            except Exception as e:
+                return {'Project': name, 'ID': None, 'Status': 'failed', 'Detail': str(e)}
+            return {'Project': biz.name, 'ID': biz.business_id, 'Status': 'created', 'Detail': None}
+
+        with make_spinner(f'Creating {len(names)} projects'):
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                rows = list(pool.map(partial(run_in_span, current_span(), create_one), names))
+        discard_prefetched_businesses()
+        return rows
+
+    def resolve(self, projects: list[str]) -> tuple[list[HonulabsBusiness], list[dict]]:
+        """Match names or IDs to existing projects. Unknown and ambiguous names are returned as failed rows."""
+        businesses = self.api_client.list_businesses()
+        by_id = {biz.business_id: biz for biz in businesses}
+        by_name: dict[str, list[HonulabsBusiness]] = {}
+        for biz in businesses:
+            by_name.setdefault(biz.name, []).append(biz)
+
+        matched, rows = [], []
+        for project in dict.fromkeys(projects):
+            if project in by_id:
+                matched.append(by_id[project])
+            elif len(by_name.get(project, [])) == 1:
+                matched.append(by_name[project][0])
+            elif project in by_name:
+                rows.append({
+                    'Project': project, 'ID': None, 'Status': 'failed',
+                    'Detail': f'Name matches {len(by_name[project])} projects, use the ID instead',
+                })
+            else:
+                rows.append({'Project': project, 'ID': None, 'Status': 'failed', 'Detail': 'Project not found'})
+        return matched, rows
+
+    def delete(self, businesses: list[HonulabsBusiness], wait: bool = True) -> list[dict]:
+        def delete_one(biz: HonulabsBusiness) -> HonulabsJob | Exception:
+            try:
+                return self.api_client.delete_business(biz.business_id)
+            except Exception as e:
+                return e
+
+        with make_spinner(f'Starting deletion of {len(businesses)} projects'):
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                started = list(pool.map(partial(run_in_span, current_span(), delete_one), businesses))
+        discard_prefetched_businesses()
+
+        rows = {}
+        jobs = []
+        for biz, job in zip(businesses, started):
+            if isinstance(job, Exception):
+                rows[biz.business_id] = {'Project': biz.name, 'ID': biz.business_id, 'Status': 'failed',
+                                         'Detail': str(job)}
+            else:
+                rows[biz.business_id] = {'Project': biz.name, 'ID': biz.business_id, 'Status': 'deleting',
+                                         'Detail': f'Job {job.job_id}'}
+                jobs.append(job)
+
+        if wait and jobs:
+            print(f'Deleting {len(jobs)} projects. Skip wait with Ctrl+C.')
+            try:
+                for job in JobManager.await_many(jobs, max_concurrency=self.max_concurrency):
+                    rows[job.business.business_id].update(self._deletion_outcome(job))
+            except (KeyboardInterrupt, EOFError):
+                print('Skipping wait for job completion. Deletions will continue running in the background.')
+        return [rows[biz.business_id] for biz in businesses]
+
+    @staticmethod
+    def _deletion_outcome(job: HonulabsJob) -> dict:
+        if job.status == JobStatus.FAILED:
+            return {'Status': 'failed', 'Detail': job.error or 'Job was unsuccessful but had no error message'}
+        # A finished deletion may no longer be readable, as in JobManager
+        return {'Status': 'deleted', 'Detail': None}
+
+
+def print_summary(rows: list[dict], table_style: str):
+    print(tabulate(
+        ({key: value if value is not None else '' for key, value in row.items()} for row in rows),
+        headers='keys',
+        tablefmt=table_style,
+    ))
+    failed = sum(1 for row in rows if row['Status'] == 'failed')
+    print(f'{len(rows) - failed}/{len(rows)} succeeded' + (f', {failed} failed' if failed else ''))
@@ -5,20 +5,41 @@ from pydantic import BaseModel
 from tabulate import tabulate
 
 from cli.api_client import HonulabsAPIClient
+from cli.settings import Settings
 from cli.schema import BusinessPlanRequirementsCreate, JobStatus, BusinessPlanRequirements, BusinessPlan, \
     BusinessNamesDomains, HonulabsJob
+from cli.utils.job_history import JobHistory
 from cli.utils.job_manager import JobManager
+from cli.utils.output import record
+from cli.utils.pipeline_state import PipelineState
+from cli.utils.prompts import ask, is_interactive
 from cli.utils.token import HonulabsToken
 
+RESUME_MESSAGE = 'If you stop waiting, the job carries on and running generate_business_plan again picks it back up.'
+SKIP_WAIT_MESSAGE = (
+    'Are you sure you want to stop waiting? The job will carry on, and running generate_business_plan again picks it '
+    'back up. Press Ctrl+C again to confirm.'
+)
+
 
 class BusinessPlanGeneration:
     REQUIREMENTS_JOB_TYPE = 'business_plan_requirements'
+    BASE_PLAN_JOB_TYPE = 'base_business_plan'
+    NAME_IDEAS_JOB_TYPE = 'business_names_and_domains'
+    FULL_PLAN_JOB_TYPE = 'full_business_details'
 
-    def __init__(self, business_id: str, table_style: str):
+    def __init__(self, business_id: str, table_style: str, speculative_names: bool | None = None):
         self.token = HonulabsToken()
         self.api_client = HonulabsAPIClient(self.token.token)
         self.business_id = business_id
         self.table_style = table_style
+        # Earlier jobs of the business, listed once for all the steps that can reuse their results
+        self.history = JobHistory(self.api_client, business_id)
+        # Jobs started by this or an interrupted earlier run, by step, so that they are never started twice
+        self.state = PipelineState('business_plan', business_id)
+        self.speculative_names = Settings.SPECULATIVE_NAME_IDEAS if speculative_names is None else speculative_names
+        # Name ideas job started alongside the base business plan, see _start_name_ideas
+        self._name_ideas_job: HonulabsJob | None = None
 
     def run(self, initial_idea: str | None = None):
         """
@@ -30,23 +51,29 @@ class BusinessPlanGeneration:
         requirements = self._get_business_plan_requirements(initial_idea)
         if requirements is None:
             return
+        record(requirements=requirements)
         print()
+        if self.speculative_names:
+            self._start_name_ideas(requirements)
         base_business_plan = self._get_base_business_plan(requirements)
         if base_business_plan is None:
             return
+        record(base_business_plan=base_business_plan)
         print()
         business_name = self._get_business_name(requirements)
         if business_name is None:
             return
+        record(business_name=business_name)
         print()
         self._generate_full_business_plan(base_business_plan, business_name)
 
-    def _check_for_finished_job_in_step(self, step: str):
-        return self.api_client.get_jobs(
-            self.business_id,
-            step,
-            JobStatus.SUCCESS,
-        )
+    def _check_for_finished_job_in_step(self, step: str) -> list[HonulabsJob]:
+        return self.history.find(step, JobStatus.SUCCESS)
+
+    def _await(self, manager: JobManager) -> HonulabsJob:
+        job = manager.await_job_completion()
+        self.history.add(job)
+        return job
 
     def _select_finished_job(self, jobs: list[HonulabsJob]) -> dict | None:
         data = {
@@ -61,17 +88,17 @@ class BusinessPlanGeneration:
         ))
         try:
             print('Please input the number of the finished job you would like to use, or just press ENTER to start again.')
-            selected_num = input('> ').strip()
+            selected_num = ask('> ').strip()
             if selected_num == '':
                 return
 
             while selected_num not in data:
                 print('That number is not a valid choice, please select a valid choice or press ENTER to cancel.')
-                selected_num = input('> ').strip()
+                selected_num = ask('> ').strip()
                 if selected_num == '':
                     return
 
-            return data[selected_num].result
+            return self.history.result(data[selected_num])
         except (KeyboardInterrupt, EOFError):
             return
 
@@ -101,14 +128,24 @@ class BusinessPlanGeneration:
 
             print('Please take a look at the generated content to make sure you are happy with what was generated.')
             print(f'Generated files can be found in {dir_path}, and will open in a file browser as well.')
-            webbrowser.open(f'file://{dir_path}')
+            if is_interactive():
+                webbrowser.open(f'file://{dir_path}')
             print()
-            return input('Are you happy with the result? [y/n] ').lower().strip().startswith('y')
+            return ask('Are you happy with the result? [y/n] ').lower().strip().startswith('y')
 
     def _get_business_plan_requirements(self, previous_idea: str | None) -> BusinessPlanRequirements | None:
         print('Step 1: Business Plan Requirements')
 
-        finished_jobs = self._check_for_finished_job_in_step('business_plan_requirements')
+        # A saved job is only for this idea if it was started from it
+        matches = None
+        if previous_idea:
+            idea = previous_idea['saas_venture_description']
+            matches = lambda inputs: inputs.get('idea') == idea
+        resumed = self.state.resume(
+            self.api_client, self.business_id, self.REQUIREMENTS_JOB_TYPE, matches=matches, confirm=True,
+        )
+        job = resumed[0] if resumed is not None else None
+        finished_jobs = self._check_for_finished_job_in_step(self.REQUIREMENTS_JOB_TYPE) if job is None else []
         result = None
         if finished_jobs:
             print('Found following completed Business Plan Requirements generation jobs.')
@@ -116,7 +153,7 @@ class BusinessPlanGeneration:
             if result is None:
                 print('Not using existing result, starting generation of new business plan requirements!')
 
-        if result is None:
+        if result is None and job is None:
             print('Please answer the following prompts.')
             print()
 
@@ -126,14 +163,14 @@ class BusinessPlanGeneration:
                     print(f"Using the generated idea : {previous_idea['saas_venture_description']}")
                     requirements_data[name] = previous_idea['saas_venture_description']
                 else:
-                    response = input(f'{field.description} ')
+                    response = ask(f'{field.description} ')
                     requirements_data[name] = response.strip()
                     print()
 
             payload = BusinessPlanRequirementsCreate(**requirements_data)
 
             while True:
-                yes_no = input('Is this okay? [y/n] ').strip().lower()
+                yes_no = ask('Is this okay? [y/n] ').strip().lower()
                 if yes_no == 'y':
                     break
                 elif yes_no == 'n':
@@ -143,37 +180,49 @@ class BusinessPlanGeneration:
                     print(f'\"{yes_no}\" is not a valid response, please use y/n')
 
 
-            job = self.api_client.generate_business_requirements(self.business_id, payload)
+            job = self.state.resume_or_submit(
+                self.api_client,
+                self.business_id,
+                self.REQUIREMENTS_JOB_TYPE,
+                payload.model_dump(mode='json'),
+                lambda: self.api_client.generate_business_requirements(self.business_id, payload),
+            )
             print('Requirements Generation started successfully. Awaiting completion.')
-            print('Please ensure you wait for this Job to finish as there is currently no way to continue an existing job.')
+
+        if result is None:
+            print(RESUME_MESSAGE)
             print()
             manager = JobManager(job)
             try:
-                job = manager.await_job_completion()
+                job = self._await(manager)
             except (KeyboardInterrupt, EOFError):
                 manager.spinner.stop()
                 print()
-                print('Are you sure you want to skip the job? You currently cannot continue from an existing job. Press Ctrl+C again to confirm cancelling.')
+                print(SKIP_WAIT_MESSAGE)
                 try:
-                    job = manager.await_job_completion()
+                    job = self._await(manager)
                 except (KeyboardInterrupt, EOFError):
                     print('Exiting')
                     return
 
             # Put the data into files and let the user read them for verification
             if job.status == JobStatus.FAILED:
+                self.state.finish(self.REQUIREMENTS_JOB_TYPE)
                 return
             result = job.result
 
         requirements = BusinessPlanRequirements(**result)
-        if self._verify_result(requirements):
-            return requirements
-        return None
+        accepted = self._verify_result(requirements)
+        self.state.finish(self.REQUIREMENTS_JOB_TYPE)
+        return requirements if accepted else None
 
     def _get_base_business_plan(self, requirements: BusinessPlanRequirements) -> BusinessPlan | None:
         print('Step 2: Base Business Plan Generation')
 
-        finished_jobs = self._check_for_finished_job_in_step('base_business_plan')
+        inputs = requirements.model_dump(mode='json')
+        resumed = self.state.resume(self.api_client, self.business_id, self.BASE_PLAN_JOB_TYPE, inputs)
+        job = resumed[0] if resumed is not None else None
+        finished_jobs = self._check_for_finished_job_in_step(self.BASE_PLAN_JOB_TYPE) if job is None else []
         result = None
         if finished_jobs:
             print('Found following completed Base Business Plan generation jobs.')
@@ -182,35 +231,41 @@ class BusinessPlanGeneration:
                 print('Not using existing result, starting generation of new base business plan!')
 
         if result is None:
-            print('We will now begin generating a basic business plan for you, please wait')
-
-            job = self.api_client.generate_base_business_plan(self.business_id, requirements)
-            print('Base Business Plan generation started successfully. Awaiting completion.')
-            print('Please ensure you wait for this Job to finish as there is currently no way to continue an existing job.')
+            if job is None:
+                print('We will now begin generating a basic business plan for you, please wait')
+                job = self.state.resume_or_submit(
+                    self.api_client,
+                    self.business_id,
+                    self.BASE_PLAN_JOB_TYPE,
+                    inputs,
+                    lambda: self.api_client.generate_base_business_plan(self.business_id, requirements),
+                )
+                print('Base Business Plan generation started successfully. Awaiting completion.')
+            print(RESUME_MESSAGE)
             print()
             manager = JobManager(job)
             try:
-                job = manager.await_job_completion()
+                job = self._await(manager)
             except (KeyboardInterrupt, EOFError):
                 manager.spinner.stop()
                 print()
-                print(
-                    'Are you sure you want to skip the job? You currently cannot continue from an existing job. Press Ctrl+C again to confirm cancelling.')
+                print(SKIP_WAIT_MESSAGE)
                 try:
-                    job = manager.await_job_completion()
+                    job = self._await(manager)
                 except (KeyboardInterrupt, EOFError):
                     print('Exiting')
                     return
 
             # Put the data into files and let the user read them for verification
             if job.status == JobStatus.FAILED:
+                self.state.finish(self.BASE_PLAN_JOB_TYPE)
                 return
             result = job.result
 
         plan = BusinessPlan(**result)
-        if self._verify_result(plan, True):
-            return plan
-        return None
+        accepted = self._verify_result(plan, True)
+        self.state.finish(self.BASE_PLAN_JOB_TYPE)
+        return plan if accepted else None
 
     def _get_business_name(self, requirements: BusinessPlanRequirements, ideas: list[str] | None = None) -> str | None:
         if ideas is not None:
@@ -220,8 +275,11 @@ class BusinessPlanGeneration:
             print()
         else:
             print('Step 3: Naming your Business')
+            ideas = self._speculative_name_ideas(requirements)
+            if ideas:
+                return self._get_business_name(requirements, ideas)
 
-        name = input(
+        name = ask(
             'Please input an official name for your business. '
             'Alternatively, just press ENTER if you want us to generate some new ideas. ',
         )
@@ -230,24 +288,30 @@ class BusinessPlanGeneration:
             return name
 
         # Generate some ideas and prompt again
-        job = self.api_client.generate_business_name_ideas(self.business_id, requirements)
+        job = self.state.resume_or_submit(
+            self.api_client,
+            self.business_id,
+            self.NAME_IDEAS_JOB_TYPE,
+            requirements.model_dump(mode='json'),
+            lambda: self.api_client.generate_business_name_ideas(self.business_id, requirements),
+        )
         print('Fetching name ideas.')
         print()
         manager = JobManager(job)
         try:
-            job = manager.await_job_completion()
+            job = self._await(manager)
         except (KeyboardInterrupt, EOFError):
             manager.spinner.stop()
             print()
-            print(
-                'Are you sure you want to skip the job? You currently cannot continue from an existing job. Press Ctrl+C again to confirm cancelling.')
+            print(SKIP_WAIT_MESSAGE)
             try:
-                job = manager.await_job_completion()
+                job = self._await(manager)
             except (KeyboardInterrupt, EOFError):
                 print('Exiting')
                 return
 
         # Put the data into files and let the user read them for verification
+        self.state.finish(self.NAME_IDEAS_JOB_TYPE)
         if job.status == JobStatus.FAILED:
             return
 
@@ -255,22 +319,69 @@ class BusinessPlanGeneration:
         print()
         return self._get_business_name(requirements, [idea.business_name for idea in result.business_names_with_domains])
 
+    def _start_name_ideas(self, requirements: BusinessPlanRequirements):
+        # Name ideas only depend on the requirements, so they can be generated while the base business plan is
+        try:
+            self._name_ideas_job = self.state.resume_or_submit(
+                self.api_client,
+                self.business_id,
+                self.NAME_IDEAS_JOB_TYPE,
+                requirements.model_dump(mode='json'),
+                lambda: self.api_client.generate_business_name_ideas(self.business_id, requirements),
+            )
+        except Exception:
+            # Not asked for yet, so the naming step will start them again if they are wanted
+            self._name_ideas_job = None
+
+    def _speculative_name_ideas(self, requirements: BusinessPlanRequirements) -> list[str] | None:
+        # Name ideas started alongside the base business plan, by this run or one that was interrupted
+        job, self._name_ideas_job = self._name_ideas_job, None
+        if job is None:
+            resumed = self.state.resume(
+                self.api_client, self.business_id, self.NAME_IDEAS_JOB_TYPE, requirements.model_dump(mode='json'),
+            )
+            job = resumed[0] if resumed is not None else None
+        if job is None:
+            return None
+        print('Fetching the name ideas generated alongside the business plan.')
+        manager = JobManager(job)
+        try:
+            job = self._await(manager)
+        except (KeyboardInterrupt, EOFError):
+            manager.spinner.stop()
+            print()
+            return None
+        self.state.finish(self.NAME_IDEAS_JOB_TYPE)
+        if job.status != JobStatus.SUCCESS:
+            return None
+        print()
+        result = BusinessNamesDomains(**job.result)
+        return [idea.business_name for idea in result.business_names_with_domains]
+
     def _generate_full_business_plan(self, business_plan: BusinessPlan, business_name: str):
         print('Full Business Plan Generation')
         print('Once this step is done, you will be able to deploy your landing page!')
 
-        job = self.api_client.generate_full_business_plan(self.business_id, business_plan, business_name)
+        job = self.state.resume_or_submit(
+            self.api_client,
+            self.business_id,
+            self.FULL_PLAN_JOB_TYPE,
+            {'business_plan': business_plan.model_dump(mode='json'), 'business_name': business_name},
+            lambda: self.api_client.generate_full_business_plan(self.business_id, business_plan, business_name),
+        )
         print('Generation started successfully. Awaiting completion.')
         print('You can safely use Ctrl+C to stop waiting for the job, but you will not be able to deploy until it is finished.')
         print()
         manager = JobManager(job)
         try:
-            job = manager.await_job_completion()
+            job = self._await(manager)
         except (KeyboardInterrupt, EOFError):
             manager.spinner.stop()
             print()
             print('Waiting cancelled. Use the `pending_jobs` command to check what jobs are still running.')
 
+        if job.status in JobManager.FINISHED_STATES:
+            self.state.finish(self.FULL_PLAN_JOB_TYPE)
         # Put the data into files and let the user read them for verification
         if job.status == JobStatus.FAILED:
             return
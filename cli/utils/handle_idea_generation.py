@@ -1,4 +1,4 @@
-import os
+import shutil
 import webbrowser
 from tempfile import TemporaryDirectory
 
@@ -6,45 +6,68 @@ from pydantic import BaseModel
 from tabulate import tabulate
 
 from cli.api_client import HonulabsAPIClient
+from cli.settings import Settings
 from cli.schema import BusinessPlanRequirementsCreate, JobStatus, BusinessPlanRequirements, BusinessPlan, \
     BusinessNamesDomains, HonulabsJob, MarketSegment
 from cli.utils.job_manager import JobManager
-from cli.utils.prompts import prompt_with_default
+from cli.utils.pipeline_state import PipelineState
+from cli.utils.prompts import ask, prompt_with_default
 from cli.utils.token import HonulabsToken
 
 
 class IdeaGeneration:
     REQUIREMENTS_JOB_TYPE = 'business_plan_requirements'
+    MARKET_SEGMENT_JOB_TYPE = 'market_segment'
+    IDEAS_JOB_TYPE = 'idea_generation'
 
-    def __init__(self, business_id: str, table_style: str):
+    def __init__(self, business_id: str, table_style: str, prefetch: bool | None = None):
         self.token = HonulabsToken()
         self.api_client = HonulabsAPIClient(self.token.token)
         self.business_id = business_id
         self.table_style = table_style
+        # Jobs started by this or an interrupted earlier run, by step, so that they are never started twice
+        self.state = PipelineState('idea', business_id)
+        self.prefetch = Settings.PREFETCH_IDEAS if prefetch is None else prefetch
+        # ID of the next batch of ideas, started while the current one is on screen, until it is used
+        self._prefetched: str | None = None
 
     def run(self):
-        segment = self._market_segmentation()
+        # Ideas left running by an earlier run are for a segment that was already chosen
+        resumed = self.state.resume(self.api_client, self.business_id, self.IDEAS_JOB_TYPE, confirm=True)
+        job, segment = resumed if resumed is not None else (None, self._market_segmentation())
         if not segment:
             return
 
         while True:
-            new_idea = self._idea_generation(segment)
+            new_idea = self._idea_generation(segment, job)
+            job = None
             if not new_idea:
+                self._discard_prefetched()
                 return
             elif new_idea == 'restart':
                 # User pressed ENTER to generate new ideas - continue the loop
                 continue
             else:
                 # User selected a specific idea
+                self._discard_prefetched()
                 return new_idea
 
-    def _idea_generation(self, segment: dict):
-        # Set up the job
-        job = self.api_client.idea_generation(
-            self.business_id,
-            segment['geography'],
-            MarketSegment(**segment['segment'])
-        )
+    def _idea_generation(self, segment: dict, job: HonulabsJob | None = None):
+        # Set up the job, unless one was picked back up or prefetched
+        if job is None and self._prefetched is not None:
+            job = self._take_prefetched()
+        if job is None:
+            job = self.state.resume_or_submit(
+                self.api_client,
+                self.business_id,
+                self.IDEAS_JOB_TYPE,
+                segment,
+                lambda: self.api_client.idea_generation(
+                    self.business_id,
+                    segment['geography'],
+                    MarketSegment(**segment['segment'])
+                ),
+            )
 
         print('Deployment job started successfully. Awaiting completion. Skip wait with Ctrl+C.')
         manager = JobManager(job)
@@ -53,15 +76,18 @@ class IdeaGeneration:
         except (KeyboardInterrupt, EOFError):
             manager.spinner.stop()
             print(f'Skipping wait for job completion. Job will continue running in the background, with id {job.job_id}')
+            print('Running new_business_idea again picks it back up.')
+            return
 
         # Put the data into files and let the user read them for verification
+        self.state.finish(self.IDEAS_JOB_TYPE)
         if job.status == JobStatus.FAILED:
             return
 
         categories = {str(i): j for i, j in enumerate(job.result['ideas'], start=1)}
 
         # Compute window size to wrap the table
-        terminal_size_columns = int(os.get_terminal_size().columns - (os.get_terminal_size().columns*.1))
+        terminal_size_columns = int(shutil.get_terminal_size().columns - (shutil.get_terminal_size().columns*.1))
         print(
             tabulate(
                 (
@@ -77,9 +103,11 @@ class IdeaGeneration:
                 headers='keys', tablefmt='double_grid', maxcolwidths=terminal_size_columns//5
             )
         )
+        if self.prefetch:
+            self._prefetch_ideas(segment)
         try:
             print('Please select one of the ideas, press ENTER to generate new ideas, or type "q" to cancel.')
-            selected_num = input('> ').strip()
+            selected_num = ask('> ').strip()
             if selected_num == '':
                 # ENTER pressed - restart idea generation with same segment
                 return 'restart'
@@ -89,7 +117,7 @@ class IdeaGeneration:
 
             while selected_num not in categories:
                 print('That number is not a valid choice, please select a valid choice, press ENTER to generate new ideas, or type "q" to cancel.')
-                selected_num = input('> ').strip()
+                selected_num = ask('> ').strip()
                 if selected_num == '':
                     # ENTER pressed - restart idea generation with same segment
                     return 'restart'
@@ -102,16 +130,58 @@ class IdeaGeneration:
             return
 
 
-    def _market_segmentation(self):
+    def _prefetch_ideas(self, segment: dict):
+        # Start the next batch for the same segment, saved as the step's job so that ENTER picks it up
+        try:
+            job = self.state.resume_or_submit(
+                self.api_client,
+                self.business_id,
+                self.IDEAS_JOB_TYPE,
+                segment,
+                lambda: self.api_client.idea_generation(
+                    self.business_id,
+                    segment['geography'],
+                    MarketSegment(**segment['segment'])
+                ),
+            )
+        except Exception:
+            # ENTER starts the batch as it would without prefetching
+            return
+        self._prefetched = job.job_id
+
+    def _take_prefetched(self) -> HonulabsJob | None:
+        # The batch started while the last one was on screen, unless it has failed or is no longer the step's job
+        prefetched, self._prefetched = self._prefetched, None
+        saved = self.state.saved(self.IDEAS_JOB_TYPE)
+        if saved is None or saved[0] != prefetched:
+            return None
+        try:
+            job = self.api_client.get_job(self.business_id, prefetched)
+        except Exception:
+            return None
+        if job.status == JobStatus.FAILED:
+            self.state.finish(self.IDEAS_JOB_TYPE)
+            return None
+        print(f'Using the next batch of ideas, started while you were choosing ({job.job_id}).')
+        return job
+
+    def _discard_prefetched(self):
+        # The API can't cancel jobs, so an unused batch is left to finish and forgotten
+        saved = self.state.saved(self.IDEAS_JOB_TYPE)
+        if self._prefetched is not None and saved is not None and saved[0] == self._prefetched:
+            self.state.finish(self.IDEAS_JOB_TYPE)
+        self._prefetched = None
+
+    def _ask_market(self) -> tuple[str, str] | None:
         # What segment
         try:
             print('What industry segment you like to focus on?: ')
-            industry = input('> ').strip()
+            industry = ask('> ').strip()
             if industry == '':
                 return
 
             print('What geography would you like to focus on?: ')
-            geography = input('> ').strip()
+            geography = ask('> ').strip()
             if geography == '':
                 return
 
@@ -122,13 +192,31 @@ class IdeaGeneration:
         except (KeyboardInterrupt, EOFError):
             return
 
+        return industry, geography
 
-        # Set up the job
-        job = self.api_client.generate_market_segment(
-            self.business_id,
-            geography,
-            industry,
-        )
+    def _market_segmentation(self):
+        resumed = self.state.resume(self.api_client, self.business_id, self.MARKET_SEGMENT_JOB_TYPE, confirm=True)
+        if resumed is not None:
+            job, inputs = resumed
+            geography = inputs['geography']
+        else:
+            market = self._ask_market()
+            if market is None:
+                return
+            industry, geography = market
+
+            # Set up the job
+            job = self.state.resume_or_submit(
+                self.api_client,
+                self.business_id,
+                self.MARKET_SEGMENT_JOB_TYPE,
+                {'industry': industry, 'geography': geography},
+                lambda: self.api_client.generate_market_segment(
+                    self.business_id,
+                    geography,
+                    industry,
+                ),
+            )
         print('Deployment job started successfully. Awaiting completion. Skip wait with Ctrl+C.')
         manager = JobManager(job)
         try:
@@ -136,15 +224,18 @@ class IdeaGeneration:
         except (KeyboardInterrupt, EOFError):
             manager.spinner.stop()
             print(f'Skipping wait for job completion. Job will continue running in the background, with id {job.job_id}')
+            print('Running new_business_idea again picks it back up.')
+            return
 
         # Put the data into files and let the user read them for verification
+        self.state.finish(self.MARKET_SEGMENT_JOB_TYPE)
         if job.status == JobStatus.FAILED:
             return
 
         categories = {str(i): j for i, j in enumerate(job.result['ideas'], start=1)}
 
         # Compute window size to wrap the table
-        terminal_size_columns = int(os.get_terminal_size().columns - (os.get_terminal_size().columns*.1))
+        terminal_size_columns = int(shutil.get_terminal_size().columns - (shutil.get_terminal_size().columns*.1))
         print(
             tabulate(
                 (
@@ -158,13 +249,13 @@ class IdeaGeneration:
         )
         try:
             print('Please select the market segment you want to use, or just press ENTER to start again.')
-            selected_num = input('> ').strip()
+            selected_num = ask('> ').strip()
             if selected_num == '':
                 return
 
             while selected_num not in categories:
                 print('That number is not a valid choice, please select a valid choice or press ENTER to cancel.')
-                selected_num = input('> ').strip()
+                selected_num = ask('> ').strip()
                 if selected_num == '':
                     return
 
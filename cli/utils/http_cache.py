@@ -0,0 +1,100 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import httpx
+
+from cli.utils.local_files import account_path, digest, evict_least_recent, total_size, write_atomic
+
+# Response headers kept alongside a cached body, including the cursor of paginated lists
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'X-Next-Cursor')
+
+
+class HttpCache:
+    """
+    On-disk cache of GET responses that carry an ETag or Last-Modified validator.
+
+    Entries are grouped in one directory per URL path, so everything cached for a path (whatever its query string) can
+    be invalidated together after a mutating call. Reading an entry marks it as used, and once the bodies take more
+    than `max_bytes`, the least recently used entries are evicted, e.g. the pages of job lists listed once.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._total: int | None = None  # Bytes of cached bodies, counted on the first write then kept up to date
+
+    @classmethod
+    def for_token(cls, directory: Path, token: str, max_bytes: int) -> 'HttpCache':
+        return cls(account_path(directory, token), max_bytes)
+
+    def _entry_path(self, path: str, params: dict | None) -> Path:
+        query = str(httpx.QueryParams(params or {}))
+        return self.directory / digest(path) / digest(query)
+
+    def get(self, path: str, params: dict | None = None, max_size: int | None = None) -> tuple[dict, bytes] | None:
+        # The cached headers and body, unless the body is longer than `max_size`
+        entry_path = self._entry_path(path, params)
+        try:
+            if max_size is not None and entry_path.with_suffix('.body').stat().st_size > max_size:
+                return None
+            headers = json.loads(entry_path.with_suffix('.json').read_text())
+            content = entry_path.with_suffix('.body').read_bytes()
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(entry_path.with_suffix('.body'))
+        except OSError:
+            pass
+        return headers, content
+
+    @staticmethod
+    def _headers_to_keep(response: httpx.Response) -> dict | None:
+        headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+        if 'ETag' not in headers and 'Last-Modified' not in headers:
+            return None
+        return headers
+
+    def put(self, path: str, params: dict | None, response: httpx.Response, content: bytes | None = None):
+        # `content` is the body of a streamed response, which has been read in chunks
+        content = response.content if content is None else content
+        headers = self._headers_to_keep(response)
+        if headers is None:
+            return
+        entry_path = self._entry_path(path, params)
+        body_path = entry_path.with_suffix('.body')
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        replaced = total_size([body_path])
+        # Body first, so a reader never finds headers pointing at a missing or partial body
+        write_atomic(body_path, content)
+        write_atomic(entry_path.with_suffix('.json'), json.dumps(headers).encode())
+        if self._total is None:
+            self._total = total_size(self._bodies())
+        else:
+            self._total += len(content) - replaced
+        if self._total > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        # Remove the least recently used entries once their bodies take more than max_bytes
+        self._total, evicted = evict_least_recent(self._bodies(), self.max_bytes)
+        for body_path in evicted:
+            body_path.with_suffix('.json').unlink(missing_ok=True)
+
+    def _bodies(self):
+        return self.directory.glob('*/*.body')
+
+    @staticmethod
+    def conditional_headers(headers: dict) -> dict:
+        # Request headers revalidating a cached entry with the server
+        conditional = {}
+        if 'ETag' in headers:
+            conditional['If-None-Match'] = headers['ETag']
+        if 'Last-Modified' in headers:
+            conditional['If-Modified-Since'] = headers['Last-Modified']
+        return conditional
+
+    def invalidate(self, path: str):
+        shutil.rmtree(self.directory / digest(path), ignore_errors=True)
+        self._total = None
@@ -0,0 +1,165 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+
+from tabulate import tabulate
+
+from cli.api_client import HonulabsAPIClient
+from cli.schema import HonulabsJob, JobStatus, MarketSegment
+from cli.settings import Settings
+from cli.utils.job_manager import JobManager
+from cli.utils.list_file import read_list_file
+from cli.utils.spinner import make_spinner
+from cli.utils.tracing import current_span, run_in_span
+
+
+def read_grid_values(value: str) -> list[str]:
+    """
+    Industries or geographies from a command argument: comma separated, or `@file` with one per line, which also allows
+    values with spaces. Blank lines and lines starting with `#` are skipped.
+    """
+    if value.startswith('@'):
+        return read_list_file(value[1:])
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class IdeaSweep:
+    """
+    Generate ideas for every industry and geography of a grid at once: a market segmentation job per pair, then an
+    idea generation job for each of the first `segments` segments found. Jobs are started with at most
+    `max_concurrency` requests in flight and followed together, and idea jobs are started as soon as their market's
+    segmentation finishes.
+    """
+
+    def __init__(self, api_client: HonulabsAPIClient, business_id: str, max_concurrency: int | None = None):
+        self.api_client = api_client
+        self.business_id = business_id
+        self.max_concurrency = max_concurrency or Settings.BULK_CONCURRENCY
+        self._ideas: list[tuple[tuple, dict]] = []  # With the position of their market and segment in the grid
+        self.failures: list[dict] = []
+        self.running: list[dict] = []  # Jobs left running in the background when the wait was skipped
+
+    def _failed(self, industry: str, geography: str, segment: dict | None, detail: str):
+        self.failures.append({
+            'Industry': industry,
+            'Geography': geography,
+            'Segment': _segment_name(segment) if segment else None,
+            'Detail': detail,
+        })
+
+    def _left_running(self, job: HonulabsJob, industry: str, geography: str, segment: dict | None):
+        self.running.append({
+            'Type': job.job_type,
+            'ID': job.job_id,
+            'Industry': industry,
+            'Geography': geography,
+            'Segment': _segment_name(segment) if segment else None,
+        })
+
+    def run(self, industries: list[str], geographies: list[str], segments: int) -> list[dict]:
+        """
+        Ideas of the whole grid, ranked by feasibility. Markets and segments that failed are kept in `failures`, and
+        when the wait is skipped with Ctrl+C, the jobs that were still running are kept in `running`.
+        """
+        markets = [(industry, geography) for industry in industries for geography in geographies]
+
+        def start_segmentation(market: tuple[str, str]) -> HonulabsJob | Exception:
+            industry, geography = market
+            try:
+                return self.api_client.generate_market_segment(self.business_id, geography, industry)
+            except Exception as e:
+                return e
+
+        with make_spinner(f'Starting market segmentation of {len(markets)} markets'):
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                started = list(pool.map(partial(run_in_span, current_span(), start_segmentation), markets))
+
+        segmentations = {}
+        for (industry, geography), job in zip(markets, started):
+            if isinstance(job, Exception):
+                self._failed(industry, geography, None, str(job))
+            else:
+                segmentations[job.job_id] = (industry, geography, job)
+
+        print(f'Segmenting {len(segmentations)} markets. Skip wait with Ctrl+C.')
+        idea_jobs: list[tuple[tuple, str, str, dict, Future]] = []
+        unfinished = dict(segmentations)
+        try:
+            # Leaving the pool waits for the idea jobs being started, so none are lost on Ctrl+C
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                jobs = [job for _, _, job in segmentations.values()]
+                for job in JobManager.await_many(jobs, max_concurrency=self.max_concurrency):
+                    industry, geography, _ = unfinished.pop(job.job_id)
+                    market = markets.index((industry, geography))
+                    if job.status != JobStatus.SUCCESS or not job.result:
+                        self._failed(industry, geography, None, job.error or 'Market segmentation was unsuccessful')
+                        continue
+                    for num, segment in enumerate(job.result['ideas'][:segments]):
+                        future = pool.submit(
+                            run_in_span,
+                            current_span(),
+                            self.api_client.idea_generation,
+                            self.business_id,
+                            geography,
+                            MarketSegment(**segment),
+                        )
+                        idea_jobs.append(((market, num), industry, geography, segment, future))
+            interrupted = False
+        except (KeyboardInterrupt, EOFError):
+            interrupted = True
+
+        ideas_for = {}
+        for position, industry, geography, segment, future in idea_jobs:
+            try:
+                job = future.result()
+            except Exception as e:
+                self._failed(industry, geography, segment, str(e))
+                continue
+            ideas_for[job.job_id] = (position, industry, geography, segment, job)
+
+        if interrupted:
+            self._skip_wait(unfinished, ideas_for)
+            return self._ranked()
+
+        print(f'Generating ideas for {len(ideas_for)} segments. Skip wait with Ctrl+C.')
+        unfinished_ideas = dict(ideas_for)
+        try:
+            jobs = [job for *_, job in ideas_for.values()]
+            for job in JobManager.await_many(jobs, max_concurrency=self.max_concurrency):
+                position, industry, geography, segment, _ = unfinished_ideas.pop(job.job_id)
+                if job.status != JobStatus.SUCCESS or not job.result:
+                    self._failed(industry, geography, segment, job.error or 'Idea generation was unsuccessful')
+                    continue
+                for num, idea in enumerate(job.result['ideas']):
+                    self._ideas.append(((*position, num), {
+                        'Feasibility': idea['feasibility_rank'],
+                        'Idea': idea['saas_venture_title'],
+                        'Description': idea['saas_venture_description'],
+                        'Industry': industry,
+                        'Geography': geography,
+                        'Segment': _segment_name(segment),
+                    }))
+        except (KeyboardInterrupt, EOFError):
+            self._skip_wait({}, unfinished_ideas)
+        return self._ranked()
+
+    def _skip_wait(self, segmentations: dict[str, tuple], ideas_for: dict[str, tuple]):
+        print('Skipping wait for job completion. Jobs will continue running in the background.')
+        for industry, geography, job in segmentations.values():
+            self._left_running(job, industry, geography, None)
+        for _, industry, geography, segment, job in ideas_for.values():
+            self._left_running(job, industry, geography, segment)
+
+    def _ranked(self) -> list[dict]:
+        # Feasibility is a rank, 1 being the most feasible. Ties keep the order of the grid
+        ranked = sorted(self._ideas, key=lambda item: (item[1]['Feasibility'], item[0]))
+        return [{'Rank': num, **idea} for num, (_, idea) in enumerate(ranked, start=1)]
+
+
+def _segment_name(segment: dict) -> str:
+    return f"{segment['core_market']} / {segment['sub_category']} / {segment['niche']}"
+
+
+def print_ideas(ideas: list[dict], table_style: str, max_column_width: int):
+    # Descriptions would make the table pages long, they are in the recorded results
+    rows = ({key: value for key, value in idea.items() if key != 'Description'} for idea in ideas)
+    print(tabulate(rows, headers='keys', tablefmt=table_style, maxcolwidths=max_column_width))
@@ -0,0 +1,231 @@
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from typing import Callable, TextIO
+
+from cli.api_client import HonulabsAPIClient
+from cli.schema import HonulabsBusiness, HonulabsJob, JobStatus
+from cli.settings import Settings
+from cli.utils.job_history import JobHistory
+from cli.utils.job_manager import JobManager, PollScheduler
+from cli.utils.tracing import current_span, run_in_span
+
+# Seconds a finished job stays on screen, so it can be seen finishing
+FINISHED_LINGER = 10
+
+# Switch to the terminal's alternate screen and hide the cursor, and back
+ENTER_SCREEN = '\x1b[?1049h\x1b[?25l'
+LEAVE_SCREEN = '\x1b[?25h\x1b[?1049l'
+CLEAR_SCREEN = '\x1b[2J'
+
+# Columns shown on screen and their widths, the last one takes what is left of the line
+COLUMNS = (('Project', 18), ('Type', 26), ('Status', 11), ('Elapsed', 8), ('Cost', 7), ('Message', None))
+
+
+def _utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=value.tzinfo or timezone.utc)
+
+
+def _elapsed(job: HonulabsJob, now: datetime) -> str:
+    end = _utc(job.finished_at) if job.finished_at is not None else now
+    minutes, seconds = divmod(max(int((end - _utc(job.started_at)).total_seconds()), 0), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours}:{minutes:02}:{seconds:02}'
+
+
+def _message(job: HonulabsJob) -> str:
+    # As shown while waiting on a job, with the error of failed jobs
+    if job.status == JobStatus.PENDING:
+        return 'Initialising'
+    if job.status == JobStatus.FAILED:
+        return job.error or 'Failed'
+    if job.status == JobStatus.SUCCESS:
+        return 'Finished'
+    return job.message or 'Running'
+
+
+class JobDashboard:
+    """
+    Live full screen view of the pending and running jobs of every project, like `top`.
+
+    A single `PollScheduler` follows the jobs of all projects, each on its own schedule from the poll strategy. Projects
+    are listed again every `refresh_interval` seconds to pick up new jobs, each listing only the jobs submitted or
+    finished since the one before, see `JobHistory`. The screen is redrawn as polls come back, rewriting only the lines
+    that changed.
+    """
+
+    def __init__(
+            self,
+            api_client: HonulabsAPIClient,
+            max_concurrency: int | None = None,
+            refresh_interval: float | None = None,
+            stream: TextIO | None = None,
+            clock: Callable[[], float] = time.monotonic,
+            sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.api_client = api_client
+        self.max_concurrency = max_concurrency or Settings.BULK_CONCURRENCY
+        self.refresh_interval = refresh_interval or Settings.TOP_REFRESH_INTERVAL
+        self.stream = stream or sys.stdout
+        self.clock = clock
+        self.sleep = sleep
+
+        self.businesses: dict[str, HonulabsBusiness] = {}
+        self.histories: dict[str, JobHistory] = {}
+        self.jobs: dict[str, HonulabsJob] = {}  # Shown on screen
+        self.failures: list[dict] = []  # Projects whose jobs could not be listed last time
+        self._finished: dict[str, float] = {}  # When jobs on screen were seen finished
+        self._status = ''
+        self._lines: list[str] = []  # As last drawn
+        self._size = None
+
+    def discover(self) -> list[HonulabsJob]:
+        """List every project and its new jobs, returning the unfinished jobs of all projects."""
+        businesses = self.api_client.list_businesses()
+        self.businesses = {biz.business_id: biz for biz in businesses}
+        self.histories = {
+            biz.business_id: self.histories.get(biz.business_id) or JobHistory(self.api_client, biz.business_id)
+            for biz in businesses
+        }
+
+        def refresh(biz: HonulabsBusiness) -> Exception | None:
+            try:
+                self.histories[biz.business_id].refresh()
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            errors = list(pool.map(partial(run_in_span, current_span(), refresh), businesses))
+        self.failures = [
+            {'Project': biz.name, 'ID': biz.business_id, 'Detail': str(error)}
+            for biz, error in zip(businesses, errors)
+            if error is not None
+        ]
+        return [job for biz in businesses for job in self.histories[biz.business_id].unfinished()]
+
+    def snapshot(self) -> list[dict]:
+        # The unfinished jobs of every project, once
+        self.jobs = {job.job_id: job for job in self.discover()}
+        return self.rows()
+
+    def rows(self) -> list[dict]:
+        now = datetime.now(timezone.utc)
+        jobs = sorted(self.jobs.values(), key=lambda job: (_utc(job.started_at), job.job_id))
+        return [
+            {
+                'Project': job.business.name,
+                'Type': job.job_type,
+                'Status': JobStatus(job.status).value,
+                'Elapsed': _elapsed(job, now),
+                'Cost': '' if job.cost is None else f'{job.cost:.2f}',
+                'Message': _message(job),
+                'ID': job.job_id,
+            }
+            for job in jobs
+        ]
+
+    def run(self):
+        """Show the dashboard until Ctrl+C."""
+        self.stream.write(ENTER_SCREEN)
+        try:
+            with PollScheduler(self.api_client, Settings.JOB_WAIT_CONCURRENCY) as scheduler:
+                next_refresh = self.clock()
+                while True:
+                    if self.clock() >= next_refresh:
+                        self._status = f'Listing the jobs of {len(self.businesses) or "all"} projects...'
+                        self.draw()
+                        for job in self.discover():
+                            if job.job_id not in self.jobs:
+                                self.jobs[job.job_id] = job
+                                scheduler.add(job, current_span())
+                        self._status = ''
+                        next_refresh = self.clock() + self.refresh_interval
+                        self.draw()
+
+                    for job, done in scheduler.poll():
+                        self._update(job, done)
+                        self.draw()
+                    self._expire()
+                    self.draw()
+
+                    # Wake up at least every second, so elapsed times keep moving
+                    delay = min(1.0, max(next_refresh - self.clock(), 0))
+                    if scheduler.jobs:
+                        delay = min(delay, scheduler.wait_time())
+                    self.sleep(delay)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stream.write(LEAVE_SCREEN)
+            self.stream.flush()
+
+    def _update(self, job: HonulabsJob, done: bool):
+        if job.status in JobManager.FINISHED_STATES:
+            self.jobs[job.job_id] = job
+            self._finished[job.job_id] = self.clock()
+            history = self.histories.get(job.business.business_id)
+            if history is not None:
+                # So the next listing starts after it, without keeping its result around
+                history.add(job.model_copy(update={'result': None}))
+        elif done:
+            # Could not be read, it is picked up again by the next listing if it is still there
+            self.jobs.pop(job.job_id, None)
+        else:
+            self.jobs[job.job_id] = job
+
+    def _expire(self):
+        now = self.clock()
+        for job_id, finished in list(self._finished.items()):
+            if now - finished >= FINISHED_LINGER:
+                del self._finished[job_id]
+                self.jobs.pop(job_id, None)
+
+    def _frame(self, width: int, height: int) -> list[str]:
+        rows = self.rows()
+        running = [row for row in rows if row['Status'] in (JobStatus.PENDING.value, JobStatus.IN_PROGRESS.value)]
+        projects = len({row['Project'] for row in running})
+        lines = [
+            f'Honulabs jobs at {time.strftime("%H:%M:%S")}: {len(running)} running in {projects} of '
+            f'{len(self.businesses)} projects. Quit with Ctrl+C.',
+            self._status or ' '.join(f"Could not list the jobs of {row['Project']}." for row in self.failures),
+            '',
+            self._format_row({name: name for name, _ in COLUMNS}),
+        ]
+        lines.extend(self._format_row(row) for row in rows)
+        if len(lines) > height:
+            hidden = len(lines) - height + 1
+            lines = lines[:height - 1] + [f'... and {hidden} more']
+        # Leave the last column empty, writing to it wraps the line on some terminals
+        return [line[:width - 1] for line in lines]
+
+    @staticmethod
+    def _format_row(row: dict) -> str:
+        cells = []
+        for name, column_width in COLUMNS:
+            value = str(row[name])
+            if column_width is None:
+                cells.append(value)
+            else:
+                cells.append(value[:column_width].ljust(column_width))
+        return '  '.join(cells)
+
+    def draw(self):
+        size = shutil.get_terminal_size()
+        lines = self._frame(size.columns, size.lines)
+        out = []
+        if size != self._size:
+            out.append(CLEAR_SCREEN)
+            self._lines = []
+            self._size = size
+        for num, line in enumerate(lines):
+            if num >= len(self._lines) or self._lines[num] != line:
+                out.append(f'\x1b[{num + 1};1H{line}\x1b[K')
+        for num in range(len(lines), len(self._lines)):
+            out.append(f'\x1b[{num + 1};1H\x1b[K')
+        self._lines = lines
+        if out:
+            self.stream.write(''.join(out))
+            self.stream.flush()
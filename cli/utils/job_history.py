@@ -0,0 +1,68 @@
+from cli.api_client import HonulabsAPIClient
+from cli.schema import HonulabsJob, JobStatus
+
+
+class JobHistory:
+    """
+    The jobs of a business, indexed by type and status, for flows that look up earlier results at several steps.
+
+    The history is listed once without results, which are the bulk of a job list, and a job's result is only read when
+    it is asked for. `refresh` lists just the jobs submitted since, plus any that had not finished yet, and jobs the
+    flow follows itself are added with `add` as they finish, so later steps don't list the history again.
+    """
+
+    def __init__(self, api_client: HonulabsAPIClient, business_id: str):
+        self.api_client = api_client
+        self.business_id = business_id
+        self._jobs: dict[str, HonulabsJob] = {}  # In submission order
+        self._index: dict[tuple[str, JobStatus], dict[str, HonulabsJob]] = {}
+        self._loaded = False
+
+    def _cursor(self) -> str | None:
+        # ID of the job to list from: the last one before the first unfinished job, or the last one of all
+        if not self._loaded:
+            return None
+        previous = None
+        for job_id, job in self._jobs.items():
+            if job.status not in (JobStatus.SUCCESS, JobStatus.FAILED):
+                return previous
+            previous = job_id
+        return previous
+
+    def refresh(self):
+        after = self._cursor()
+        added = [] if self._loaded else list(self._jobs.values())
+        if not self._loaded:
+            # Jobs added before the first listing are put back after it, to keep submission order
+            self._jobs, self._index = {}, {}
+        for job in self.api_client.iter_jobs(self.business_id, include_result=False, after=after):
+            self.add(job)
+        for job in added:
+            self.add(job)
+        self._loaded = True
+
+    def add(self, job: HonulabsJob):
+        previous = self._jobs.get(job.job_id)
+        if previous is not None:
+            self._index[(previous.job_type, previous.status)].pop(job.job_id, None)
+            if job.result is None and previous.status == job.status:
+                job = previous
+        self._jobs[job.job_id] = job
+        self._index.setdefault((job.job_type, job.status), {})[job.job_id] = job
+
+    def find(self, job_type: str, status: JobStatus = JobStatus.SUCCESS) -> list[HonulabsJob]:
+        """Jobs of a type and status, listing the history first if it hasn't been yet."""
+        if not self._loaded:
+            self.refresh()
+        return list(self._index.get((job_type, status), {}).values())
+
+    def unfinished(self) -> list[HonulabsJob]:
+        # Jobs that were pending or in progress when last listed or added, in submission order
+        return [job for job in self._jobs.values() if job.status not in (JobStatus.SUCCESS, JobStatus.FAILED)]
+
+    def result(self, job: HonulabsJob) -> dict | None:
+        """The result of a job from the history, read from the API the first time it is needed."""
+        if job.result is None and job.status == JobStatus.SUCCESS:
+            job = self.api_client.get_job(self.business_id, job.job_id)
+            self.add(job)
+        return job.result
@@ -0,0 +1,238 @@
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+
+from cli.api_client import HonulabsAPIClient
+from cli.schema import HonulabsBusiness, HonulabsJob, JobStatus
+from cli.settings import Settings
+from cli.utils.local_files import account_path
+from cli.utils.tracing import current_span, run_in_span
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    business_id TEXT NOT NULL,
+    business_name TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    job_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    cost REAL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_started_at ON jobs (started_at);
+CREATE INDEX IF NOT EXISTS jobs_business ON jobs (business_id, seq);
+CREATE TABLE IF NOT EXISTS sync (
+    business_id TEXT PRIMARY KEY,
+    cursor TEXT,
+    synced_at REAL NOT NULL
+);
+'''
+
+# Columns jobs can be filtered on, and the query each filter adds
+FILTERS = {
+    'type': 'job_type = ?',
+    'status': 'status = ?',
+    'project': '(business_name = ? OR business_id = ?)',
+    'since': 'started_at >= ?',
+    'until': 'started_at < ?',
+    'month': 'substr(started_at, 1, 7) = ?',
+}
+# What the filters that take a value of their own expect
+FILTER_FORMATS = {
+    'since': 'use an ISO date or time, e.g. 2025-07-01',
+    'until': 'use an ISO date or time, e.g. 2025-07-01',
+    'month': 'use a year and month, e.g. 2025-07',
+    'status': f'use one of {", ".join(status.value for status in JobStatus)}',
+}
+# What costs can be grouped by. Projects are grouped by ID, as names need not be unique, and shown by name
+GROUPS = {
+    'type': 'job_type',
+    'status': 'status',
+    'project': 'business_id',
+    'month': 'substr(started_at, 1, 7)',
+    'day': 'substr(started_at, 1, 10)',
+}
+
+
+def _timestamp(value: datetime | None) -> str | None:
+    # UTC with a fixed format, so that timestamps compare as text
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec='microseconds')
+
+
+def parse_filters(args: list[str]) -> dict[str, str]:
+    """`key=value` command arguments as filters. Dates are ISO dates or times, taken as UTC."""
+    filters = {}
+    for arg in args:
+        key, sep, value = arg.partition('=')
+        if not sep or key not in FILTERS or not value:
+            raise ValueError(f'Invalid filter "{arg}", use one of {", ".join(f"{key}=..." for key in FILTERS)}')
+        try:
+            if key in ('since', 'until'):
+                value = _timestamp(datetime.fromisoformat(value))
+            elif key == 'month':
+                value = datetime.strptime(value, '%Y-%m').strftime('%Y-%m')
+            elif key == 'status':
+                value = JobStatus(value).value
+        except ValueError:
+            raise ValueError(f'Invalid filter "{arg}", {FILTER_FORMATS[key]}') from None
+        filters[key] = value
+    return filters
+
+
+def check_group(group_by: str):
+    if group_by not in GROUPS:
+        raise ValueError(f'Cannot group by "{group_by}", use one of {", ".join(GROUPS)}')
+
+
+class JobIndex:
+    """
+    Local SQLite index of the jobs of every project, without their results, for queries across projects that would
+    otherwise list the jobs of each one.
+
+    Jobs are listed in submission order, so each project keeps a watermark: the last job before its first unfinished
+    one. A sync lists only the jobs after the watermark, which picks up new jobs and the ones that have finished since.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    @classmethod
+    def for_token(cls, directory: Path, token: str) -> 'JobIndex':
+        return cls(account_path(directory, token, '.sqlite3'))
+
+    def close(self):
+        self.db.close()
+
+    def last_synced(self) -> float | None:
+        return self.db.execute('SELECT max(synced_at) FROM sync').fetchone()[0]
+
+    def sync(self, api_client: HonulabsAPIClient, max_concurrency: int | None = None) -> dict:
+        """Bring the index up to date with every project. Returns counts of projects and new and updated jobs."""
+        started = time.perf_counter()
+        businesses = api_client.list_businesses()
+        cursors = dict(self.db.execute('SELECT business_id, cursor FROM sync'))
+
+        def list_jobs(biz: HonulabsBusiness) -> list[HonulabsJob] | Exception:
+            after = cursors.get(biz.business_id)
+            try:
+                return list(api_client.iter_jobs(biz.business_id, include_result=False, after=after))
+            except Exception as e:
+                if after is None:
+                    return e
+            # The watermark job may be gone, list the project from the start
+            try:
+                return list(api_client.iter_jobs(biz.business_id, include_result=False))
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max_concurrency or Settings.BULK_CONCURRENCY) as pool:
+            listed = list(pool.map(partial(run_in_span, current_span(), list_jobs), businesses))
+
+        counts = dict(projects=len(businesses), new=0, updated=0, removed=0, failed=[])
+        with self.db:
+            counts['removed'] = self._remove_deleted(businesses)
+            for biz, jobs in zip(businesses, listed):
+                if isinstance(jobs, Exception):
+                    counts['failed'].append({'Project': biz.name, 'ID': biz.business_id, 'Detail': str(jobs)})
+                    continue
+                new, updated = self._store(biz, jobs)
+                counts['new'] += new
+                counts['updated'] += updated
+        counts['seconds'] = round(time.perf_counter() - started, 2)
+        return counts
+
+    def _remove_deleted(self, businesses: list[HonulabsBusiness]) -> int:
+        # Drop the jobs of projects that are gone, returning how many
+        ids = [biz.business_id for biz in businesses]
+        placeholders = ', '.join('?' * len(ids))
+        removed = self.db.execute(f'DELETE FROM jobs WHERE business_id NOT IN ({placeholders})', ids).rowcount
+        self.db.execute(f'DELETE FROM sync WHERE business_id NOT IN ({placeholders})', ids)
+        return removed
+
+    def _store(self, biz: HonulabsBusiness, jobs: list[HonulabsJob]) -> tuple[int, int]:
+        # Jobs listed earlier are shown under the project's current name
+        self.db.execute('UPDATE jobs SET business_name = ? WHERE business_id = ?', (biz.name, biz.business_id))
+        known = dict(self.db.execute(
+            'SELECT job_id, seq FROM jobs WHERE business_id = ?', (biz.business_id,),
+        ))
+        seq = max(known.values(), default=0)
+        new = updated = 0
+        for job in jobs:
+            if job.job_id in known:
+                job_seq = known[job.job_id]
+                updated += 1
+            else:
+                seq += 1
+                job_seq = seq
+                new += 1
+            self.db.execute(
+                'INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    job.job_id, biz.business_id, biz.name, job_seq, job.job_type, JobStatus(job.status).value,
+                    job.cost, _timestamp(job.started_at), _timestamp(job.finished_at),
+                ),
+            )
+
+        # The watermark: the last job before the first unfinished one, or the last job
+        cursor = None
+        for job_id, status in self.db.execute(
+                'SELECT job_id, status FROM jobs WHERE business_id = ? ORDER BY seq', (biz.business_id,),
+        ):
+            if status not in (JobStatus.SUCCESS.value, JobStatus.FAILED.value):
+                break
+            cursor = job_id
+        self.db.execute(
+            'INSERT OR REPLACE INTO sync VALUES (?, ?, ?)', (biz.business_id, cursor, time.time()),
+        )
+        return new, updated
+
+    @staticmethod
+    def _where(filters: dict[str, str]) -> tuple[str, list]:
+        clauses, params = [], []
+        for key, value in filters.items():
+            clauses.append(FILTERS[key])
+            params.extend([value] * FILTERS[key].count('?'))
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def query(self, filters: dict[str, str], limit: int | None = None) -> list[dict]:
+        where, params = self._where(filters)
+        sql = (
+            'SELECT business_name, job_id, job_type, status, cost, started_at, finished_at FROM jobs'
+            f'{where} ORDER BY started_at DESC'
+        )
+        if limit is not None:
+            sql += f' LIMIT {int(limit)}'
+        columns = ('Project', 'ID', 'Type', 'Status', 'Cost', 'Started At', 'Finished At')
+        return [dict(zip(columns, row)) for row in self.db.execute(sql, params)]
+
+    def totals(self, filters: dict[str, str]) -> tuple[int, float]:
+        where, params = self._where(filters)
+        jobs, cost = self.db.execute(f'SELECT count(*), coalesce(sum(cost), 0) FROM jobs{where}', params).fetchone()
+        return jobs, round(cost, 2)
+
+    def costs(self, group_by: str, filters: dict[str, str]) -> list[dict]:
+        check_group(group_by)
+        where, params = self._where(filters)
+        label = 'max(business_name)' if group_by == 'project' else GROUPS[group_by]
+        sql = (
+            f'SELECT {GROUPS[group_by]} AS grp, {label} AS label, count(*), round(coalesce(sum(cost), 0), 2) '
+            f'FROM jobs{where} GROUP BY grp ORDER BY label, grp'
+        )
+        rows = []
+        for group, label, jobs, cost in self.db.execute(sql, params):
+            row = {group_by.capitalize(): label}
+            if group_by == 'project':
+                row['ID'] = group
+            rows.append({**row, 'Jobs': jobs, 'Cost': cost})
+        return rows
@@ -1,12 +1,18 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 import time
-from time import sleep
+from typing import Callable, Iterable, Iterator
 
-from halo import Halo
+import httpx
 
-from cli.api_client import HonulabsAPIClient
+from cli.api_client import HonulabsAPIClient, HonulabsAPIError, HonulabsStreamUnavailable
 from cli.schema import HonulabsJob, JobStatus
+from cli.settings import Settings
+from cli.utils.output import record
+from cli.utils.polling import PollStrategy, poll_strategy_from_settings
+from cli.utils.spinner import make_spinner
 from cli.utils.token import HonulabsToken
+from cli.utils.tracing import run_in_span, span, start_span
 
 
 LOADING_BAR = {
@@ -26,17 +32,34 @@ LOADING_BAR = {
 
 class JobManager:
     FINISHED_STATES = {JobStatus.SUCCESS, JobStatus.FAILED}
+    # Set once the API is known not to serve job event streams, so later waits go straight to polling
+    events_unavailable = False
 
-    def __init__(self, job: HonulabsJob):
+    def __init__(
+            self,
+            job: HonulabsJob,
+            poll_strategy: PollStrategy | None = None,
+            sleep: Callable[[float], None] = time.sleep,
+            clock: Callable[[], float] = time.monotonic,
+    ):
         self.job = job
         self.started_at = self.job.started_at.replace(tzinfo=timezone.utc)
+        self.poll_strategy = poll_strategy or poll_strategy_from_settings()
+        self.sleep = sleep
+        self.clock = clock
 
         self.spinner = None
+        self._client: HonulabsAPIClient | None = None
+        # Requests made while waiting, reported on the trace span
+        self.polls = 0
+        self.events = 0
 
     @property
-    def client(self):
-        token = HonulabsToken()
-        return HonulabsAPIClient(token.token)
+    def client(self) -> HonulabsAPIClient:
+        # Built once per wait, so polling doesn't go back to the token file on every request
+        if self._client is None:
+            self._client = HonulabsAPIClient(HonulabsToken().token)
+        return self._client
 
     @property
     def _message(self) -> str:
@@ -55,35 +78,271 @@ class JobManager:
         return time.strftime("%H:%M:%S", time.gmtime(elapsed_seconds))
 
     def await_job_completion(self, retry=True) -> HonulabsJob:
+        with span(f'wait {self.job.job_type}', **self._span_attributes()) as wait:
+            job = self._await_job_completion(retry)
+            wait.set_attributes(**self._lag_attributes(), **{'job.polls': self.polls, 'job.events': self.events})
+        return job
+
+    def _span_attributes(self) -> dict:
+        return {
+            'job.id': self.job.job_id,
+            'job.type': self.job.job_type,
+            'business.id': self.job.business.business_id,
+        }
+
+    def _lag_attributes(self) -> dict:
+        """
+        Split of the time spent waiting: how long the server took to run the job, and how long after it finished the
+        client noticed. The rest of a command's time is the client itself.
+        """
+        attributes = {'job.status': JobStatus(self.job.status).value}
+        if self.job.finished_at is not None:
+            started_at = self.job.started_at.replace(tzinfo=self.job.started_at.tzinfo or timezone.utc)
+            finished_at = self.job.finished_at.replace(tzinfo=self.job.finished_at.tzinfo or timezone.utc)
+            attributes['job.server_duration_s'] = round((finished_at - started_at).total_seconds(), 3)
+            attributes['job.observed_lag_s'] = round(
+                max((datetime.now(timezone.utc) - finished_at).total_seconds(), 0), 3
+            )
+        return attributes
+
+    def _await_job_completion(self, retry: bool) -> HonulabsJob:
         # Loop requests to the API, give status message from the Job while it's still running
-        self.spinner = Halo(text=self._message, spinner=LOADING_BAR)
+        self.spinner = make_spinner(self._message, LOADING_BAR)
         self.spinner.start()
 
+        events_rejected = False
+        if Settings.JOB_EVENTS and not JobManager.events_unavailable:
+            events_rejected = self._follow_events()
+
         # Send an api request to fetch the job status
+        attempt = 0
         while self.job.status not in self.FINISHED_STATES:
             try:
-                self.job = self.client.get_job(self.job.business.business_id, self.job.job_id)
+                self.polls += 1
+                self.job, hint = self.client.poll_job(self.job.business.business_id, self.job.job_id)
+                if events_rejected:
+                    # The job is readable, so it was the event stream itself that was missing
+                    JobManager.events_unavailable = True
+                    events_rejected = False
+            except HonulabsAPIError as e:
+                # Keep waiting if the server only asked us to slow down
+                if e.retry_after is None:
+                    break
+                hint = e.retry_after
             except:
                 break
             self.spinner.text = f"{self._message}\t{self.elapsed_time} elapsed."
-            sleep(1)
+            self.sleep(self.poll_strategy.delay(attempt, hint))
+            attempt += 1
 
         # Check the finished status
         self.spinner.stop()
+        if self.job.status not in self.FINISHED_STATES and retry:
+            self._await_job_completion(False)
+        else:
+            self._print_outcome()
+
+        record(job=self.job)
+        return self.job
+
+    def _follow_events(self) -> bool:
+        """
+        Update the job from its event stream until it finishes or the stream ends, leaving any remaining wait to
+        polling. Returns True if the server answered without an event stream.
+        """
+        try:
+            for job in self.client.stream_job_events(self.job.business.business_id, self.job.job_id):
+                self.events += 1
+                self.job = job
+                self.spinner.text = f"{self._message}\t{self.elapsed_time} elapsed."
+                if self.job.status in self.FINISHED_STATES:
+                    break
+        except HonulabsStreamUnavailable:
+            return True
+        except (httpx.HTTPError, ValueError):
+            # Dropped connections or malformed events, fall back to polling
+            pass
+        return False
+
+    def _print_outcome(self, prefix: str = ''):
         if self.job.status == JobStatus.SUCCESS:
-            print('Job finished successfully')
+            print(f'{prefix}Job finished successfully')
         elif self.job.status == JobStatus.FAILED:
             if self.job.error is not None:
-                print(f'Job failed with error message: {self.job.error}')
+                print(f'{prefix}Job failed with error message: {self.job.error}')
             else:
-                print('Job was unsuccessful but had no error message')
+                print(f'{prefix}Job was unsuccessful but had no error message')
         else:
-            if retry:
-                self.await_job_completion(False)
+            if self.job.job_type == "delete_business":
+                print(f"{prefix}Deleted!")
             else:
-                if self.job.job_type == "delete_business":
-                    print("Deleted!")
-                else:
-                    print('Job was unable to be read and failed')
+                print(f'{prefix}Job was unable to be read and failed')
 
-        return self.job
+    @classmethod
+    def await_many(
+            cls,
+            jobs: Iterable[HonulabsJob],
+            max_concurrency: int | None = None,
+            poll_strategy: PollStrategy | None = None,
+            sleep: Callable[[float], None] = time.sleep,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> Iterator[HonulabsJob]:
+        """
+        Follow several jobs, possibly across businesses, with a single polling loop and one combined spinner.
+        Each job is polled on its own schedule from the poll strategy, with at most `max_concurrency` requests in
+        flight. Jobs are yielded as soon as they finish, so the order is completion order rather than input order.
+        A job that cannot be read twice in a row is yielded with its last known status, as in
+        `await_job_completion`.
+        """
+        poll_strategy = poll_strategy or poll_strategy_from_settings()
+        managers = [cls(job, poll_strategy, sleep, clock) for job in jobs]
+        total = len(managers)
+        pending = []
+        for manager in managers:
+            if manager.job.status in cls.FINISHED_STATES:
+                yield manager.job
+            else:
+                pending.append(manager)
+        if not pending:
+            return
+
+        client = HonulabsAPIClient(HonulabsToken().token)
+        group = start_span('wait jobs', **{'jobs.count': len(pending)})
+        spans = {
+            manager.job.job_id: start_span(f'wait {manager.job.job_type}', parent=group, **manager._span_attributes())
+            for manager in pending
+        }
+        spinner = make_spinner(f'0/{total} jobs finished', LOADING_BAR)
+        spinner.start()
+        try:
+            scheduler = PollScheduler(client, max_concurrency or Settings.JOB_WAIT_CONCURRENCY, poll_strategy, clock)
+            with scheduler:
+                by_id = {}
+                for manager in pending:
+                    by_id[manager.job.job_id] = manager
+                    scheduler.add(manager.job, spans[manager.job.job_id])
+                while pending:
+                    for job, done in scheduler.poll():
+                        manager = by_id[job.job_id]
+                        manager.job = job
+                        if not done:
+                            continue
+
+                        pending.remove(manager)
+                        spans[job.job_id].set_attributes(
+                            **manager._lag_attributes(), **{'job.polls': scheduler.polls[job.job_id]},
+                        )
+                        spans[job.job_id].end()
+                        spinner.stop()
+                        manager._print_outcome(f'[{job.job_type} {job.job_id}] ')
+                        yield job
+                        spinner.start()
+
+                    if pending:
+                        latest = max(pending, key=lambda m: m.started_at)
+                        spinner.text = (
+                            f'{total - len(pending)}/{total} jobs finished. '
+                            f'{latest.job.job_type}: {latest._message}\t{latest.elapsed_time} elapsed.'
+                        )
+                        sleep(scheduler.wait_time())
+        finally:
+            spinner.stop()
+            for job_span in spans.values():
+                job_span.end()
+            group.end()
+
+
+class PollScheduler:
+    """
+    Polls a changing set of jobs, possibly across businesses, each on its own schedule from the poll strategy, with at
+    most `max_concurrency` status requests in flight. Used as a context manager, which holds the request threads.
+
+    A job is done once it has finished, or could not be read twice in a row, in which case it keeps its last known
+    status as in `JobManager.await_job_completion`. Done jobs are dropped from the schedule.
+    """
+
+    def __init__(
+            self,
+            client: HonulabsAPIClient,
+            max_concurrency: int | None = None,
+            poll_strategy: PollStrategy | None = None,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.max_concurrency = max_concurrency or Settings.JOB_WAIT_CONCURRENCY
+        self.poll_strategy = poll_strategy or poll_strategy_from_settings()
+        self.clock = clock
+        self.jobs: dict[str, HonulabsJob] = {}
+        # Requests made for each job, kept after it is done
+        self.polls: dict[str, int] = {}
+        self._spans = {}
+        self._read_failures: dict[str, int] = {}
+        self._next_poll: dict[str, float] = {}
+        self._pool: ThreadPoolExecutor | None = None
+
+    def __enter__(self) -> 'PollScheduler':
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._pool.shutdown(cancel_futures=True)
+        self._pool = None
+
+    def add(self, job: HonulabsJob, job_span=None):
+        # Start polling a job straight away, under `job_span` when given
+        if job.job_id in self.jobs:
+            return
+        self.jobs[job.job_id] = job
+        self.polls.setdefault(job.job_id, 0)
+        self._spans[job.job_id] = job_span
+        self._read_failures[job.job_id] = 0
+        self._next_poll[job.job_id] = self.clock()
+
+    def remove(self, job_id: str):
+        self.jobs.pop(job_id, None)
+        self._spans.pop(job_id, None)
+        self._read_failures.pop(job_id, None)
+        self._next_poll.pop(job_id, None)
+
+    def poll(self) -> Iterator[tuple[HonulabsJob, bool]]:
+        """Poll the jobs that are due, yielding each as its request completes, along with whether it is done."""
+        now = self.clock()
+        futures = {
+            self._pool.submit(
+                run_in_span, self._spans[job_id], self.client.poll_job, job.business.business_id, job_id,
+            ): job_id
+            for job_id, job in self.jobs.items()
+            if self._next_poll[job_id] <= now
+        }
+        for future in as_completed(futures):
+            job_id = futures[future]
+            if job_id not in self.jobs:
+                # Removed while its request was in flight
+                continue
+            hint = None
+            try:
+                self.jobs[job_id], hint = future.result()
+                self._read_failures[job_id] = 0
+            except HonulabsAPIError as e:
+                # Keep polling if the server only asked us to slow down
+                hint = e.retry_after
+                if hint is None:
+                    self._read_failures[job_id] += 1
+            except Exception:
+                self._read_failures[job_id] += 1
+
+            job = self.jobs[job_id]
+            attempt = self.polls[job_id]
+            self.polls[job_id] += 1
+            done = job.status in JobManager.FINISHED_STATES or self._read_failures[job_id] >= 2
+            if done:
+                self.remove(job_id)
+            else:
+                self._next_poll[job_id] = self.clock() + self.poll_strategy.delay(attempt, hint)
+            yield job, done
+
+    def wait_time(self) -> float:
+        # Seconds until the next job is due, 0 if one already is or none are scheduled
+        if not self._next_poll:
+            return 0
+        return max(min(self._next_poll.values()) - self.clock(), 0)
@@ -0,0 +1,101 @@
+import re
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator
+
+# Bytes that can change the scanner's state, outside and inside strings
+_STRUCTURAL = re.compile(rb'["\[\]{},]')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+
+
+class JsonArrayScanner:
+    """
+    Split a JSON array into the raw text of its elements as bytes arrive, so each element can be decoded on its own
+    and the whole document never has to be held in memory. Elements are not validated, that is left to the decoder.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()  # Start of the current element, from earlier chunks
+        self._depth = 0  # 1 inside the array itself
+        self._in_string = False
+        self._escaped = False  # A chunk ended on a backslash inside a string
+        self.finished = False
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Scan the next chunk, returning the elements it completes."""
+        elements = []
+        start = 0
+        pos = 0
+        if self._escaped:
+            self._escaped = False
+            pos = 1
+
+        while pos < len(data) and not self.finished:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(data, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                if match.group() == b'"':
+                    self._in_string = False
+                elif pos == len(data):
+                    self._escaped = True
+                else:
+                    pos += 1
+                continue
+
+            match = _STRUCTURAL.search(data, pos)
+            if match is None:
+                break
+            char, pos = match.group(), match.end()
+            if self._depth == 0:
+                if char != b'[' or data[start:match.start()].strip() or self._buffer.strip():
+                    raise ValueError('Expected a JSON array')
+                self._buffer.clear()
+                self._depth = 1
+                start = pos
+            elif char == b'"':
+                self._in_string = True
+            elif char in b'[{':
+                self._depth += 1
+            elif self._depth > 1:
+                if char in b']}':
+                    self._depth -= 1
+            else:
+                # A comma or the closing bracket of the array ends an element
+                self._buffer += data[start:match.start()]
+                element = bytes(self._buffer).strip()
+                self._buffer.clear()
+                if element:
+                    elements.append(element)
+                elif char == b',':
+                    raise ValueError('Empty element in JSON array')
+                start = pos
+                self.finished = char == b']'
+
+        if not self.finished:
+            self._buffer += data[start:]
+        return elements
+
+    def close(self):
+        if not self.finished:
+            raise ValueError('JSON array ended before its closing bracket')
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Yield the raw text of each element of the JSON array read from `chunks`, as soon as it is complete."""
+    scanner = JsonArrayScanner()
+    for chunk in chunks:
+        yield from scanner.feed(chunk)
+        if scanner.finished:
+            return
+    scanner.close()
+
+
+async def aiter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    # See iter_json_array
+    scanner = JsonArrayScanner()
+    async for chunk in chunks:
+        for element in scanner.feed(chunk):
+            yield element
+        if scanner.finished:
+            return
+    scanner.close()
@@ -0,0 +1,12 @@
+import sys
+from pathlib import Path
+
+
+def read_list_file(path: str) -> list[str]:
+    """
+    The entries of a file with one per line, e.g. the `@file` arguments of bulk commands or a batch script. Lines are
+    stripped, and blank lines and lines starting with `#` are skipped. `-` reads from stdin.
+    """
+    text = sys.stdin.read() if path == '-' else Path(path).expanduser().read_text()
+    lines = (line.strip() for line in text.splitlines())
+    return [line for line in lines if line and not line.startswith('#')]
@@ -0,0 +1,61 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable
+
+
+def digest(value: str) -> str:
+    # Short file name for a value that may not be one, like a URL or a token
+    return hashlib.sha256(value.encode()).hexdigest()[:32]
+
+
+def account_path(directory: Path, token: str, suffix: str = '') -> Path:
+    # Keep each account's local files apart, without putting the token itself on disk
+    return directory / f'{digest(token)}{suffix}'
+
+
+def write_atomic(path: Path, data: bytes):
+    # Readers see either the old file or the new one, never a partial write
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def total_size(paths: Iterable[Path]) -> int:
+    total = 0
+    for path in paths:
+        try:
+            total += path.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+def evict_least_recent(paths: Iterable[Path], max_bytes: int) -> tuple[int, list[Path]]:
+    """
+    Remove the least recently used of `paths`, by modification time, once they take more than `max_bytes`. They are
+    removed down to 90% of it, so that a full store isn't scanned again on its next write. Returns the bytes left and
+    the paths removed.
+    """
+    entries = []
+    for path in paths:
+        try:
+            entries.append((path.stat(), path))
+        except OSError:
+            pass
+    total = sum(stat.st_size for stat, _ in entries)
+    removed = []
+    if total <= max_bytes:
+        return total, removed
+    for stat, path in sorted(entries, key=lambda entry: entry[0].st_mtime_ns):
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= stat.st_size
+        removed.append(path)
+        if total <= max_bytes * 9 // 10:
+            break
+    return total, removed
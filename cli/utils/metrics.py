@@ -0,0 +1,219 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+import httpx
+
+from cli.utils.tracing import start_span
+
+# Upper bounds of the latency histogram buckets, in milliseconds. Slower requests go in a last, open-ended bucket
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+# Path segments that are IDs, replaced so that all calls to an endpoint are counted together
+_ID_SEGMENT = re.compile(r'/(?:[0-9a-fA-F-]{16,}|\d+)(?=/|$)')
+
+
+def endpoint_name(method: str, path: str) -> str:
+    return f'{method} {_ID_SEGMENT.sub("/{id}", path)}'
+
+
+class EndpointMetrics:
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0  # Transport errors, e.g. timeouts, which have no status code
+        self.status_codes: Counter[int] = Counter()
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def observe(self, ms: float, status_code: int | None, bytes_in: int, bytes_out: int):
+        self.calls += 1
+        if status_code is None:
+            self.errors += 1
+        else:
+            self.status_codes[status_code] += 1
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.histogram[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+
+    def percentile_ms(self, fraction: float) -> float | None:
+        # Upper bound of the bucket holding the percentile, None if it is in the open-ended bucket
+        rank = fraction * self.calls
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.histogram):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def to_dict(self) -> dict:
+        return dict(
+            calls=self.calls,
+            errors=self.errors,
+            status_codes={str(code): count for code, count in sorted(self.status_codes.items())},
+            bytes_in=self.bytes_in,
+            bytes_out=self.bytes_out,
+            mean_ms=round(self.total_ms / self.calls, 1) if self.calls else None,
+            max_ms=round(self.max_ms, 1),
+            p95_bucket_ms=self.percentile_ms(0.95),
+            latency_histogram_ms={
+                **{f'<={bound}': count for bound, count in zip(LATENCY_BUCKETS_MS, self.histogram)},
+                f'>{LATENCY_BUCKETS_MS[-1]}': self.histogram[-1],
+            },
+        )
+
+
+class RequestMetrics:
+    """Per-endpoint counts, status codes, bytes and latencies of the API requests made in this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self.started_at = time.time()
+
+    def observe(self, endpoint: str, ms: float, status_code: int | None, bytes_in: int, bytes_out: int):
+        with self._lock:
+            self.endpoints.setdefault(endpoint, EndpointMetrics()).observe(ms, status_code, bytes_in, bytes_out)
+
+    def reset(self):
+        with self._lock:
+            self.endpoints = {}
+            self.started_at = time.time()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return dict(
+                since=self.started_at,
+                endpoints={name: metrics.to_dict() for name, metrics in sorted(self.endpoints.items())},
+            )
+
+
+request_metrics = RequestMetrics()
+
+
+class _Observation:
+    # One request, recorded once its response body has been read or closed
+
+    def __init__(self, request: httpx.Request):
+        self.endpoint = endpoint_name(request.method, request.url.path)
+        self.bytes_out = int(request.headers.get('Content-Length', 0))
+        self.started = time.perf_counter()
+        self.bytes_in = 0
+        self.recorded = False
+        self.span = start_span(
+            self.endpoint,
+            'client',
+            **{'http.request.method': request.method, 'url.path': request.url.path, 'server.address': request.url.host},
+        )
+
+    def record_read(self, response: httpx.Response) -> bool:
+        # Responses that some transports hand back already read have no stream left to measure
+        try:
+            content = response.content
+        except httpx.ResponseNotRead:
+            return False
+        self.bytes_in = len(content)
+        self.record(response.status_code)
+        return True
+
+    def record(self, status_code: int | None, error: BaseException | None = None):
+        if not self.recorded:
+            self.recorded = True
+            ms = (time.perf_counter() - self.started) * 1000
+            request_metrics.observe(self.endpoint, ms, status_code, self.bytes_in, self.bytes_out)
+            self.span.set_attributes(**{
+                'http.response.status_code': status_code,
+                'http.response.body.size': self.bytes_in,
+                'http.request.body.size': self.bytes_out,
+            })
+            self.span.end(error)
+
+
+class _MeteredStream(httpx.SyncByteStream):
+
+    def __init__(self, stream: httpx.SyncByteStream, observation: _Observation, status_code: int):
+        self._stream = stream
+        self._observation = observation
+        self._status_code = status_code
+
+    def __iter__(self):
+        for chunk in self._stream:
+            self._observation.bytes_in += len(chunk)
+            yield chunk
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._observation.record(self._status_code)
+
+
+class _AsyncMeteredStream(httpx.AsyncByteStream):
+
+    def __init__(self, stream: httpx.AsyncByteStream, observation: _Observation, status_code: int):
+        self._stream = stream
+        self._observation = observation
+        self._status_code = status_code
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self._observation.bytes_in += len(chunk)
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._observation.record(self._status_code)
+
+
+class MeteredTransport(httpx.BaseTransport):
+    """
+    Wraps the transport of the API session to record every request in `request_metrics`. Latency runs to the end of
+    the response body and bytes are counted as received, so streamed responses are measured too.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        observation = _Observation(request)
+        try:
+            response = self._transport.handle_request(request)
+        except Exception as e:
+            observation.record(None, e)
+            raise
+        if observation.record_read(response):
+            return response
+        response.stream = _MeteredStream(response.stream, observation, response.status_code)
+        return response
+
+    def close(self):
+        self._transport.close()
+
+
+class AsyncMeteredTransport(httpx.AsyncBaseTransport):
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        observation = _Observation(request)
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception as e:
+            observation.record(None, e)
+            raise
+        if observation.record_read(response):
+            return response
+        response.stream = _AsyncMeteredStream(response.stream, observation, response.status_code)
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
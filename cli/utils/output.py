@@ -0,0 +1,29 @@
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+# Machine-readable results of the running command, only collected for non-interactive runs
+_results: dict[str, Any] | None = None
+
+
+def record(**results: Any):
+    """Attach results to the running command, for `--json` output. Does nothing in the interactive CLI."""
+    if _results is not None:
+        _results.update(results)
+
+
+@contextmanager
+def capture_results() -> Iterator[dict[str, Any]]:
+    global _results
+    _results = {}
+    try:
+        yield _results
+    finally:
+        _results = None
+
+
+def to_json(value: Any) -> Any:
+    # `default` hook for json.dumps, so results can hold schema models directly.
+    # Duck-typed so that importing this module doesn't pull in pydantic
+    if hasattr(value, 'model_dump'):
+        return value.model_dump(mode='json')
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
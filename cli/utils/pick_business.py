@@ -1,14 +1,64 @@
+import time
+from concurrent.futures import Future
+
 from tabulate import tabulate
 
 from cli.api_client import HonulabsAPIClient
-from cli.schema import HonulabsBusinessPick
+from cli.schema import HonulabsBusiness, HonulabsBusinessPick
+from cli.utils.prompts import ask
 from cli.utils.token import HonulabsToken
 
+# A project list fetched ahead of time, used by the next picker if it is recent enough
+PREFETCH_MAX_AGE = 60
+_prefetched: Future | None = None
+_prefetched_at = 0.0
+# Project ID or name to pick without asking, for non-interactive runs
+_selected_project: str | None = None
+
+
+def select_project(project: str | None):
+    global _selected_project
+    _selected_project = project
+
+
+def prefetch_businesses(api_client: HonulabsAPIClient):
+    global _prefetched, _prefetched_at
+    future = Future()
+    _prefetched, _prefetched_at = future, time.monotonic()
+    try:
+        future.set_result(api_client.list_businesses())
+    except Exception as e:
+        future.set_exception(e)
+
+
+def discard_prefetched_businesses():
+    # Call after creating or deleting projects so the picker doesn't show a stale list
+    global _prefetched
+    _prefetched = None
+
+
+def _list_businesses(api_client: HonulabsAPIClient) -> list[HonulabsBusiness]:
+    global _prefetched
+    future, _prefetched = _prefetched, None
+    if future is not None and time.monotonic() - _prefetched_at < PREFETCH_MAX_AGE:
+        try:
+            # Waits for a prefetch that is still in flight rather than sending a second request
+            return future.result()
+        except Exception:
+            pass
+    return api_client.list_businesses()
+
 
 def pick_business(table_style: str) -> HonulabsBusinessPick | None:
     token = HonulabsToken()
     api_client = HonulabsAPIClient(token.token)
-    businesses = api_client.list_businesses()
+    businesses = _list_businesses(api_client)
+    if _selected_project is not None:
+        for biz in businesses:
+            if _selected_project in (biz.business_id, biz.name):
+                return HonulabsBusinessPick(id=biz.business_id, model_ref=biz.model_ref)
+        raise LookupError(f'Could not find a project with ID or name "{_selected_project}"')
+
     if not businesses:
         print('You have no projects yet! Please use `create_project` to create a new one!')
         return
@@ -29,13 +79,13 @@ def pick_business(table_style: str) -> HonulabsBusinessPick | None:
     ))
     try:
         print('Please select the number of the project to interact with, or press ESC to cancel.')
-        selected_num = input('> ').strip()
+        selected_num = ask('> ').strip()
         if selected_num == '' or selected_num.lower() == 'esc' or selected_num == '\x1b':
             return
 
         while selected_num not in data:
             print('That number is not a valid choice, please select a valid choice or press ESC to cancel.')
-            selected_num = input('> ').strip()
+            selected_num = ask('> ').strip()
             if selected_num == '' or selected_num.lower() == 'esc' or selected_num == '\x1b':
                 return
 
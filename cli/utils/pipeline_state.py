@@ -0,0 +1,112 @@
+import json
+from pathlib import Path
+from typing import Callable
+
+from cli.api_client import HonulabsAPIClient
+from cli.schema import HonulabsJob, JobStatus
+from cli.settings import Settings
+from cli.utils.local_files import write_atomic
+from cli.utils.prompts import is_interactive, prompt_with_default
+
+
+class PipelineState:
+    """
+    The jobs a multistep flow has started and not finished with yet, saved per flow and business so that running the
+    flow again can pick them back up instead of paying for them twice.
+
+    Each step keeps the ID of its job and the inputs it was started with. A step is finished, and forgotten, once its
+    result has been used; a job left behind by an interrupted wait stays until the flow is run again.
+    """
+
+    def __init__(self, pipeline: str, business_id: str, directory: Path | None = None):
+        self.path = (directory or Settings.PIPELINE_STATE_DIR) / f'{pipeline}-{business_id}.json'
+        self._steps: dict[str, dict] = self._load()
+
+    def _load(self) -> dict:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return data.get('steps', {}) if isinstance(data, dict) else {}
+
+    def _save(self):
+        if not self._steps:
+            self.path.unlink(missing_ok=True)
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, json.dumps({'steps': self._steps}).encode())
+
+    def saved(self, step: str) -> tuple[str, dict] | None:
+        # ID and inputs of the job started for a step
+        entry = self._steps.get(step)
+        if entry is None:
+            return None
+        return entry['job_id'], entry['inputs']
+
+    def save(self, step: str, job_id: str, inputs: dict):
+        self._steps[step] = {'job_id': job_id, 'inputs': inputs}
+        self._save()
+
+    def finish(self, step: str):
+        if self._steps.pop(step, None) is not None:
+            self._save()
+
+    def resume(
+            self,
+            api_client: HonulabsAPIClient,
+            business_id: str,
+            step: str,
+            inputs: dict | None = None,
+            matches: Callable[[dict], bool] | None = None,
+            confirm: bool = False,
+    ) -> tuple[HonulabsJob, dict] | None:
+        """
+        The job saved for a step, with its inputs, if it is still running or has succeeded, and was started with
+        `inputs` or with inputs that `matches` accepts, when given. Failed and unreadable jobs, and jobs started with
+        other inputs, are forgotten, so the step starts over.
+
+        With `confirm`, interactive runs are asked before the job is picked back up, and it is forgotten if they decline.
+        """
+        saved = self.saved(step)
+        if saved is None:
+            return None
+        job_id, saved_inputs = saved
+        if (inputs is not None and saved_inputs != inputs) or (matches is not None and not matches(saved_inputs)):
+            self.finish(step)
+            return None
+        try:
+            job = api_client.get_job(business_id, job_id)
+        except Exception:
+            job = None
+        if job is None or job.status == JobStatus.FAILED:
+            self.finish(step)
+            return None
+        if confirm and is_interactive():
+            progress = 'has finished' if job.status == JobStatus.SUCCESS else 'is still running'
+            print(f'The {job.job_type} job started by a previous run ({job.job_id}) {progress}.')
+            try:
+                resume = prompt_with_default('Do you want to pick it back up?')
+            except (KeyboardInterrupt, EOFError):
+                # Not answered, so kept for next time
+                return None
+            if not resume:
+                self.finish(step)
+                return None
+        print(f'Picking up the {job.job_type} job started by a previous run ({job.job_id}).')
+        return job, saved_inputs
+
+    def resume_or_submit(
+            self,
+            api_client: HonulabsAPIClient,
+            business_id: str,
+            step: str,
+            inputs: dict,
+            submit: Callable[[], HonulabsJob],
+    ) -> HonulabsJob:
+        # The job saved for a step if it was started with the same inputs, or a new one
+        resumed = self.resume(api_client, business_id, step, inputs)
+        if resumed is not None:
+            return resumed[0]
+        job = submit()
+        self.save(step, job.job_id, inputs)
+        return job
@@ -0,0 +1,72 @@
+import random
+from abc import ABC, abstractmethod
+
+from cli.settings import Settings
+
+
+class PollStrategy(ABC):
+    """
+    Decides how long to wait before the next status request of a job.
+
+    `attempt` counts the polls already made for the job, starting at 0. `hint` is the number of seconds the server
+    asked us to wait (e.g. from a `Retry-After` header), which is always honoured as a lower bound.
+    """
+
+    @abstractmethod
+    def delay(self, attempt: int, hint: float | None = None) -> float:
+        pass
+
+
+class FixedPollStrategy(PollStrategy):
+
+    def __init__(self, interval: float = 1):
+        self.interval = interval
+
+    def delay(self, attempt: int, hint: float | None = None) -> float:
+        return max(self.interval, hint or 0)
+
+
+class BackoffPollStrategy(PollStrategy):
+    """
+    Polls quickly for the first `fast_attempts` requests, so short jobs are picked up with little lag, then backs off
+    exponentially up to `max_interval` so long running generation jobs are not polled needlessly.
+    Delays are spread by +/- `jitter` (a fraction of the delay) to avoid many waits polling in lockstep.
+    """
+
+    def __init__(
+            self,
+            initial_interval: float = 0.25,
+            fast_attempts: int = 8,
+            factor: float = 1.5,
+            max_interval: float = 10,
+            jitter: float = 0.2,
+            rng: random.Random | None = None,
+    ):
+        self.initial_interval = initial_interval
+        self.fast_attempts = fast_attempts
+        self.factor = factor
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+
+    def delay(self, attempt: int, hint: float | None = None) -> float:
+        if attempt < self.fast_attempts:
+            delay = self.initial_interval
+        else:
+            delay = self.initial_interval * self.factor ** (attempt - self.fast_attempts + 1)
+        delay = min(delay, self.max_interval)
+        if self.jitter:
+            delay = min(delay * self.rng.uniform(1 - self.jitter, 1 + self.jitter), self.max_interval)
+        return max(delay, hint or 0)
+
+
+def poll_strategy_from_settings() -> PollStrategy:
+    if Settings.JOB_POLL_STRATEGY == 'fixed':
+        return FixedPollStrategy(Settings.JOB_POLL_INTERVAL)
+    return BackoffPollStrategy(
+        initial_interval=Settings.JOB_POLL_INITIAL_INTERVAL,
+        fast_attempts=Settings.JOB_POLL_FAST_ATTEMPTS,
+        factor=Settings.JOB_POLL_BACKOFF_FACTOR,
+        max_interval=Settings.JOB_POLL_MAX_INTERVAL,
+        jitter=Settings.JOB_POLL_JITTER,
+    )
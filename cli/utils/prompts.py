@@ -1,3 +1,43 @@
+from collections import deque
+from typing import Iterable
+
+# Answers given up front for non-interactive runs, consumed in order by `ask`
+_answers: deque[str] | None = None
+_unanswered_prompt: str | None = None
+
+
+def set_answers(answers: Iterable[str] | None):
+    """
+    Answer prompts from `answers` instead of the terminal, or go back to the terminal with None.
+    Once the answers run out, prompts raise EOFError, which the interactive flows already treat as cancelling.
+    """
+    global _answers, _unanswered_prompt
+    _answers = deque(answers) if answers is not None else None
+    _unanswered_prompt = None
+
+
+def is_interactive() -> bool:
+    return _answers is None
+
+
+def unanswered_prompt() -> str | None:
+    # The prompt that found no answer left, if any, since the answers were set
+    return _unanswered_prompt
+
+
+def ask(prompt: str = '') -> str:
+    """Drop-in replacement for `input` that reads from the given answers when there are some."""
+    global _unanswered_prompt
+    if _answers is None:
+        return input(prompt)
+    if not _answers:
+        _unanswered_prompt = prompt
+        raise EOFError(f'No answer given for prompt: {prompt}')
+    answer = _answers.popleft()
+    print(f'{prompt}{answer}')
+    return answer
+
+
 def prompt_with_default(prompt: str, default_to_yes: bool = True) -> bool:
     """
     Prompts the user with a [Y/n] or [y/N] question and returns a boolean.
@@ -16,7 +56,7 @@ def prompt_with_default(prompt: str, default_to_yes: bool = True) -> bool:
     full_prompt = prompt + prompt_suffix
 
     while True:
-        response = input(full_prompt).lower().strip()
+        response = ask(full_prompt).lower().strip()
         if response == "":
             return default_to_yes
         if response in ["y", "yes"]:
@@ -0,0 +1,10 @@
+import sys
+
+from halo import Halo
+
+
+def make_spinner(text: str = '', spinner: str | dict = 'dots') -> Halo:
+    # Bound to the current stdout rather than the one at import time, so spinners follow any redirection,
+    # and disabled when that isn't a terminal so logs and piped output don't fill up with animation frames
+    stream = sys.stdout
+    return Halo(text=text, spinner=spinner, stream=stream, enabled=stream.isatty())
@@ -1,40 +1,73 @@
 import json
+import threading
 from json import JSONDecodeError
 from pathlib import Path
 
 
-class HonulabsToken:
-    FILE_PATH = Path.home() / '.honulabsrc'
+class TokenProvider:
+    """
+    In-memory copy of the token stored in a token file, shared by the whole process.
+    The file is only parsed again when its modification time changes, e.g. after logging in from another terminal.
+    """
 
-    def __init__(self, token: str | None = None):
-        if token is None:
-            token = self._get_token_from_file()
-        else:
-            self._save_token(token)
-        self.token = token
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime: int | None = None
+        self._data: dict = {}
+
+    def _stat_mtime(self) -> int | None:
+        try:
+            return self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _load(self):
+        mtime = self._stat_mtime()
+        if mtime == self._mtime:
+            return
+        data = {}
+        if mtime is not None:
+            with open(self.path) as f:
+                try:
+                    data = json.load(f)
+                except JSONDecodeError:
+                    pass
+        self._data = data if isinstance(data, dict) else {}
+        self._mtime = mtime
+
+    @property
+    def token(self) -> str | None:
+        with self._lock:
+            self._load()
+            return self._data.get('token')
 
-    def _get_token_from_file(self) -> str | None:
-        if not self.FILE_PATH.exists():
-            self.FILE_PATH.touch(exist_ok=True)
+    def save(self, token: str):
+        with self._lock:
+            self._load()
+            data = {**self._data, 'token': token}
+            with open(self.path, 'w') as f:
+                json.dump(data, f)
+            self._data = data
+            self._mtime = self._stat_mtime()
 
-        with open(self.FILE_PATH) as f:
-            try:
-                data = json.load(f)
-                return data.get('token')
-            except JSONDecodeError:
-                return None
 
-    def _save_token(self, token: str):
-        if not self.FILE_PATH.exists():
-            self.FILE_PATH.touch(exist_ok=True)
+_providers: dict[Path, TokenProvider] = {}
 
-        with open(self.FILE_PATH) as f:
-            try:
-                data = json.load(f)
-            except JSONDecodeError:
-                data = {}
 
-        data['token'] = token
+def get_token_provider(path: Path) -> TokenProvider:
+    if path not in _providers:
+        _providers[path] = TokenProvider(path)
+    return _providers[path]
 
-        with open(self.FILE_PATH, 'w') as f:
-            json.dump(data, f)
+
+class HonulabsToken:
+    FILE_PATH = Path.home() / '.honulabsrc'
+
+    def __init__(self, token: str | None = None):
+        provider = get_token_provider(self.FILE_PATH)
+        if token is None:
+            token = provider.token
+        else:
+            provider.save(token)
+        self.token = token
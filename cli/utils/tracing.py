@@ -0,0 +1,170 @@
+"""
+Optional tracing of commands, API requests and job waits, enabled by setting TRACE_FILE.
+
+Every command is a root span, with a child span for each API request and job wait made while it runs. Finished spans
+are appended to TRACE_FILE as OTLP/JSON, one export request per line, which is the format read by the OpenTelemetry
+collector's `otlpjsonfile` receiver and most trace viewers' file importers.
+"""
+import json
+import os
+import platform
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Iterator
+
+from cli.settings import Settings
+
+SERVICE_NAME = 'honulabs-cli'
+# OTLP span kinds and status codes
+SPAN_KINDS = {'internal': 1, 'server': 2, 'client': 3}
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span: ContextVar['Span | None'] = ContextVar('current_span', default=None)
+_export_lock = threading.Lock()
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict]:
+    return [{'key': key, 'value': _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+class Span:
+
+    def __init__(self, name: str, kind: str = 'internal', parent: 'Span | None' = None, **attributes: Any):
+        self.name = name
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = dict(attributes)
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.error: str | None = None
+
+    def set_attributes(self, **attributes: Any):
+        self.attributes.update(attributes)
+
+    def end(self, error: BaseException | None = None):
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = f'{type(error).__name__}: {error}'
+        _export(self)
+
+    def to_otlp(self) -> dict:
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': SPAN_KINDS[self.kind],
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': _otlp_attributes(self.attributes),
+            'status': {'code': STATUS_ERROR, 'message': self.error} if self.error else {'code': STATUS_OK},
+        }
+        if self.parent_id is not None:
+            span['parentSpanId'] = self.parent_id
+        return span
+
+
+class _NoopSpan(Span):
+    # Handed out while tracing is off, so instrumented code doesn't need to check
+
+    def __init__(self):
+        self.attributes = {}
+        self.end_ns = None
+
+    def set_attributes(self, **attributes: Any):
+        pass
+
+    def end(self, error: BaseException | None = None):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def tracing_enabled() -> bool:
+    return Settings.TRACE_FILE is not None
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def start_span(name: str, kind: str = 'internal', parent: Span | None = None, **attributes: Any) -> Span:
+    """
+    Start a span, by default a child of the current one, without making it current. Call `end()` when done. Used for
+    work that finishes elsewhere, like a streamed response.
+    """
+    if not tracing_enabled():
+        return NOOP_SPAN
+    if parent is None or isinstance(parent, _NoopSpan):
+        parent = _current_span.get()
+    return Span(name, kind, parent, **attributes)
+
+
+@contextmanager
+def span(name: str, kind: str = 'internal', **attributes: Any) -> Iterator[Span]:
+    """Trace the enclosed block as a child of the current span, or as a new trace if there is none."""
+    if not tracing_enabled():
+        yield NOOP_SPAN
+        return
+    current = Span(name, kind, _current_span.get(), **attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.end(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+
+
+def run_in_span(span: Span | None, func: Callable, *args: Any) -> Any:
+    """
+    Call `func` with `span` as the current span. Threads don't inherit the current span, so work handed to a thread
+    pool goes through this to stay in its trace.
+    """
+    if span is None or isinstance(span, _NoopSpan):
+        return func(*args)
+    context = copy_context()
+    context.run(_current_span.set, span)
+    return context.run(func, *args)
+
+
+def _export(span: Span):
+    request = {
+        'resourceSpans': [{
+            'resource': {'attributes': _otlp_attributes({
+                'service.name': SERVICE_NAME,
+                'host.name': platform.node(),
+                'process.pid': os.getpid(),
+            })},
+            'scopeSpans': [{'scope': {'name': __name__}, 'spans': [span.to_otlp()]}],
+        }],
+    }
+    line = json.dumps(request) + '\n'
+    with _export_lock:
+        try:
+            path = Settings.TRACE_FILE
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a') as f:
+                f.write(line)
+        except (OSError, AttributeError):
+            # Tracing must never break a command. AttributeError: turned off while the span was running
+            pass
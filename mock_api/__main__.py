@@ -0,0 +1,16 @@
+import argparse
+
+from mock_api.app import create_app
+
+parser = argparse.ArgumentParser(description='Run a local stand-in of the Honulabs API')
+parser.add_argument('--host', default='127.0.0.1')
+parser.add_argument('--port', type=int, default=8000)
+parser.add_argument('--job-duration', type=float, default=3, help='Seconds every job takes to finish')
+args = parser.parse_args()
+
+try:
+    import uvicorn
+except ImportError:
+    raise SystemExit('uvicorn is required to serve the mock API: pip install uvicorn')
+
+uvicorn.run(create_app(job_duration=args.job_duration), host=args.host, port=args.port)
@@ -0,0 +1,241 @@
+"""
+An in-memory stand-in for the Honulabs API, for exercising the CLI clients locally.
+
+Jobs finish `job_duration` seconds after they are submitted, passing through `pending` and `in_progress` (with a
+changing message) on the way. Deleting a business removes it, and its jobs, once the deletion job has finished.
+JSON GET responses carry an ETag and are answered with 304 Not Modified when revalidated with a matching
+If-None-Match. The job list is filtered and paginated like the real API, with the next page's cursor in the
+X-Next-Cursor response header.
+"""
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from fastapi import Body, FastAPI, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from mock_api.results import result_for
+
+JOB_TYPES = {
+    'business_plan_requirements',
+    'base_business_plan',
+    'business_names_and_domains',
+    'full_business_details',
+    'deploy_page',
+    'deploy_vercel_environment_variables',
+    'add_user_to_repo',
+    'industry_idea_segmentation',
+    'idea_generation',
+    'toggle_product_readiness',
+    'confirm_trello_sprint_ready',
+    'add_users_to_trello_board',
+}
+MESSAGES = ['Researching', 'Drafting', 'Reviewing']
+ORGANISATION = {'org_id': 'org_mock', 'domain_id': 'honulabs.xyz'}
+
+
+class MockJob:
+
+    def __init__(self, business: dict, job_type: str, duration: float, clock: Callable[[], float] = time.monotonic):
+        self.job_id = uuid.uuid4().hex
+        self.job_type = job_type
+        self.business = business
+        self.duration = duration
+        self.clock = clock
+        self.started_at = datetime.now(timezone.utc)
+        self.created = clock()
+
+    @property
+    def progress(self) -> float:
+        if self.duration <= 0:
+            return 1
+        return (self.clock() - self.created) / self.duration
+
+    @property
+    def finished(self) -> bool:
+        return self.progress >= 1
+
+    def to_dict(self) -> dict:
+        progress = self.progress
+        data = dict(
+            job_id=self.job_id,
+            job_type=self.job_type,
+            business=self.business,
+            status='pending',
+            message=None,
+            cost=None,
+            error=None,
+            result=None,
+            started_at=self.started_at.isoformat(),
+            finished_at=None,
+        )
+        if progress >= 1:
+            data.update(
+                status='success',
+                cost=round(0.01 * len(self.job_type), 4),
+                result=result_for(self.job_type),
+                finished_at=(self.started_at + timedelta(seconds=self.duration)).isoformat(),
+            )
+        elif progress >= 0.1:
+            data.update(status='in_progress', message=MESSAGES[min(int(progress * len(MESSAGES)), len(MESSAGES) - 1)])
+        return data
+
+
+class MockState:
+
+    def __init__(self, job_duration: float, clock: Callable[[], float] = time.monotonic):
+        self.job_duration = job_duration
+        self.clock = clock
+        self.businesses: dict[str, dict] = {}
+        self.jobs: dict[str, MockJob] = {}
+        self.requests = 0
+        self.not_modified = 0
+
+    def collect_deleted(self):
+        for job in list(self.jobs.values()):
+            if job.job_type == 'delete_business' and job.finished:
+                business_id = job.business['business_id']
+                self.businesses.pop(business_id, None)
+                self.jobs = {k: v for k, v in self.jobs.items() if v.business['business_id'] != business_id}
+
+    def business(self, business_id: str) -> dict:
+        self.collect_deleted()
+        if business_id not in self.businesses:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, 'Business not found')
+        return self.businesses[business_id]
+
+    def job(self, business_id: str, job_id: str) -> MockJob:
+        self.business(business_id)
+        job = self.jobs.get(job_id)
+        if job is None or job.business['business_id'] != business_id:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, 'Job not found')
+        return job
+
+    def submit(self, business_id: str, job_type: str) -> MockJob:
+        job = MockJob(self.business(business_id), job_type, self.job_duration, self.clock)
+        self.jobs[job.job_id] = job
+        return job
+
+
+def create_app(job_duration: float = 3, clock: Callable[[], float] = time.monotonic) -> FastAPI:
+    """
+    Build the stand-in app. Job progress is measured with `clock`, which can be swapped for a fake one to run job
+    waits without sleeping; the job event stream still paces itself in real time, so use polling with a fake clock.
+    """
+    app = FastAPI(title='Honulabs API stand-in')
+    state = MockState(job_duration, clock)
+    app.state.mock = state
+
+    @app.middleware('http')
+    async def etags(request: Request, call_next):
+        response = await call_next(request)
+        if request.method != 'GET' or response.status_code != status.HTTP_200_OK:
+            return response
+        if not response.headers.get('Content-Type', '').startswith('application/json'):
+            return response
+
+        body = b''.join([chunk async for chunk in response.body_iterator])
+        # The next page cursor is part of the representation, as a full last page gains one when jobs are added
+        etag = f'"{hashlib.sha1(body + response.headers.get("X-Next-Cursor", "").encode()).hexdigest()}"'
+        if request.headers.get('If-None-Match') == etag:
+            state.not_modified += 1
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in ('content-length', 'content-type')}
+        return Response(body, response.status_code, headers={**headers, 'ETag': etag}, media_type='application/json')
+
+    @app.middleware('http')
+    async def authenticate(request: Request, call_next):
+        state.requests += 1
+        authorization = request.headers.get('Authorization', '')
+        if not authorization.startswith('Bearer ') or authorization == 'Bearer invalid':
+            return JSONResponse({'detail': 'Not authenticated'}, status.HTTP_401_UNAUTHORIZED)
+        return await call_next(request)
+
+    @app.get('/v1/organisations')
+    def organisations():
+        return [ORGANISATION]
+
+    @app.get('/v1/businesses')
+    def list_businesses():
+        state.collect_deleted()
+        return list(state.businesses.values())
+
+    @app.post('/v1/businesses', status_code=status.HTTP_201_CREATED)
+    def create_business(payload: dict = Body(...)):
+        business = dict(
+            org=ORGANISATION,
+            name=payload['name'],
+            business_id=uuid.uuid4().hex,
+            model_ref=f'model_{uuid.uuid4().hex[:8]}',
+        )
+        state.businesses[business['business_id']] = business
+        return business
+
+    @app.delete('/v1/businesses/{business_id}', status_code=status.HTTP_202_ACCEPTED)
+    def delete_business(business_id: str):
+        return state.submit(business_id, 'delete_business').to_dict()
+
+    @app.get('/v1/businesses/{business_id}/jobs')
+    def list_jobs(
+            business_id: str,
+            response: Response,
+            job_type: str | None = None,
+            status_: str | None = Query(None, alias='status'),
+            limit: int = Query(100, ge=1, le=1000),
+            cursor: str | None = None,
+            include_result: bool = True,
+    ):
+        # Jobs in submission order, a page at a time. The cursor is the ID of the last job of the previous page
+        state.business(business_id)
+        jobs = [job.to_dict() for job in state.jobs.values() if job.business['business_id'] == business_id]
+        if cursor is not None:
+            ids = [job['job_id'] for job in jobs]
+            if cursor not in ids:
+                raise HTTPException(status.HTTP_400_BAD_REQUEST, 'Invalid cursor')
+            jobs = jobs[ids.index(cursor) + 1:]
+        if job_type is not None:
+            jobs = [job for job in jobs if job['job_type'] == job_type]
+        if status_ is not None:
+            jobs = [job for job in jobs if job['status'] == status_]
+        if len(jobs) > limit:
+            response.headers['X-Next-Cursor'] = jobs[limit - 1]['job_id']
+        jobs = jobs[:limit]
+        if not include_result:
+            for job in jobs:
+                job['result'] = None
+        return jobs
+
+    @app.get('/v1/businesses/{business_id}/jobs/{job_id}')
+    def get_job(business_id: str, job_id: str):
+        return state.job(business_id, job_id).to_dict()
+
+    @app.get('/v1/businesses/{business_id}/jobs/{job_id}/events')
+    async def job_events(business_id: str, job_id: str):
+        job = state.job(business_id, job_id)
+
+        async def events():
+            # Send the job whenever its status or message changes, until it has sent it finished
+            last = None
+            while True:
+                data = job.to_dict()
+                if (data['status'], data['message']) != last:
+                    last = (data['status'], data['message'])
+                    yield f'event: job\ndata: {json.dumps(data)}\n\n'
+                if data['status'] in ('success', 'failed'):
+                    return
+                await asyncio.sleep(min(0.05, job.duration / 10))
+
+        return StreamingResponse(events(), media_type='text/event-stream')
+
+    @app.post('/v1/businesses/{business_id}/jobs/{job_type}', status_code=status.HTTP_202_ACCEPTED)
+    def submit_job(business_id: str, job_type: str):
+        if job_type not in JOB_TYPES:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, f'Unknown job type {job_type}')
+        return state.submit(business_id, job_type).to_dict()
+
+    return app
+
@@ -0,0 +1,72 @@
+# Canned results for every job type, shaped to pass validation by the models in cli.schema
+LOREM = (
+    'Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt ut labore et dolore '
+    'magna aliqua. Ut enim ad minim veniam, quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo.'
+)
+
+
+def _framework(*names: str) -> dict:
+    return {name: LOREM for name in names}
+
+
+def business_plan_requirements() -> dict:
+    return dict(
+        business_idea=LOREM,
+        questions_and_answers=LOREM,
+        problem_definition=_framework('populated_problem_definition_framework', 'problem_statement'),
+        competitor_analysis=_framework('populated_competitor_analysis_framework', 'competitor_comparison_table'),
+        target_market_analysis=_framework('populated_target_market_definition_framework', 'target_market_summary'),
+        ideal_customer_profile_research=_framework('icp_research_findings', 'identified_icps'),
+        unique_value_proposition=_framework(
+            'populated_value_proposition_definition_framework',
+            'value_proposition_statement',
+        ),
+        pricing_strategy=_framework('populated_pricing_strategy_framework', 'pricing_summary'),
+        positioning_summary=_framework('populated_positioning_definition_framework', 'positioning_summary'),
+    )
+
+
+def base_business_plan() -> dict:
+    return dict(business_plan='\n\n'.join([LOREM] * 200), business_plan_concise='\n\n'.join([LOREM] * 10))
+
+
+def business_names_and_domains() -> dict:
+    return dict(business_names_with_domains=[
+        dict(business_name=f'Turtle {i}', domain_name_options=[f'turtle{i}.com', f'turtle{i}.io'])
+        for i in range(1, 6)
+    ])
+
+
+def industry_idea_segmentation() -> dict:
+    return dict(ideas=[
+        dict(core_market=f'Market {i}', sub_category=f'Sub-category {i}', niche=f'Niche {i}')
+        for i in range(1, 6)
+    ])
+
+
+def idea_generation() -> dict:
+    return dict(ideas=[
+        dict(
+            challenge=LOREM,
+            saas_venture_title=f'Idea {i}',
+            saas_venture_description=LOREM,
+            feasibility_rank=i,
+        )
+        for i in range(1, 6)
+    ])
+
+
+RESULTS = {
+    'business_plan_requirements': business_plan_requirements,
+    'base_business_plan': base_business_plan,
+    'business_names_and_domains': business_names_and_domains,
+    'full_business_details': lambda: dict(business_plan='\n\n'.join([LOREM] * 400)),
+    'deploy_page': lambda: dict(app_links=['https://turtle.honulabs.xyz']),
+    'add_user_to_repo': lambda: dict(repo='honu-ai/turtle'),
+    'industry_idea_segmentation': industry_idea_segmentation,
+    'idea_generation': idea_generation,
+}
+
+
+def result_for(job_type: str) -> dict:
+    return RESULTS.get(job_type, dict)()
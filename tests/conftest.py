@@ -0,0 +1,83 @@
+import warnings
+
+import pytest
+
+with warnings.catch_warnings():
+    # The test client warns about its own use of httpx, which isn't ours to fix
+    warnings.simplefilter('ignore')
+    from starlette.testclient import TestClient
+
+from cli.api_client import HonulabsAPIClient
+from cli.session import set_session
+from cli.settings import Settings
+from cli.utils.job_manager import JobManager
+from cli.utils.prompts import set_answers
+from cli.utils.token import HonulabsToken
+from mock_api import create_app
+
+TOKEN = 'test-token'
+
+
+class FakeClock:
+    """Monotonic clock that only moves when something sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    # Token, caches and saved flows kept in a temporary home
+    monkeypatch.setattr(HonulabsToken, 'FILE_PATH', tmp_path / '.honulabsrc')
+    monkeypatch.setattr(Settings, 'HTTP_CACHE_DIR', tmp_path / 'http_cache')
+    monkeypatch.setattr(Settings, 'ARTIFACT_STORE_DIR', tmp_path / 'artifacts')
+    monkeypatch.setattr(Settings, 'PIPELINE_STATE_DIR', tmp_path / 'pipelines')
+    monkeypatch.setattr(Settings, 'JOB_INDEX_DIR', tmp_path / 'job_index')
+    monkeypatch.setattr(Settings, 'JOB_EVENTS', False)
+    monkeypatch.setattr(JobManager, 'events_unavailable', False)
+    HonulabsToken(TOKEN)
+    return tmp_path
+
+
+@pytest.fixture
+def app(home, clock):
+    # The API stand-in, with jobs taking 10 seconds of the fake clock
+    app = create_app(job_duration=10, clock=clock)
+    set_session(TestClient(app, base_url='http://honulabs.test'))
+    yield app
+    set_session(None)
+
+
+@pytest.fixture
+def state(app):
+    return app.state.mock
+
+
+@pytest.fixture
+def api_client(app) -> HonulabsAPIClient:
+    return HonulabsAPIClient(TOKEN)
+
+
+@pytest.fixture
+def business_id(api_client) -> str:
+    return api_client.create_business('Project').business_id
+
+
+@pytest.fixture
+def answers():
+    # Answers to the prompts, in order, as a script would give them
+    yield set_answers
+    set_answers(None)
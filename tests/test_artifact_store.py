@@ -0,0 +1,90 @@
+import os
+
+from cli.utils.artifact_store import ArtifactStore
+from cli.utils.local_files import digest
+
+
+def test_get_returns_what_was_put(tmp_path):
+    store = ArtifactStore(tmp_path, max_bytes=2 ** 20)
+    store.put('job-1', b'{"result": 1}')
+
+    assert store.get('job-1') == b'{"result": 1}'
+    assert store.get('job-2') is None
+
+
+def test_least_recently_used_contents_are_evicted(tmp_path):
+    store = ArtifactStore(tmp_path, max_bytes=2 ** 20)
+    for num in range(3):
+        store.put(f'job-{num}', os.urandom(1024))
+        path = store._object_path(store._index_path(f'job-{num}').read_text())
+        os.utime(path, (num, num))
+    size = max(path.stat().st_size for path in store._objects())
+
+    # Room for two contents, job-0 was just read so job-1 is the least recently used
+    store.get('job-0')
+    store.max_bytes = 2 * size + size // 2
+    store.evict()
+
+    assert sum(path.stat().st_size for path in store._objects()) <= store.max_bytes
+    assert store.get('job-1') is None
+    assert store.get('job-0') is not None
+    assert store.get('job-2') is not None
+
+
+def test_finished_jobs_are_kept_in_the_artifact_store_only(api_client, state, home, clock):
+    business = api_client.create_business('Project')
+    job = state.submit(business.business_id, 'deploy_page')
+    clock.sleep(10)
+    api_client.get_job(business.business_id, job.job_id)
+
+    assert (home / 'artifacts' / digest('test-token') / 'index').is_dir()
+    assert not (home / 'http_cache' / digest('test-token') / digest(
+        f'/v1/businesses/{business.business_id}/jobs/{job.job_id}'
+    )).exists()
+
+
+def test_writes_below_the_cap_do_not_scan_the_store(tmp_path, monkeypatch):
+    store = ArtifactStore(tmp_path, max_bytes=2 ** 20)
+    scans = []
+    objects = store._objects
+    monkeypatch.setattr(store, '_objects', lambda: scans.append(1) or objects())
+
+    for num in range(5):
+        store.put(f'job-{num}', os.urandom(1024))
+
+    # Counted once on the first write, then kept up to date
+    assert len(scans) == 1
+
+
+def test_evicted_contents_take_their_job_ids_along(tmp_path):
+    store = ArtifactStore(tmp_path, max_bytes=2 ** 20)
+    store.put('job-0', b'old')
+    store.put('job-1', b'old')
+    store.put('job-2', b'new')
+    os.utime(store._object_path(store._index_path('job-0').read_text()), (0, 0))
+    size = max(path.stat().st_size for path in store._objects())
+
+    store.max_bytes = size + size // 2
+    store.evict()
+
+    assert not store._index_path('job-0').exists()
+    assert not store._index_path('job-1').exists()
+    assert store.get('job-2') == b'new'
+    assert store._total == size
+
+
+def test_polls_do_not_read_the_artifact_store(api_client, state, business_id, clock, monkeypatch):
+    job = state.submit(business_id, 'deploy_page')
+    reads = []
+    get = api_client.artifacts.get
+    monkeypatch.setattr(api_client.artifacts, 'get', lambda key: reads.append(key) or get(key))
+
+    api_client.poll_job(business_id, job.job_id)
+    clock.sleep(10)
+    api_client.poll_job(business_id, job.job_id)
+    assert reads == []
+
+    requests = state.requests
+    assert api_client.get_job(business_id, job.job_id).status == 'success'
+    assert reads == [job.job_id]
+    assert state.requests == requests
@@ -0,0 +1,46 @@
+import asyncio
+
+import httpx
+
+from cli.async_api_client import AsyncHonulabsAPIClient
+from cli.schema import JobStatus
+from mock_api import create_app
+from tests.conftest import TOKEN
+
+
+def run(test):
+    # Serve a fresh stand-in, with jobs taking 0.2 seconds, to `test(client, state)`
+    async def main():
+        app = create_app(job_duration=0.2)
+        session = httpx.AsyncClient(transport=httpx.ASGITransport(app), base_url='http://honulabs.test')
+        async with AsyncHonulabsAPIClient(TOKEN, session) as client:
+            return await test(client, app.state.mock)
+    return asyncio.run(main())
+
+
+def test_poll_job():
+    async def test(client, state):
+        business = await client.create_business('Project')
+        submitted = await client.deploy_landing_page(business.business_id)
+        job, hint = await client.poll_job(business.business_id, submitted.job_id)
+        assert job.job_id == submitted.job_id
+        assert hint is None
+    run(test)
+
+
+def test_stream_job_events_until_finished():
+    async def test(client, state):
+        business = await client.create_business('Project')
+        submitted = await client.deploy_landing_page(business.business_id)
+        statuses = [job.status async for job in client.stream_job_events(business.business_id, submitted.job_id)]
+        assert statuses[-1] == JobStatus.SUCCESS
+    run(test)
+
+
+def test_iter_jobs_after():
+    async def test(client, state):
+        business = await client.create_business('Project')
+        jobs = [state.submit(business.business_id, 'deploy_page') for _ in range(5)]
+        listed = [job.job_id async for job in client.iter_jobs(business.business_id, after=jobs[1].job_id)]
+        assert listed == [job.job_id for job in jobs[2:]]
+    run(test)
@@ -0,0 +1,124 @@
+import json
+
+import pytest
+
+from cli.batch import main
+
+
+@pytest.fixture
+def run(app, state, capsys):
+    # Run `python -m cli` with `argv`, returning the exit code and the JSON results printed
+    state.job_duration = 0
+
+    def run(*argv: str) -> tuple[int, list[dict]]:
+        capsys.readouterr()
+        code = main(list(argv))
+        out = capsys.readouterr().out
+        return code, [json.loads(line) for line in out.splitlines()] if '--json' in argv else out
+    return run
+
+
+def test_json_results(run, business_id):
+    code, [outcome] = run('list_projects', '--json')
+
+    assert code == 0
+    assert outcome['ok'] is True
+    assert outcome['error'] is None
+    assert [project['business_id'] for project in outcome['result']['projects']] == [business_id]
+
+
+def test_json_keeps_stdout_for_results(run, capsys):
+    code, outcomes = run('create_project', 'My', 'Cool', 'App', '--json')
+
+    assert code == 0
+    assert outcomes[0]['result']['project']['name'] == 'My Cool App'
+    assert len(outcomes) == 1
+
+
+def test_without_json_prints_the_usual_output(run):
+    code, out = run('create_project', 'My', 'Cool', 'App')
+
+    assert code == 0
+    assert 'Project "My Cool App" created!' in out
+
+
+@pytest.mark.parametrize('argv, error', [
+    (['create_project'], 'Project name is required.'),
+    (['bulk_create_projects'], 'At least one project name is required.'),
+    (['idea_sweep', 'x', 'y', '0'], 'positive number of segments'),
+    (['job_costs', 'nonsense'], 'nonsense'),
+    (['query_jobs', 'since=bad'], 'bad'),
+    (['no_such_command'], 'Unknown command: no_such_command'),
+    (['token_login'], 'Not enough arguments'),
+])
+def test_usage_errors_fail(run, argv, error):
+    code, [outcome] = run(*argv, '--json')
+
+    assert code == 1
+    assert outcome['ok'] is False
+    assert error in outcome['error']
+
+
+def test_project_is_picked_by_name_or_id(run, business_id):
+    code, [by_name] = run('mcp_config_string', '--project', 'Project', '--json')
+    assert code == 0
+    assert by_name['ok'] is True
+
+    code, [by_id] = run('mcp_config_string', '--project', business_id, '--json')
+    assert code == 0
+    assert by_id['result'] == by_name['result']
+
+
+def test_unknown_project_fails(run, business_id):
+    code, [outcome] = run('mcp_config_string', '--project', 'Nope', '--json')
+
+    assert code == 1
+    assert 'Could not find a project with ID or name "Nope"' in outcome['error']
+
+
+def test_answer(run, business_id, state):
+    code, [outcome] = run('bulk_delete_projects', 'Project', '--answer', 'y', '--json')
+
+    assert code == 0
+    assert [row['Status'] for row in outcome['result']['projects']] == ['deleted']
+
+
+def test_prompt_without_an_answer_fails(run, business_id, state):
+    code, [outcome] = run('bulk_delete_projects', 'Project', '--json')
+
+    assert code == 1
+    assert outcome['error'].startswith('No answer given for prompt')
+    assert len(state.businesses) == 1
+
+
+@pytest.mark.parametrize('name, content', [('answers.txt', 'y\n'), ('answers.json', '["y"]')])
+def test_answers_file(run, business_id, tmp_path, name, content):
+    answers = tmp_path / name
+    answers.write_text(content)
+
+    code, [outcome] = run('bulk_delete_projects', 'Project', '--answers', str(answers), '--json')
+
+    assert code == 0
+    assert outcome['ok'] is True
+
+
+def test_script_stops_at_the_first_failure(run, tmp_path, state):
+    script = tmp_path / 'commands.txt'
+    script.write_text('# Projects\ncreate_project First\ncreate_project\ncreate_project Third\n')
+
+    code, outcomes = run('--script', str(script), '--json')
+
+    assert code == 1
+    assert [outcome['ok'] for outcome in outcomes] == [True, False]
+    assert [biz['name'] for biz in state.businesses.values()] == ['First']
+
+
+def test_script_keep_going(run, tmp_path, state):
+    script = tmp_path / 'commands.txt'
+    script.write_text('create_project First\ncreate_project\ncreate_project Third\n')
+
+    code, outcomes = run('--script', str(script), '--keep-going', '--json')
+
+    assert code == 1
+    assert [outcome['ok'] for outcome in outcomes] == [True, False, True]
+    assert [biz['name'] for biz in state.businesses.values()] == ['First', 'Third']
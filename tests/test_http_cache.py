@@ -0,0 +1,113 @@
+from cli.api_client import HonulabsAPIClient
+from cli.settings import Settings
+from tests.conftest import TOKEN
+
+
+def test_not_modified_is_answered_from_the_cache(api_client, state):
+    api_client.create_business('Project')
+    first = api_client.list_businesses()
+    second = api_client.list_businesses()
+
+    assert state.not_modified == 1
+    assert second == first
+
+
+def test_cache_is_shared_between_clients(api_client, state):
+    api_client.create_business('Project')
+    api_client.list_businesses()
+
+    assert [biz.name for biz in HonulabsAPIClient(TOKEN).list_businesses()] == ['Project']
+    assert state.not_modified == 1
+
+
+def test_create_business_invalidates_the_list(api_client, state):
+    api_client.create_business('First')
+    api_client.list_businesses()
+    api_client.create_business('Second')
+
+    assert [biz.name for biz in api_client.list_businesses()] == ['First', 'Second']
+    assert state.not_modified == 0
+
+
+def test_delete_business_invalidates_the_list_and_its_jobs(api_client, state, clock):
+    business = api_client.create_business('Project')
+    state.submit(business.business_id, 'deploy_page')
+    api_client.list_businesses()
+    api_client.get_jobs(business.business_id)
+
+    api_client.delete_business(business.business_id)
+    jobs = api_client.get_jobs(business.business_id)
+
+    assert [job.job_type for job in jobs] == ['deploy_page', 'delete_business']
+    assert state.not_modified == 0
+    clock.sleep(10)
+    assert api_client.list_businesses() == []
+
+
+def test_each_page_is_cached_under_its_cursor(api_client, state, monkeypatch):
+    monkeypatch.setattr(Settings, 'JOBS_PAGE_SIZE', 2)
+    business = api_client.create_business('Project')
+    submitted = [state.submit(business.business_id, 'deploy_page').job_id for _ in range(5)]
+
+    first = [job.job_id for job in api_client.iter_jobs(business.business_id)]
+    second = [job.job_id for job in api_client.iter_jobs(business.business_id)]
+
+    assert first == second == submitted
+    # All 3 pages revalidated, none answered with another page's body
+    assert state.not_modified == 3
+
+
+def test_job_polls_are_not_cached(api_client, state, home):
+    business = api_client.create_business('Project')
+    job = state.submit(business.business_id, 'deploy_page')
+    api_client.poll_job(business.business_id, job.job_id)
+    api_client.poll_job(business.business_id, job.job_id)
+
+    assert state.not_modified == 0
+    assert not (home / 'artifacts').exists()
+
+
+def test_unwritable_cache_falls_back_to_the_api(home, app, state, monkeypatch):
+    (home / 'not_a_directory').write_text('')
+    monkeypatch.setattr(Settings, 'HTTP_CACHE_DIR', home / 'not_a_directory' / 'http_cache')
+    monkeypatch.setattr(Settings, 'ARTIFACT_STORE_DIR', home / 'not_a_directory' / 'artifacts')
+    api_client = HonulabsAPIClient(TOKEN)
+    business = api_client.create_business('Project')
+    job = state.submit(business.business_id, 'deploy_page')
+
+    assert [biz.name for biz in api_client.list_businesses()] == ['Project']
+    assert [job.job_id for job in api_client.get_jobs(business.business_id)] == [job.job_id]
+    assert api_client.get_job(business.business_id, job.job_id).job_id == job.job_id
+
+
+def test_cache_is_capped_dropping_the_least_recently_used_pages(api_client, state, home, monkeypatch):
+    monkeypatch.setattr(Settings, 'JOBS_PAGE_SIZE', 2)
+    business = api_client.create_business('Project')
+    for _ in range(6):
+        state.submit(business.business_id, 'deploy_page')
+    list(api_client.iter_jobs(business.business_id))
+    page_size = max(path.stat().st_size for path in api_client.cache._bodies())
+
+    # Room for a little over two pages: listing again keeps the last ones read
+    api_client.cache.max_bytes = 2 * page_size + page_size // 2
+    api_client.list_businesses()
+
+    bodies = list(api_client.cache._bodies())
+    assert len(bodies) < 4
+    assert sum(path.stat().st_size for path in bodies) <= api_client.cache.max_bytes
+    assert len(list(api_client.cache.directory.glob('*/*.json'))) == len(bodies)
+    assert api_client.cache.get('/v1/businesses') is not None
+    assert [job.job_type for job in api_client.iter_jobs(business.business_id)] == ['deploy_page'] * 6
+
+
+def test_writes_below_the_cap_do_not_scan_the_cache(api_client, state, monkeypatch):
+    business = api_client.create_business('Project')
+    scans = []
+    bodies = api_client.cache._bodies
+    monkeypatch.setattr(api_client.cache, '_bodies', lambda: scans.append(1) or bodies())
+
+    for _ in range(3):
+        state.submit(business.business_id, 'deploy_page')
+        api_client.get_jobs(business.business_id)
+
+    assert len(scans) == 1
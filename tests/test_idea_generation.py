@@ -0,0 +1,38 @@
+from cli.utils.handle_idea_generation import IdeaGeneration
+from cli.utils.pipeline_state import PipelineState
+
+SEGMENT = {'geography': 'Europe', 'segment': {'core_market': 'Retail', 'sub_category': 'Grocery', 'niche': 'Bakeries'}}
+
+
+def test_enter_uses_the_prefetched_batch(state, business_id, answers, capsys):
+    state.job_duration = 0
+    answers(['q'])
+    generation = IdeaGeneration(business_id, 'double_grid', prefetch=False)
+    # As left by showing the previous batch with prefetching on
+    job = state.submit(business_id, IdeaGeneration.IDEAS_JOB_TYPE)
+    generation.state.save(IdeaGeneration.IDEAS_JOB_TYPE, job.job_id, SEGMENT)
+    generation._prefetched = job.job_id
+
+    generation._idea_generation(SEGMENT)
+
+    out = capsys.readouterr().out
+    assert f'Using the next batch of ideas, started while you were choosing ({job.job_id}).' in out
+    assert 'previous run' not in out
+    assert [job.job_id for job in state.jobs.values()] == [job.job_id]
+    assert generation._prefetched is None
+    assert PipelineState('idea', business_id).saved(IdeaGeneration.IDEAS_JOB_TYPE) is None
+
+
+def test_a_forgotten_prefetched_batch_is_not_used(state, business_id, answers, capsys):
+    state.job_duration = 0
+    answers(['q'])
+    generation = IdeaGeneration(business_id, 'double_grid', prefetch=False)
+    job = state.submit(business_id, IdeaGeneration.IDEAS_JOB_TYPE)
+    generation._prefetched = job.job_id
+
+    generation._idea_generation(SEGMENT)
+
+    out = capsys.readouterr().out
+    assert 'Using the next batch' not in out
+    assert len(state.jobs) == 2
+    assert generation._prefetched is None
@@ -0,0 +1,66 @@
+from cli.utils.idea_sweep import IdeaSweep
+from cli.utils.job_manager import JobManager
+
+
+def interrupt_after(count: int):
+    # await_many that yields the first `count` jobs, read once they have finished, and is then interrupted
+    def await_many(jobs, max_concurrency=None):
+        from cli.api_client import HonulabsAPIClient
+        from tests.conftest import TOKEN
+
+        api_client = HonulabsAPIClient(TOKEN)
+        for job in list(jobs)[:count]:
+            yield api_client.get_job(job.business.business_id, job.job_id)
+        raise KeyboardInterrupt
+    return staticmethod(await_many)
+
+
+def test_sweep(api_client, state, business_id):
+    state.job_duration = 0
+    sweep = IdeaSweep(api_client, business_id)
+
+    ideas = sweep.run(['Retail', 'Health'], ['Europe'], 2)
+
+    assert sweep.failures == [] and sweep.running == []
+    assert len({(idea['Industry'], idea['Segment']) for idea in ideas}) == 4
+    assert [idea['Rank'] for idea in ideas] == list(range(1, len(ideas) + 1))
+    assert [idea['Feasibility'] for idea in ideas] == sorted(idea['Feasibility'] for idea in ideas)
+
+
+def test_ctrl_c_during_segmentation_keeps_the_started_jobs(api_client, state, business_id, monkeypatch, capsys):
+    state.job_duration = 0
+    monkeypatch.setattr(JobManager, 'await_many', interrupt_after(1))
+    sweep = IdeaSweep(api_client, business_id)
+
+    assert sweep.run(['Retail', 'Health'], ['Europe'], 2) == []
+
+    submitted = {job.job_id: job.job_type for job in state.jobs.values()}
+    assert sorted(submitted.values()) == ['idea_generation', 'idea_generation', 'industry_idea_segmentation',
+                                          'industry_idea_segmentation']
+    running = {row['ID']: row for row in sweep.running}
+    # Only the segmentation seen finishing is not reported as running
+    assert len(running) == 3
+    assert {row['Type'] for row in running.values()} == {'idea_generation', 'industry_idea_segmentation'}
+    assert [row['Industry'] for row in running.values() if row['Type'] == 'industry_idea_segmentation'] == ['Health']
+    assert all(row['Segment'] for row in running.values() if row['Type'] == 'idea_generation')
+    assert 'Skipping wait for job completion' in capsys.readouterr().out
+
+
+def test_ctrl_c_while_generating_ideas_reports_the_finished_ones(api_client, state, business_id, monkeypatch):
+    state.job_duration = 0
+    real = JobManager.await_many
+    calls = []
+
+    def await_many(jobs, max_concurrency=None):
+        calls.append(1)
+        if len(calls) == 1:
+            return real(jobs, max_concurrency=max_concurrency)
+        return interrupt_after(1).__func__(jobs, max_concurrency)
+
+    monkeypatch.setattr(JobManager, 'await_many', staticmethod(await_many))
+    sweep = IdeaSweep(api_client, business_id)
+
+    ideas = sweep.run(['Retail'], ['Europe'], 3)
+
+    assert len({idea['Segment'] for idea in ideas}) == 1
+    assert [row['Type'] for row in sweep.running] == ['idea_generation', 'idea_generation']
@@ -0,0 +1,157 @@
+import json
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from cli.api_client import HonulabsAPIClient, HonulabsStreamUnavailable
+from cli.schema import HonulabsJob, JobStatus
+from cli.settings import Settings
+from cli.utils.job_manager import JobManager
+
+EVENTS_PATH = '/v1/businesses/{business_id}/jobs/{job_id}/events'
+
+
+@pytest.fixture
+def events(home, monkeypatch):
+    monkeypatch.setattr(Settings, 'JOB_EVENTS', True)
+
+
+def ticking(clock, step: float):
+    # A clock that moves on by `step` every time it is read, so a streamed job advances between events
+    def tick() -> float:
+        clock.now += step
+        return clock.now
+    return tick
+
+
+def submit(api_client, state, clock, step: float | None = None) -> HonulabsJob:
+    # A job taking 10 seconds, which with `step` moves on every time the stand-in reads it
+    business = api_client.create_business('Project')
+    job = state.submit(business.business_id, 'deploy_page')
+    submitted = HonulabsJob.model_validate(job.to_dict())
+    if step is not None:
+        job.clock = ticking(clock, step)
+    return submitted
+
+
+def serve_events(app, endpoint):
+    # Answer the job event stream route with `endpoint` instead, counting the requests made to it
+    calls = []
+
+    def counted(business_id: str, job_id: str):
+        calls.append(job_id)
+        return endpoint(business_id, job_id)
+
+    app.router.routes = [route for route in app.router.routes if getattr(route, 'path', None) != EVENTS_PATH]
+    app.get(EVENTS_PATH)(counted)
+    return calls
+
+
+def missing(business_id: str, job_id: str):
+    raise HTTPException(404, 'Not Found')
+
+
+def json_instead(state):
+    def endpoint(business_id: str, job_id: str):
+        return state.job(business_id, job_id).to_dict()
+    return endpoint
+
+
+def test_client_streams_the_job_until_it_has_finished(api_client, state, clock):
+    job = submit(api_client, state, clock, step=2.5)
+
+    jobs = list(api_client.stream_job_events(job.business.business_id, job.job_id))
+
+    assert [(job.status, job.message) for job in jobs] == [
+        (JobStatus.IN_PROGRESS, 'Researching'),
+        (JobStatus.IN_PROGRESS, 'Drafting'),
+        (JobStatus.IN_PROGRESS, 'Reviewing'),
+        (JobStatus.SUCCESS, None),
+    ]
+    # The finished job is stored, so reading it again doesn't ask the API
+    assert api_client.artifacts.get(job.job_id) is not None
+
+
+@pytest.mark.parametrize('endpoint', ['missing', 'json_instead'])
+def test_client_rejects_answers_that_are_not_event_streams(api_client, app, state, clock, endpoint):
+    job = submit(api_client, state, clock)
+    serve_events(app, missing if endpoint == 'missing' else json_instead(state))
+
+    with pytest.raises(HonulabsStreamUnavailable):
+        list(api_client.stream_job_events(job.business.business_id, job.job_id))
+
+
+def test_wait_follows_the_event_stream_without_polling(api_client, state, clock, events):
+    job = submit(api_client, state, clock, step=2.5)
+    manager = JobManager(job, sleep=clock.sleep, clock=clock)
+
+    finished = manager.await_job_completion()
+
+    assert finished.status == JobStatus.SUCCESS
+    assert manager.events == 4
+    assert manager.polls == 0
+    assert clock.sleeps == []
+    assert not JobManager.events_unavailable
+
+
+@pytest.mark.parametrize('endpoint', ['missing', 'json_instead'])
+def test_rejected_event_stream_falls_back_to_polling_from_then_on(api_client, app, state, clock, events, endpoint):
+    calls = serve_events(app, missing if endpoint == 'missing' else json_instead(state))
+    manager = JobManager(submit(api_client, state, clock), sleep=clock.sleep, clock=clock)
+
+    finished = manager.await_job_completion()
+
+    assert finished.status == JobStatus.SUCCESS
+    assert manager.events == 0
+    assert manager.polls > 0
+    assert JobManager.events_unavailable
+    assert len(calls) == 1
+
+    # Later waits don't ask for the stream again
+    JobManager(submit(api_client, state, clock), sleep=clock.sleep, clock=clock).await_job_completion()
+    assert len(calls) == 1
+
+
+def ended_after_one_event(state):
+    def endpoint(business_id: str, job_id: str):
+        data = json.dumps(state.job(business_id, job_id).to_dict())
+        return StreamingResponse(iter([f'event: job\ndata: {data}\n\n']), media_type='text/event-stream')
+    return endpoint
+
+
+def malformed(business_id: str, job_id: str):
+    return StreamingResponse(iter(['event: job\ndata: {"job_id": \n\n']), media_type='text/event-stream')
+
+
+@pytest.mark.parametrize('endpoint, events_read', [('ended', 1), ('malformed', 0)])
+def test_event_stream_ended_mid_job_falls_back_to_polling(
+        api_client, app, state, clock, events, endpoint, events_read,
+):
+    serve_events(app, ended_after_one_event(state) if endpoint == 'ended' else malformed)
+    manager = JobManager(submit(api_client, state, clock), sleep=clock.sleep, clock=clock)
+
+    finished = manager.await_job_completion()
+
+    assert finished.status == JobStatus.SUCCESS
+    assert manager.events == events_read
+    assert manager.polls > 0
+    # The server does stream events, so later waits still follow them
+    assert not JobManager.events_unavailable
+
+
+def test_dropped_connection_falls_back_to_polling(api_client, state, clock, events, monkeypatch):
+    def dropped(self, business_id: str, job_id: str):
+        yield self.poll_job(business_id, job_id)[0]
+        raise httpx.RemoteProtocolError('peer closed connection without sending complete message body')
+
+    monkeypatch.setattr(HonulabsAPIClient, 'stream_job_events', dropped)
+    manager = JobManager(submit(api_client, state, clock), sleep=clock.sleep, clock=clock)
+
+    finished = manager.await_job_completion()
+
+    assert finished.status == JobStatus.SUCCESS
+    assert manager.events == 1
+    assert manager.polls > 0
+    assert not JobManager.events_unavailable
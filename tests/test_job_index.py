@@ -0,0 +1,190 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from cli.cmd import job_costs
+from cli.utils.job_index import JobIndex, parse_filters
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = JobIndex(tmp_path / 'jobs.sqlite3')
+    yield index
+    index.close()
+
+
+@pytest.fixture
+def listed(api_client, monkeypatch) -> list:
+    # The `after` of every job listing, in order
+    afters = []
+    iter_jobs = api_client.iter_jobs
+
+    def spy(business_id, *args, after=None, **kwargs):
+        afters.append(after)
+        return iter_jobs(business_id, *args, after=after, **kwargs)
+
+    monkeypatch.setattr(api_client, 'iter_jobs', spy)
+    return afters
+
+
+def submit(state, business_id: str, job_type: str, started_at: str | None = None):
+    job = state.submit(business_id, job_type)
+    if started_at is not None:
+        job.started_at = datetime.fromisoformat(started_at).replace(tzinfo=timezone.utc)
+    return job
+
+
+def test_sync_lists_only_jobs_after_the_watermark(index, api_client, state, business_id, listed):
+    state.job_duration = 0
+    first = submit(state, business_id, 'deploy_page')
+    second = submit(state, business_id, 'add_user_to_repo')
+    counts = index.sync(api_client)
+    assert (counts['new'], counts['updated']) == (2, 0)
+
+    third = submit(state, business_id, 'deploy_page')
+    counts = index.sync(api_client)
+
+    assert listed == [None, second.job_id]
+    assert (counts['new'], counts['updated']) == (1, 0)
+    assert {job['ID'] for job in index.query({})} == {first.job_id, second.job_id, third.job_id}
+
+
+def test_unfinished_jobs_are_listed_again(index, api_client, state, business_id, listed, clock):
+    state.job_duration = 0
+    finished = submit(state, business_id, 'deploy_page')
+    state.job_duration = 10
+    running = submit(state, business_id, 'add_user_to_repo')
+    index.sync(api_client)
+    assert index.totals({'status': 'success'})[0] == 1
+
+    clock.sleep(10)
+    counts = index.sync(api_client)
+
+    assert listed == [None, finished.job_id]
+    assert (counts['new'], counts['updated']) == (0, 1)
+    assert running.job_id in {job['ID'] for job in index.query({'status': 'success'})}
+    assert index.totals({'status': 'success'})[0] == 2
+
+
+def test_sync_lists_from_the_start_when_the_watermark_job_is_gone(index, api_client, state, business_id, listed):
+    state.job_duration = 0
+    gone = submit(state, business_id, 'deploy_page')
+    index.sync(api_client)
+    del state.jobs[gone.job_id]
+    new = submit(state, business_id, 'add_user_to_repo')
+
+    counts = index.sync(api_client)
+
+    assert listed == [None, gone.job_id, None]
+    assert counts['failed'] == []
+    assert counts['new'] == 1
+    assert new.job_id in {job['ID'] for job in index.query({})}
+
+
+def test_jobs_of_deleted_projects_are_removed(index, api_client, state, business_id):
+    state.job_duration = 0
+    other = api_client.create_business('Other').business_id
+    submit(state, business_id, 'deploy_page')
+    submit(state, other, 'deploy_page')
+    index.sync(api_client)
+    assert index.totals({})[0] == 2
+
+    del state.businesses[other]
+    counts = index.sync(api_client)
+
+    assert counts['removed'] == 1
+    assert index.totals({})[0] == 1
+    assert [row['Project'] for row in index.costs('project', {})] == ['Project']
+
+
+@pytest.fixture
+def indexed(index, api_client, state, business_id):
+    # Jobs of two projects across two months, one of them still running
+    state.job_duration = 0
+    other = api_client.create_business('Other').business_id
+    submit(state, business_id, 'deploy_page', '2025-06-30T23:00:00')
+    submit(state, business_id, 'add_user_to_repo', '2025-07-01T10:00:00')
+    submit(state, other, 'deploy_page', '2025-07-15T10:00:00')
+    state.job_duration = 10
+    submit(state, other, 'deploy_page', '2025-07-20T10:00:00')
+    index.sync(api_client)
+    return index
+
+
+@pytest.mark.parametrize('args, expected', [
+    ([], 4),
+    (['type=deploy_page'], 3),
+    (['status=success'], 3),
+    (['status=pending'], 1),
+    (['project=Other'], 2),
+    (['since=2025-07-01'], 3),
+    (['until=2025-07-01'], 1),
+    (['since=2025-07-01', 'until=2025-07-16'], 2),
+    (['month=2025-06'], 1),
+    (['month=2025-07', 'type=deploy_page'], 2),
+])
+def test_filters(indexed, args, expected):
+    filters = parse_filters(args)
+
+    assert indexed.totals(filters)[0] == expected
+    assert len(indexed.query(filters)) == expected
+
+
+def test_project_filter_takes_an_id(indexed, business_id):
+    assert indexed.totals(parse_filters([f'project={business_id}']))[0] == 2
+
+
+def test_query_limit_keeps_the_most_recent(indexed):
+    assert [job['Started At'][:10] for job in indexed.query({}, limit=2)] == ['2025-07-20', '2025-07-15']
+
+
+@pytest.mark.parametrize('group_by, groups', [
+    ('type', ['add_user_to_repo', 'deploy_page']),
+    ('status', ['pending', 'success']),
+    ('project', ['Other', 'Project']),
+    ('month', ['2025-06', '2025-07']),
+    ('day', ['2025-06-30', '2025-07-01', '2025-07-15', '2025-07-20']),
+])
+def test_groupings(indexed, group_by, groups):
+    rows = indexed.costs(group_by, {})
+
+    assert [row[group_by.capitalize()] for row in rows] == groups
+    assert sum(row['Jobs'] for row in rows) == 4
+    assert round(sum(row['Cost'] for row in rows), 2) == indexed.totals({})[1]
+
+
+def test_cost_of_finished_jobs(indexed):
+    # The stand-in charges 0.01 per character of the job type, once a job has finished
+    rows = {row['Type']: row for row in indexed.costs('type', {})}
+
+    assert rows['deploy_page']['Cost'] == 0.22
+    assert rows['add_user_to_repo']['Cost'] == 0.16
+
+
+def test_projects_with_the_same_name_are_kept_apart(index, api_client, state, business_id):
+    state.job_duration = 0
+    twin = api_client.create_business('Project').business_id
+    submit(state, business_id, 'deploy_page')
+    submit(state, twin, 'deploy_page')
+    submit(state, twin, 'deploy_page')
+    index.sync(api_client)
+
+    rows = index.costs('project', {})
+
+    assert sorted((row['ID'], row['Jobs']) for row in rows) == sorted([(business_id, 1), (twin, 2)])
+    assert [row['Project'] for row in rows] == ['Project', 'Project']
+
+
+@pytest.mark.parametrize('arg', ['month=2025-13', 'month=July', 'since=bad', 'until=2025-02-30', 'status=done',
+                                 'colour=red', 'type='])
+def test_invalid_filters(arg):
+    with pytest.raises(ValueError, match='Invalid filter'):
+        parse_filters([arg])
+
+
+def test_job_costs_checks_the_grouping_before_syncing(state, capsys):
+    requests = state.requests
+    job_costs('nonsense')
+
+    assert 'Cannot group by "nonsense"' in capsys.readouterr().out
+    assert state.requests == requests
@@ -0,0 +1,201 @@
+import asyncio
+import inspect
+import json
+
+import httpx
+import pytest
+
+from cli import api_client as api_client_module, async_api_client as async_api_client_module
+from cli.api_client import HonulabsAPIClient, JobPages
+from cli.async_api_client import AsyncHonulabsAPIClient
+from cli.schema import JobStatus
+from cli.session import set_session
+from cli.settings import Settings
+from cli.utils.local_files import digest
+from tests.conftest import TOKEN
+
+
+@pytest.fixture
+def business_id(api_client, state, monkeypatch, clock) -> str:
+    # 7 jobs, alternating deploy_page and idea_generation, of which the last 2 are still running
+    monkeypatch.setattr(Settings, 'JOBS_PAGE_SIZE', 3)
+    business = api_client.create_business('Project')
+    for num in range(5):
+        state.submit(business.business_id, 'deploy_page' if num % 2 == 0 else 'idea_generation')
+    clock.sleep(10)
+    state.submit(business.business_id, 'idea_generation')
+    state.submit(business.business_id, 'deploy_page')
+    return business.business_id
+
+
+class IgnoresLimit:
+    """A server sending every job in one response whatever the limit, in chunks of 100 bytes, counting those sent."""
+
+    def __init__(self, jobs):
+        self.body = json.dumps([job.model_dump(mode='json') for job in jobs]).encode()
+        self.chunks = range(0, len(self.body), 100)
+        self.sent = 0
+
+    def _chunks(self):
+        for start in self.chunks:
+            self.sent += 1
+            yield self.body[start:start + 100]
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=self._chunks())
+
+    async def async_handler(self, request: httpx.Request) -> httpx.Response:
+        async def chunks():
+            for chunk in self._chunks():
+                yield chunk
+        return httpx.Response(200, content=chunks())
+
+
+@pytest.fixture
+def ignores_limit(api_client, business_id, monkeypatch) -> IgnoresLimit:
+    # Its body is longer than a page may be, so it can only be decoded a job at a time
+    server = IgnoresLimit(api_client.get_jobs(business_id))
+    monkeypatch.setattr(api_client_module, 'MAX_PAGE_BYTES', 1000)
+    monkeypatch.setattr(async_api_client_module, 'MAX_PAGE_BYTES', 1000)
+    set_session(httpx.Client(transport=httpx.MockTransport(server.handler), base_url='http://honulabs.test'))
+    return server
+
+
+def requests_made(state, func):
+    before = state.requests
+    result = func()
+    return result, state.requests - before
+
+
+def test_iter_jobs_reads_every_page_in_order(api_client, state, business_id):
+    jobs, requests = requests_made(state, lambda: list(api_client.iter_jobs(business_id)))
+
+    assert [job.job_id for job in jobs] == list(state.jobs)
+    assert requests == 3
+
+
+def test_iter_job_pages_yields_pages(api_client, state, business_id):
+    pages = list(api_client.iter_job_pages(business_id))
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [job.job_id for page in pages for job in page] == list(state.jobs)
+
+
+def test_iter_jobs_after(api_client, state, business_id):
+    ids = list(state.jobs)
+
+    assert [job.job_id for job in api_client.iter_jobs(business_id, after=ids[3])] == ids[4:]
+
+
+def test_iter_job_pages_after(api_client, state, business_id):
+    ids = list(state.jobs)
+    pages = list(api_client.iter_job_pages(business_id, after=ids[1]))
+
+    assert [[job.job_id for job in page] for page in pages] == [ids[2:5], ids[5:]]
+
+
+@pytest.mark.parametrize('method', ['get_jobs', 'iter_jobs', 'iter_job_pages'])
+def test_sync_and_async_listings_take_the_same_parameters(method):
+    def parameters(client) -> list:
+        return [(p.name, p.default) for p in inspect.signature(getattr(client, method)).parameters.values()]
+
+    assert parameters(HonulabsAPIClient) == parameters(AsyncHonulabsAPIClient)
+
+
+def test_pages_filter_and_limit_for_servers_that_ignore_them(api_client, business_id):
+    # As if the server had sent every job in one page, with a cursor to more
+    jobs = api_client.get_jobs(business_id)
+    pages = JobPages(job_type='deploy_page', limit=3)
+
+    taken = list(pages.take(jobs, 'cursor'))
+
+    assert [job.job_id for job in taken] == [job.job_id for job in jobs if job.job_type == 'deploy_page'][:3]
+    assert pages.query() is None
+
+
+def test_pages_follow_the_cursor_until_the_last_page(api_client, business_id):
+    jobs = api_client.get_jobs(business_id)
+    pages = JobPages(job_status=JobStatus.SUCCESS, after='first')
+    assert pages.query()['cursor'] == 'first'
+    assert pages.query()['status'] == 'success'
+
+    list(pages.take(jobs[:3], jobs[2].job_id))
+    assert pages.query()['cursor'] == jobs[2].job_id
+
+    list(pages.take(jobs[3:], None))
+    assert pages.query() is None
+
+
+def test_limit_reads_only_the_pages_needed(api_client, state, business_id):
+    jobs, requests = requests_made(state, lambda: api_client.get_jobs(business_id, limit=4))
+
+    assert [job.job_id for job in jobs] == list(state.jobs)[:4]
+    assert requests == 2
+
+
+def test_limit_smaller_than_a_page(api_client, state, business_id):
+    jobs, requests = requests_made(state, lambda: api_client.get_jobs(business_id, limit=1))
+
+    assert [job.job_id for job in jobs] == list(state.jobs)[:1]
+    assert requests == 1
+
+
+def test_filters_are_applied_by_the_server(api_client, state, business_id):
+    jobs, requests = requests_made(
+        state, lambda: api_client.get_jobs(business_id, job_type='deploy_page', job_status=JobStatus.SUCCESS),
+    )
+
+    assert [job.job_type for job in jobs] == ['deploy_page'] * 3
+    assert all(job.status == JobStatus.SUCCESS for job in jobs)
+    # 3 matching jobs fit a page, which the whole unfiltered list does not
+    assert requests == 1
+
+
+def test_status_filter(api_client, business_id):
+    running = api_client.get_jobs(business_id, job_status=JobStatus.PENDING)
+
+    assert [job.job_type for job in running] == ['idea_generation', 'deploy_page']
+
+
+def test_results_can_be_left_out(api_client, business_id):
+    assert all(job.result is None for job in api_client.get_jobs(business_id, include_result=False))
+    assert any(job.result is not None for job in api_client.get_jobs(business_id))
+
+
+def test_body_longer_than_a_page_is_split_into_pages(api_client, state, business_id, ignores_limit):
+    pages = list(api_client.iter_job_pages(business_id))
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [job.job_id for page in pages for job in page] == list(state.jobs)
+
+
+def test_body_longer_than_a_page_is_read_only_as_far_as_needed(api_client, state, business_id, ignores_limit):
+    jobs = api_client.get_jobs(business_id, limit=2)
+
+    assert [job.job_id for job in jobs] == list(state.jobs)[:2]
+    assert ignores_limit.sent < len(ignores_limit.chunks)
+
+
+def test_body_longer_than_a_page_is_not_cached(api_client, state, business_id, monkeypatch):
+    monkeypatch.setattr(api_client_module, 'MAX_PAGE_BYTES', 100)
+    api_client.get_jobs(business_id)
+    assert not list((api_client.cache.directory / digest(f'/v1/businesses/{business_id}/jobs')).glob('*.body'))
+
+    assert [job.job_id for job in api_client.get_jobs(business_id)] == list(state.jobs)
+    assert state.not_modified == 0
+
+
+def test_async_body_longer_than_a_page_is_decoded_a_job_at_a_time(state, business_id, ignores_limit):
+    async def main():
+        session = httpx.AsyncClient(
+            transport=httpx.MockTransport(ignores_limit.async_handler), base_url='http://honulabs.test',
+        )
+        async with AsyncHonulabsAPIClient(TOKEN, session) as client:
+            pages = [page async for page in client.iter_job_pages(business_id)]
+            assert [len(page) for page in pages] == [3, 3, 1]
+            assert [job.job_id for page in pages for job in page] == list(state.jobs)
+
+            ignores_limit.sent = 0
+            assert len(await client.get_jobs(business_id, limit=2)) == 2
+            assert ignores_limit.sent < len(ignores_limit.chunks)
+    asyncio.run(main())
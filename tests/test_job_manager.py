@@ -0,0 +1,37 @@
+from cli.schema import HonulabsJob, JobStatus
+from cli.utils.job_manager import JobManager
+from cli.utils.polling import BackoffPollStrategy, FixedPollStrategy
+
+
+def submit(api_client, state, job_type='deploy_page') -> HonulabsJob:
+    business = api_client.create_business('Project')
+    return HonulabsJob.model_validate(state.submit(business.business_id, job_type).to_dict())
+
+
+def test_wait_follows_the_poll_strategy(api_client, state, clock):
+    job = submit(api_client, state)
+    strategy = BackoffPollStrategy(initial_interval=0.5, fast_attempts=4, factor=2, max_interval=4, jitter=0)
+    manager = JobManager(job, strategy, sleep=clock.sleep, clock=clock)
+
+    finished = manager.await_job_completion()
+
+    assert finished.status == JobStatus.SUCCESS
+    assert clock.sleeps == [strategy.delay(attempt) for attempt in range(len(clock.sleeps))]
+    # 10 seconds of job at 0.5 x 4, then 1, 2, 4, 4
+    assert clock.sleeps[:8] == [0.5, 0.5, 0.5, 0.5, 1, 2, 4, 4]
+    assert manager.polls == len(clock.sleeps)
+
+
+def test_wait_many_polls_each_job_on_its_own_schedule(api_client, state, clock):
+    first = submit(api_client, state)
+    clock.sleep(5)
+    second = submit(api_client, state)
+    clock.sleeps.clear()
+
+    finished = list(JobManager.await_many(
+        [first, second], poll_strategy=FixedPollStrategy(1), sleep=clock.sleep, clock=clock,
+    ))
+
+    assert [job.job_id for job in finished] == [first.job_id, second.job_id]
+    assert all(job.status == JobStatus.SUCCESS for job in finished)
+    assert clock.now == 15
@@ -0,0 +1,37 @@
+import json
+import random
+
+import pytest
+
+from cli.utils.json_stream import iter_json_array
+
+
+def chunked(text: str, seed: int) -> list[bytes]:
+    data = text.encode()
+    rng = random.Random(seed)
+    cuts = sorted(rng.sample(range(1, len(data)), min(len(data) - 1, 20)))
+    return [data[start:end] for start, end in zip([0, *cuts], [*cuts, len(data)])]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_elements_match_json_loads_however_the_body_is_chunked(seed):
+    elements = [
+        {'id': 1, 'text': 'a, "quoted" [bracket] {brace}', 'path': 'C:\\\\dir\\\\'},
+        [1, [2, [3]], {'a': []}],
+        'ends with a backslash \\\\',
+        None,
+        3.5,
+    ]
+    text = ' [ ' + ', '.join(json.dumps(element) for element in elements) + ' ] '
+
+    assert [json.loads(element) for element in iter_json_array(chunked(text, seed))] == elements
+
+
+def test_empty_array():
+    assert list(iter_json_array([b' [', b' ] '])) == []
+
+
+@pytest.mark.parametrize('text', ['{"a": 1}', '[1, , 2]', '[1, 2'])
+def test_malformed_arrays_are_rejected(text):
+    with pytest.raises(ValueError):
+        list(iter_json_array([text.encode()]))
@@ -0,0 +1,34 @@
+import io
+
+from cli.utils.bulk_projects import read_project_list
+from cli.utils.idea_sweep import read_grid_values
+from cli.utils.list_file import read_list_file
+
+
+def test_skips_blank_lines_and_comments(tmp_path):
+    path = tmp_path / 'list.txt'
+    path.write_text('# Projects\n  First  \n\nSecond Project\n   # indented comment\n')
+
+    assert read_list_file(str(path)) == ['First', 'Second Project']
+
+
+def test_dash_reads_stdin(monkeypatch):
+    monkeypatch.setattr('sys.stdin', io.StringIO('one\n\ntwo\n'))
+
+    assert read_list_file('-') == ['one', 'two']
+
+
+def test_home_is_expanded(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    (tmp_path / 'list.txt').write_text('one\n')
+
+    assert read_list_file('~/list.txt') == ['one']
+
+
+def test_project_and_grid_arguments(tmp_path):
+    path = tmp_path / 'list.txt'
+    path.write_text('United Kingdom\n# skipped\nFrance\n')
+
+    assert read_project_list(['Alpha', f'@{path}']) == ['Alpha', 'United Kingdom', 'France']
+    assert read_grid_values(f'@{path}') == ['United Kingdom', 'France']
+    assert read_grid_values('Software, Healthcare,,') == ['Software', 'Healthcare']
@@ -0,0 +1,100 @@
+import json
+
+import httpx
+import pytest
+
+from cli.cmd import stats
+from cli.utils.metrics import LATENCY_BUCKETS_MS, EndpointMetrics, MeteredTransport, endpoint_name, request_metrics
+from cli.utils.output import capture_results
+
+
+@pytest.fixture
+def metrics():
+    request_metrics.reset()
+    yield request_metrics
+    request_metrics.reset()
+
+
+@pytest.fixture
+def session(metrics):
+    # Requests through the metered transport, answered without a server
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/fail':
+            raise httpx.ConnectTimeout('timed out', request=request)
+        status_code = 201 if request.method == 'POST' else 200
+        return httpx.Response(status_code, content=b'x' * 100)
+
+    with httpx.Client(transport=MeteredTransport(httpx.MockTransport(handler)), base_url='http://honulabs.test') as client:
+        yield client
+
+
+def test_endpoint_names_group_ids():
+    assert endpoint_name('GET', '/v1/businesses/0b9e6f8a-64d1-4a4c-9f43-1d2a6c2f5a11/jobs/42') == \
+        'GET /v1/businesses/{id}/jobs/{id}'
+    assert endpoint_name('GET', '/v1/businesses') == 'GET /v1/businesses'
+
+
+def test_latency_histogram():
+    endpoint = EndpointMetrics()
+    for ms in (5, 10, 11, 40, 60000):
+        endpoint.observe(ms, 200, 0, 0)
+
+    assert endpoint.histogram[:3] == [2, 1, 1]
+    assert endpoint.histogram[-1] == 1
+    assert sum(endpoint.histogram) == endpoint.calls == 5
+    assert endpoint.percentile_ms(0.5) == 25
+    assert endpoint.percentile_ms(0.95) is None
+    assert endpoint.to_dict()['latency_histogram_ms'][f'>{LATENCY_BUCKETS_MS[-1]}'] == 1
+    assert endpoint.max_ms == 60000
+
+
+def test_requests_are_counted_per_endpoint(session, metrics):
+    session.get('/v1/businesses/1234/jobs')
+    session.get('/v1/businesses/5678/jobs')
+    session.post('/v1/businesses', content=b'{"name": "Project"}')
+    with pytest.raises(httpx.ConnectTimeout):
+        session.get('/fail')
+
+    endpoints = metrics.to_dict()['endpoints']
+    jobs = endpoints['GET /v1/businesses/{id}/jobs']
+    assert jobs['calls'] == 2
+    assert jobs['status_codes'] == {'200': 2}
+    assert jobs['bytes_in'] == 200
+    created = endpoints['POST /v1/businesses']
+    assert created['status_codes'] == {'201': 1}
+    assert created['bytes_out'] == len(b'{"name": "Project"}')
+    failed = endpoints['GET /fail']
+    assert failed['errors'] == 1
+    assert failed['status_codes'] == {}
+
+
+def test_streamed_responses_are_measured_once_read(session, metrics):
+    with session.stream('GET', '/v1/businesses') as response:
+        assert b''.join(response.iter_bytes()) == b'x' * 100
+
+    assert metrics.to_dict()['endpoints']['GET /v1/businesses']['bytes_in'] == 100
+
+
+def test_stats_json(session, capsys):
+    session.get('/v1/businesses')
+    with capture_results() as results:
+        stats('json')
+
+    printed = json.loads(capsys.readouterr().out)
+    assert printed['endpoints']['GET /v1/businesses']['calls'] == 1
+    assert results['stats'] == printed
+
+
+def test_stats_table_and_reset(session, capsys):
+    stats()
+    assert 'No API requests made yet.' in capsys.readouterr().out
+
+    session.get('/v1/businesses')
+    stats()
+    out = capsys.readouterr().out
+    assert 'GET /v1/businesses' in out
+    assert 'p95 ms' in out
+
+    stats('reset')
+    stats()
+    assert 'No API requests made yet.' in capsys.readouterr().out
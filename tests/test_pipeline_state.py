@@ -0,0 +1,72 @@
+import pytest
+
+from cli.utils.handle_business_generation import BusinessPlanGeneration
+from cli.utils.pipeline_state import PipelineState
+
+STEP = 'business_plan_requirements'
+
+
+@pytest.fixture
+def saved(state, business_id) -> str:
+    # A requirements job left running for an earlier idea
+    job = state.submit(business_id, STEP)
+    PipelineState('business_plan', business_id).save(STEP, job.job_id, {'idea': 'OLD IDEA A'})
+    return job.job_id
+
+
+def test_resume_picks_up_a_saved_job(api_client, business_id, saved):
+    job, inputs = PipelineState('business_plan', business_id).resume(api_client, business_id, STEP)
+
+    assert job.job_id == saved
+    assert inputs == {'idea': 'OLD IDEA A'}
+
+
+def test_resume_forgets_jobs_for_other_inputs(api_client, business_id, saved):
+    state = PipelineState('business_plan', business_id)
+
+    assert state.resume(api_client, business_id, STEP, matches=lambda inputs: inputs['idea'] == 'NEW IDEA B') is None
+    assert state.saved(STEP) is None
+    assert PipelineState('business_plan', business_id).saved(STEP) is None
+
+
+def test_resume_with_matching_inputs(api_client, business_id, saved):
+    state = PipelineState('business_plan', business_id)
+    job, _ = state.resume(api_client, business_id, STEP, matches=lambda inputs: inputs['idea'] == 'OLD IDEA A')
+
+    assert job.job_id == saved
+
+
+@pytest.mark.parametrize('answer, resumed', [('y', True), ('', True), ('n', False)])
+def test_resume_asks_first_when_interactive(api_client, business_id, saved, monkeypatch, answer, resumed):
+    monkeypatch.setattr('builtins.input', lambda prompt='': answer)
+    state = PipelineState('business_plan', business_id)
+
+    result = state.resume(api_client, business_id, STEP, confirm=True)
+
+    assert (result is not None) == resumed
+    assert (state.saved(STEP) is not None) == resumed
+
+
+def test_resume_does_not_ask_scripts(api_client, business_id, saved, answers):
+    answers([])
+
+    job, _ = PipelineState('business_plan', business_id).resume(api_client, business_id, STEP, confirm=True)
+
+    assert job.job_id == saved
+
+
+def test_requirements_for_a_new_idea_are_not_resumed(state, business_id, saved, answers, capsys, clock):
+    clock.sleep(10)
+    state.job_duration = 0
+    # ENTER skips the finished jobs of earlier runs
+    answers(['', 'Inspiration', 'Goals', 'Brand', 'Risks', 'y', 'n'])
+
+    generation = BusinessPlanGeneration(business_id, 'double_grid')
+    generation._get_business_plan_requirements({'saas_venture_description': 'NEW IDEA B'})
+
+    out = capsys.readouterr().out
+    assert 'Picking up' not in out
+    assert 'Using the generated idea : NEW IDEA B' in out
+    submitted = [job for job in state.jobs.values() if job.job_type == STEP]
+    assert [job.job_id for job in submitted][0] == saved
+    assert len(submitted) == 2
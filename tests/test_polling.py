@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from cli.utils.polling import BackoffPollStrategy, FixedPollStrategy, PollStrategy
+
+
+def test_poll_strategy_is_abstract():
+    with pytest.raises(TypeError):
+        PollStrategy()
+
+
+def test_fixed_strategy_waits_the_interval():
+    strategy = FixedPollStrategy(interval=2)
+    assert [strategy.delay(attempt) for attempt in range(5)] == [2] * 5
+
+
+def test_fixed_strategy_honours_retry_after():
+    strategy = FixedPollStrategy(interval=2)
+    assert strategy.delay(0, hint=5) == 5
+    assert strategy.delay(0, hint=1) == 2
+
+
+def test_backoff_polls_quickly_at_first():
+    strategy = BackoffPollStrategy(initial_interval=0.25, fast_attempts=4, jitter=0)
+    assert [strategy.delay(attempt) for attempt in range(4)] == [0.25] * 4
+
+
+def test_backoff_grows_after_the_fast_attempts():
+    strategy = BackoffPollStrategy(initial_interval=0.25, fast_attempts=2, factor=2, max_interval=100, jitter=0)
+    assert [strategy.delay(attempt) for attempt in range(2, 6)] == [0.5, 1, 2, 4]
+
+
+def test_backoff_is_capped():
+    strategy = BackoffPollStrategy(initial_interval=0.25, fast_attempts=2, factor=2, max_interval=3, jitter=0)
+    assert [strategy.delay(attempt) for attempt in range(5, 50, 5)] == [3] * 9
+
+
+def test_backoff_jitter_stays_in_bounds():
+    strategy = BackoffPollStrategy(
+        initial_interval=1, fast_attempts=100, max_interval=10, jitter=0.2, rng=random.Random(1234),
+    )
+    delays = [strategy.delay(attempt) for attempt in range(100)]
+    assert all(0.8 <= delay <= 1.2 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_backoff_jitter_never_exceeds_the_cap():
+    strategy = BackoffPollStrategy(
+        initial_interval=1, fast_attempts=0, factor=2, max_interval=5, jitter=0.5, rng=random.Random(1234),
+    )
+    assert all(strategy.delay(attempt) <= 5 for attempt in range(20, 60))
+
+
+def test_backoff_is_reproducible_with_a_seeded_rng():
+    first = BackoffPollStrategy(rng=random.Random(42))
+    second = BackoffPollStrategy(rng=random.Random(42))
+    assert [first.delay(attempt) for attempt in range(20)] == [second.delay(attempt) for attempt in range(20)]
+
+
+def test_backoff_honours_retry_after_as_a_lower_bound():
+    strategy = BackoffPollStrategy(initial_interval=0.25, max_interval=10, jitter=0)
+    assert strategy.delay(0, hint=3) == 3
+    assert strategy.delay(0, hint=0.1) == 0.25
+    # Beyond the cap too, the server knows best
+    assert strategy.delay(0, hint=30) == 30
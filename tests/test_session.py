@@ -0,0 +1,32 @@
+import threading
+import time
+
+from cli import session
+
+
+def test_threads_starting_at_once_share_one_session(monkeypatch):
+    transport = session.MeteredTransport
+
+    def slow_transport(*args, **kwargs):
+        # Widen the window between checking for a session and storing the new one
+        time.sleep(0.05)
+        return transport(*args, **kwargs)
+
+    monkeypatch.setattr(session, 'MeteredTransport', slow_transport)
+    session.set_session(None)
+    barrier = threading.Barrier(4)
+    sessions = []
+
+    def start():
+        barrier.wait()
+        sessions.append(session.get_session())
+
+    threads = [threading.Thread(target=start) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    try:
+        assert len({id(client) for client in sessions}) == 1
+    finally:
+        session.close_session()